@@ -3,12 +3,13 @@ RBAC dependencies for authentication and authorization
 """
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
-from app.database.session import get_db
+from app.database.session import get_async_db
 from app.core.security import decode_token
-from app.services.auth_service import AuthService
+from app.core.principal_cache import Principal
+from app.api.routers.dependencies import ensure_active, load_principal
 
 # Security scheme for Swagger UI (compatible con el botón Authorize)
 security = HTTPBearer(
@@ -20,8 +21,8 @@ security = HTTPBearer(
 
 async def get_current_user_from_header(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """
     Get current user from Bearer token (compatible con Swagger Authorize button)
     
@@ -30,10 +31,10 @@ async def get_current_user_from_header(
         db: Database session
         
     Returns:
-        Current user
+        Current user's principal (id, role, is_active), served from the principal cache
         
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If token is invalid or expired, or the user is inactive
     """
     token = credentials.credentials
     
@@ -48,18 +49,7 @@ async def get_current_user_from_header(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Get user from database
-        service = AuthService(db)
-        user = service.get_current_user(int(user_id))
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Usuario no encontrado",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        return user
+        return ensure_active(await load_principal(db, int(user_id)))
         
     except HTTPException:
         raise
@@ -1,15 +1,18 @@
 """
 Router for authentication endpoints
 """
+import time
 from fastapi import APIRouter, Depends, HTTPException, status, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.schemas.user import UserCreate, UserRead, LoginRequest
 from app.services.auth_service import AuthService
-from app.database.session import get_db
+from app.services.async_service import AsyncService
+from app.database.session import get_async_db
 from app.core.exceptions import InvalidCredentialsError, UserAlreadyExistsError
+from app.core.metrics import login_latency
 from app.api.routers.dependencies import get_current_user
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -19,7 +22,7 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 async def login(
     username: str = Form(..., description="Nombre de usuario", min_length=3),
     password: str = Form(..., description="Contraseña del usuario", min_length=6, media_type="password"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     **Endpoint de autenticación** - Inicia sesión y obtiene un token JWT para usar en el botón "Authorize".
@@ -48,9 +51,10 @@ async def login(
     Returns:
         Token JWT, tipo de token e información del usuario
     """
+    started = time.perf_counter()
     try:
-        service = AuthService(db)
-        token_data = service.login(username=username, password=password)
+        service = AsyncService(db, AuthService)
+        token_data = await service.login(username=username, password=password)
         return token_data
     except InvalidCredentialsError as e:
         raise HTTPException(
@@ -58,11 +62,14 @@ async def login(
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
+    finally:
+        login_latency.record(time.perf_counter() - started)
 
 
 @router.get("/validate-token", tags=["auth"], summary="✅ Validar token JWT")
 async def validate_token(
     current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     **🔍 Valida si el token JWT es válido y está activo**
@@ -95,15 +102,17 @@ async def validate_token(
     Returns:
         Mensaje de validación exitosa con información del usuario
     """
+    # get_current_user solo trae id, rol y estado; aquí hace falta la fila completa
+    user = await AsyncService(db, AuthService).get_current_user(current_user.id)
     return {
         "valid": True,
         "message": "✅ Token JWT válido y activo",
         "user": {
-            "id": current_user.id,
-            "username": current_user.username,
-            "email": current_user.email,
-            "role": current_user.role,
-            "is_active": current_user.is_active
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "role": user.role,
+            "is_active": user.is_active
         }
     }
 
@@ -111,6 +120,7 @@ async def validate_token(
 @router.get("/me", response_model=UserRead, tags=["auth"], summary="Obtener usuario autenticado actual")
 async def get_me(
     current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     **Obtiene la información del usuario autenticado** mediante el token JWT.
@@ -141,7 +151,7 @@ async def get_me(
     Returns:
         Información completa del usuario autenticado
     """
-    return current_user
+    return await AsyncService(db, AuthService).get_current_user(current_user.id)
 
 
 
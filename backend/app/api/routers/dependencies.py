@@ -1,12 +1,15 @@
 """
 Dependencies for API endpoints
 """
+from typing import Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_db
+from app.database.session import get_async_db
+from app.core.principal_cache import CLAIMS_PRINCIPAL, Principal, principal_cache, token_versions
 from app.services.auth_service import AuthService
+from app.services.async_service import AsyncService
 
 # Security scheme for Swagger UI
 security = HTTPBearer(
@@ -16,10 +19,72 @@ security = HTTPBearer(
 )
 
 
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """
+    Get the caller's principal from the in-process cache, or load and cache it
+    
+    Args:
+        db: Database session (only used on a cache miss)
+        user_id: User ID from the token
+        
+    Returns:
+        Principal (id, role, is_active), or None if the user does not exist
+    """
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        epoch = principal_cache.epoch
+        principal = await AsyncService(db, AuthService).get_principal(user_id)
+        if principal is not None:
+            principal_cache.put(user_id, principal, epoch)
+    return principal
+
+
+async def load_token_version(db: AsyncSession, user_id: int) -> Optional[int]:
+    """
+    Get a user's current token version from the in-process cache, or load and cache it
+    
+    Args:
+        db: Database session (only used on a cache miss)
+        user_id: User ID from the token
+        
+    Returns:
+        Token version, or None if the user does not exist
+    """
+    version = token_versions.get(user_id)
+    if version is None:
+        epoch = token_versions.epoch
+        version = await AsyncService(db, AuthService).get_token_version(user_id)
+        if version is not None:
+            token_versions.put(user_id, version, epoch)
+    return version
+
+
+def ensure_active(principal: Optional[Principal]) -> Principal:
+    """
+    Reject tokens of users that no longer exist or were deactivated
+    
+    Raises:
+        HTTPException: 401 if the user is missing or inactive
+    """
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no encontrado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario inactivo",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """
     Get current authenticated user from Bearer token
     
@@ -28,10 +93,10 @@ async def get_current_user(
         db: Database session
         
     Returns:
-        Current user
+        Current user's principal (id, role, is_active), served from the principal cache
         
     Raises:
-        HTTPException: If not authenticated or token is invalid
+        HTTPException: If not authenticated, the token is invalid or the user is inactive
     """
     token = credentials.credentials
     
@@ -47,18 +112,7 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Get user from database
-        service = AuthService(db)
-        user = service.get_current_user(int(user_id))
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Usuario no encontrado",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        return user
+        return ensure_active(await load_principal(db, int(user_id)))
         
     except HTTPException:
         raise
@@ -68,3 +122,51 @@ async def get_current_user(
             detail=f"Token inválido o expirado: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def get_read_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Get the caller's principal for read endpoints
+    
+    With AUTH_CLAIMS_PRINCIPAL enabled the role signed into the token is
+    trusted, and the token is only checked for revocation: its "ver" claim
+    must match the user's current token_version. Otherwise (and for tokens
+    issued without "ver") this is get_current_user.
+    
+    Args:
+        credentials: HTTP Bearer credentials from Authorization header
+        db: Database session (only used on a token version cache miss)
+        
+    Returns:
+        Principal (id, role, is_active) of the caller
+        
+    Raises:
+        HTTPException: If not authenticated, the token is invalid or revoked
+    """
+    if not CLAIMS_PRINCIPAL:
+        return await get_current_user(credentials, db)
+    
+    try:
+        from app.core.security import decode_token
+        payload = decode_token(credentials.credentials)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Token inválido o expirado: {str(e)}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user_id, role, version = payload.get("sub"), payload.get("role"), payload.get("ver")
+    if not str(user_id).isdigit() or not role or not isinstance(version, int):
+        return await get_current_user(credentials, db)
+    
+    if await load_token_version(db, int(user_id)) != version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revocado: inicia sesión de nuevo",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Principal(id=int(user_id), role=role, is_active=True)
@@ -4,28 +4,41 @@ Endpoints: POST, GET, PATCH, DELETE para gestión de proyectos
 Autenticación requerida para todas las operaciones
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Depends, status, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.project import (
     ProjectCreate,
     ProjectRead,
     ProjectReadWithDetails,
     ProjectUpdate,
+    ProjectTaskStats,
+    ProjectReadWithProgress,
 )
 from app.schemas.common import MessageResponse, ErrorResponse
+from app.schemas.task import TaskImportResult
 from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
 from app.services.auth_service import AuthService
-from app.models.models import User
-from app.database.session import get_db
-from app.api.routers.dependencies import get_current_user
+from app.services.async_service import AsyncService
+from app.services.task_export import MEDIA_TYPES, stream_export
+from app.services.task_import import detect_format, import_tasks
+from app.core.principal_cache import Principal
+from app.database.session import get_async_db, get_read_db
+from app.api.routers.dependencies import get_current_user, get_read_principal
+from app.jobs.project_purge import purge_project
+from app.core.enums import BulkMode, ExportFormat
 from app.core.exceptions import (
     ProjectNotFoundError,
     PermissionDeniedError,
     InvalidInputError,
 )
 
+# Máximo de proyectos por petición de estadísticas en lote
+STATS_BATCH_MAX = 100
+
 router = APIRouter(
     prefix="/api/projects",
     tags=["projects"],
@@ -43,8 +56,8 @@ router = APIRouter(
 )
 async def create_project(
     project_data: ProjectCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Crea un nuevo proyecto.
@@ -64,8 +77,8 @@ async def create_project(
         )
     
     try:
-        service = ProjectService(db)
-        project = service.create_project(
+        service = AsyncService(db, ProjectService)
+        project = await service.create_project(
             project_data=project_data,
             owner_id=current_user.id,
         )
@@ -81,42 +94,257 @@ async def create_project(
 # READ - GET /api/projects (lista de proyectos del usuario)
 @router.get(
     "",
-    response_model=List[ProjectRead],
+    response_model=List[ProjectReadWithProgress],
     status_code=status.HTTP_200_OK,
     summary="Listar proyectos del usuario",
     description="Obtiene todos los proyectos donde el usuario es propietario o miembro. Admins ven todos.",
 )
 async def list_projects(
-    skip: int = Query(0, ge=0, description="Número de registros a saltar"),
+    response: Response,
+    cursor: Optional[str] = Query(
+        None, description="Cursor de paginación devuelto en el header X-Next-Cursor"
+    ),
+    skip: int = Query(
+        0, ge=0, deprecated=True,
+        description="Número de registros a saltar (obsoleto: usar cursor)"
+    ),
     limit: int = Query(10, ge=1, le=100, description="Número de registros a retornar"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Obtiene la lista de proyectos del usuario autenticado.
     
-    - **skip**: Offset para paginación (default: 0)
+    - **cursor**: Cursor de paginación (valor de `X-Next-Cursor` de la página anterior)
+    - **skip**: Offset para paginación (obsoleto, se ignora si hay cursor)
     - **limit**: Número máximo de resultados (default: 10, máximo: 100)
     
+    Cada proyecto incluye `progress` (tareas totales, completadas y porcentaje).
+    
     Comportamiento según rol:
     - **admin**: Ve todos los proyectos
     - **read_write, read_only**: Ven solo proyectos donde son propietarios o miembros
     """
     try:
-        service = ProjectService(db)
-        projects = service.get_user_projects(
+        service = AsyncService(db, ProjectService)
+        page = await service.get_user_projects(
             user_id=current_user.id, 
             user_role=current_user.role,
             skip=skip, 
-            limit=limit
+            limit=limit,
+            cursor=cursor
+        )
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        return page.items
+    except InvalidInputError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+# STATS - GET /api/projects/stats (varios proyectos)
+@router.get(
+    "/stats",
+    response_model=List[ProjectTaskStats],
+    status_code=status.HTTP_200_OK,
+    summary="Estadísticas de tareas de varios proyectos",
+    description="Obtiene las estadísticas de tareas de varios proyectos con una sola consulta agregada.",
+)
+async def get_projects_stats(
+    ids: List[int] = Query(
+        ..., description=f"IDs de los proyectos (repetir el parámetro, máximo {STATS_BATCH_MAX})"
+    ),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Obtiene las estadísticas de tareas de varios proyectos (vista de portfolio).
+    
+    - **ids**: IDs de los proyectos, p. ej. `?ids=1&ids=2&ids=3`
+    
+    Devuelve la misma estructura que `GET /api/projects/{project_id}/stats` para
+    cada proyecto, en el orden solicitado. El usuario debe ser miembro de todos
+    los proyectos (o admin).
+    """
+    if len(ids) > STATS_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo {STATS_BATCH_MAX} proyectos por petición"
+        )
+    
+    try:
+        task_service = AsyncService(db, TaskService)
+        return await task_service.get_project_stats(
+            project_ids=ids, user_id=current_user.id, user_role=current_user.role
+        )
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ProjectNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
-        return projects
+
+
+# STATS - GET /api/projects/{project_id}/stats
+@router.get(
+    "/{project_id}/stats",
+    response_model=ProjectTaskStats,
+    status_code=status.HTTP_200_OK,
+    summary="Estadísticas de tareas de un proyecto",
+    description="Cuenta las tareas de un proyecto por estado, prioridad y asignado con una sola consulta.",
+)
+async def get_project_stats(
+    project_id: int,
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Obtiene las estadísticas de tareas de un proyecto.
+    
+    - **total**: Número de tareas
+    - **by_status**: Tareas por estado
+    - **by_priority**: Tareas por prioridad
+    - **by_assignee**: Tareas por usuario asignado (`null` = sin asignar)
+    - **overdue**: Tareas no completadas con fecha de vencimiento pasada
+    - **due_this_week**: Tareas no completadas que vencen en los próximos 7 días
+    
+    Solo propietarios y miembros pueden ver las estadísticas. Los administradores pueden ver cualquier proyecto.
+    """
+    try:
+        task_service = AsyncService(db, TaskService)
+        stats = await task_service.get_project_stats(
+            project_ids=[project_id], user_id=current_user.id, user_role=current_user.role
+        )
+        return stats[0]
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ProjectNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
 
 
+# READ - GET /api/projects/{project_id}/tasks/export
+@router.get(
+    "/{project_id}/tasks/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Exportar tareas del proyecto",
+    description="Descarga todas las tareas de un proyecto en NDJSON o CSV, en streaming.",
+)
+async def export_project_tasks(
+    project_id: int,
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Formato: ndjson o csv"),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Exporta todas las tareas de un proyecto.
+    
+    - **format**: `ndjson` (un objeto JSON por línea) o `csv` (con cabecera)
+    
+    Las filas se leen con un cursor del servidor y se envían por lotes, así que
+    la memoria no depende del tamaño del proyecto. Toda la exportación sale de
+    una única consulta (una sola instantánea de los datos).
+    Solo propietarios y miembros pueden exportar. Los administradores pueden exportar cualquier proyecto.
+    """
+    try:
+        task_service = AsyncService(db, TaskService)
+        query = await task_service.get_export_query(
+            project_id=project_id, user_id=current_user.id, user_role=current_user.role
+        )
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ProjectNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    
+    filename = f"project-{project_id}-tasks.{format.value}"
+    return StreamingResponse(
+        stream_export(db, query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# CREATE - POST /api/projects/{project_id}/tasks/import
+@router.post(
+    "/{project_id}/tasks/import",
+    response_model=TaskImportResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Importar tareas al proyecto",
+    description="Crea tareas a partir de un fichero CSV o NDJSON, validando e insertando por lotes.",
+)
+async def import_project_tasks(
+    project_id: int,
+    file: UploadFile = File(..., description="Fichero CSV (con cabecera) o NDJSON"),
+    format: Optional[ExportFormat] = Query(
+        None, description="Formato del fichero (por defecto se deduce de la extensión)"
+    ),
+    mode: BulkMode = Query(BulkMode.ATOMIC, description="atomic (todo o nada) o partial"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Importa tareas desde un fichero.
+    
+    - **file**: columnas/campos `title`, `description`, `priority`, `due_date`
+      y `assigned_to` (username de un miembro del proyecto)
+    - **format**: `csv` o `ndjson` (opcional si la extensión lo indica)
+    - **mode**: `atomic` (default, si alguna fila falla no se crea ninguna) o `partial`
+    
+    El fichero se lee fila a fila y se procesa en lotes: validación con el mismo
+    esquema que `POST /api/tasks` (fuera del bucle de eventos), una consulta por
+    lote para resolver los usernames y un INSERT multi-fila. La respuesta incluye
+    los errores por línea. En modo `atomic` con errores se responde 400 con el
+    mismo informe. Peticiones de más de TASK_IMPORT_MAX_BYTES responden 413 sin
+    leer el fichero (ver BodySizeLimitMiddleware), y ficheros de más de
+    TASK_IMPORT_MAX_ROWS filas, 400.
+    """
+    if current_user.role == "read_only":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="READ_ONLY users cannot import tasks"
+        )
+    
+    file_format = format or detect_format(file.filename, file.content_type)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se pudo deducir el formato del fichero: indica format=csv o format=ndjson",
+        )
+    
+    try:
+        result = await import_tasks(
+            db,
+            project_id=project_id,
+            stream=file.file,
+            file_format=file_format,
+            creator_id=current_user.id,
+            creator_role=current_user.role,
+            mode=mode,
+        )
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ProjectNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InvalidInputError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if result.failed and mode == BulkMode.ATOMIC:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.model_dump(mode="json"),
+        )
+    return result
+
+
 # READ - GET /api/projects/{project_id}
 @router.get(
     "/{project_id}",
@@ -127,8 +355,8 @@ async def list_projects(
 )
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Obtiene los detalles completos de un proyecto.
@@ -142,17 +370,17 @@ async def get_project(
     Solo propietarios y miembros pueden ver el proyecto. Los administradores pueden ver cualquier proyecto.
     """
     try:
-        service = ProjectService(db)
+        service = AsyncService(db, ProjectService)
         
         # Administradores pueden ver cualquier proyecto
         if current_user.role != "admin":
             # Verificar que el usuario es propietario o miembro
-            if not service.is_member(project_id=project_id, user_id=current_user.id):
+            if not await service.is_member(project_id=project_id, user_id=current_user.id):
                 raise PermissionDeniedError(
                     "No tienes permisos para acceder a este proyecto"
                 )
         
-        project = service.get_project(project_id=project_id)
+        project = await service.get_project(project_id=project_id)
         if not project:
             raise ProjectNotFoundError(f"Proyecto con ID {project_id} no encontrado")
         
@@ -178,8 +406,8 @@ async def get_project(
 async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualiza un proyecto existente.
@@ -198,15 +426,15 @@ async def update_project(
         )
     
     try:
-        service = ProjectService(db)
+        service = AsyncService(db, ProjectService)
         
         # Verificar que el usuario es propietario
-        if not service.is_owner(project_id=project_id, user_id=current_user.id):
+        if not await service.is_owner(project_id=project_id, user_id=current_user.id):
             raise PermissionDeniedError(
                 "Solo el propietario puede actualizar este proyecto"
             )
         
-        project = service.update_project(
+        project = await service.update_project(
             project_id=project_id, 
             project_update=project_data,
             current_user_id=current_user.id
@@ -238,8 +466,13 @@ async def update_project(
 )
 async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    response: Response,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(
+        False, description="Purgar en segundo plano por lotes (proyectos muy grandes)"
+    ),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Elimina un proyecto completamente.
@@ -249,6 +482,11 @@ async def delete_project(
     - Todas sus tareas
     - Todas las asignaciones
     
+    La base de datos elimina tareas y membresías en cascada con un solo DELETE.
+    Con `background=true` la respuesta es inmediata (202) y las tareas se borran
+    después por lotes, cada uno en su propia transacción; el proyecto desaparece
+    al terminar la purga.
+    
     Solo el propietario puede eliminar el proyecto.
     """
     # Validar que el usuario no sea READ_ONLY
@@ -259,15 +497,20 @@ async def delete_project(
         )
     
     try:
-        service = ProjectService(db)
+        service = AsyncService(db, ProjectService)
         
         # Verificar que el usuario es propietario
-        if not service.is_owner(project_id=project_id, user_id=current_user.id):
+        if not await service.is_owner(project_id=project_id, user_id=current_user.id):
             raise PermissionDeniedError(
                 "Solo el propietario puede eliminar este proyecto"
             )
         
-        success = service.delete_project(project_id=project_id, current_user_id=current_user.id)
+        if background:
+            background_tasks.add_task(purge_project, project_id)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return MessageResponse(message="Eliminación del proyecto programada")
+        
+        success = await service.delete_project(project_id=project_id, current_user_id=current_user.id)
         
         if not success:
             raise ProjectNotFoundError(f"Proyecto con ID {project_id} no encontrado")
@@ -294,8 +537,8 @@ async def delete_project(
 async def add_member(
     project_id: int,
     member_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Agrega un usuario como miembro del proyecto.
@@ -313,16 +556,16 @@ async def add_member(
         )
     
     try:
-        service = ProjectService(db)
+        service = AsyncService(db, ProjectService)
         
         # Verificar que el proyecto existe
-        project = service.get_project(project_id=project_id)
+        project = await service.get_project(project_id=project_id)
         if not project:
             raise ProjectNotFoundError(f"Proyecto con ID {project_id} no encontrado")
         
         # Verificar que el usuario es propietario O admin
         is_admin = current_user.role == "admin"
-        is_owner = service.is_owner(project_id=project_id, user_id=current_user.id)
+        is_owner = await service.is_owner(project_id=project_id, user_id=current_user.id)
         
         if not (is_admin or is_owner):
             raise PermissionDeniedError(
@@ -330,12 +573,12 @@ async def add_member(
             )
         
         # Verificar que el miembro no está ya en el proyecto
-        if service.is_member(project_id=project_id, user_id=member_id):
+        if await service.is_member(project_id=project_id, user_id=member_id):
             raise InvalidInputError(
                 "El usuario ya es miembro del proyecto"
             )
         
-        service.add_member(
+        await service.add_member(
             project_id=project_id,
             user_id=member_id,
             current_user_id=current_user.id
@@ -365,8 +608,8 @@ async def add_member(
 async def remove_member(
     project_id: int,
     member_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Remueve un usuario del proyecto.
@@ -384,16 +627,16 @@ async def remove_member(
         )
     
     try:
-        service = ProjectService(db)
+        service = AsyncService(db, ProjectService)
         
         # Verificar que el proyecto existe
-        project = service.get_project(project_id=project_id)
+        project = await service.get_project(project_id=project_id)
         if not project:
             raise ProjectNotFoundError(f"Proyecto con ID {project_id} no encontrado")
         
         # Verificar que el usuario es propietario O admin
         is_admin = current_user.role == "admin"
-        is_owner = service.is_owner(project_id=project_id, user_id=current_user.id)
+        is_owner = await service.is_owner(project_id=project_id, user_id=current_user.id)
         
         if not (is_admin or is_owner):
             raise PermissionDeniedError(
@@ -406,7 +649,7 @@ async def remove_member(
                 "No puedes remover al propietario del proyecto"
             )
         
-        service.remove_member(
+        await service.remove_member(
             project_id=project_id,
             user_id=member_id,
             current_user_id=current_user.id
@@ -4,23 +4,29 @@ Endpoints: POST, GET, PATCH, DELETE para gestión de tareas
 Autenticación requerida para todas las operaciones
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
 from typing import Optional, List
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.task import (
     TaskCreate,
     TaskRead,
     TaskReadWithAssignee,
     TaskUpdate,
+    TaskBulkCreate,
+    TaskBulkCreateResult,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskSearchResult,
 )
 from app.schemas.common import MessageResponse
 from app.services.task_service import TaskService
 from app.services.project_service import ProjectService
-from app.models.models import User
-from app.database.session import get_db
-from app.api.routers.dependencies import get_current_user
-from app.core.enums import TaskStatus
+from app.services.async_service import AsyncService
+from app.core.principal_cache import Principal
+from app.database.session import get_async_db, get_read_db
+from app.api.routers.dependencies import get_current_user, get_read_principal
+from app.core.enums import TaskStatus, BulkMode
 from app.core.exceptions import (
     TaskNotFoundError,
     ProjectNotFoundError,
@@ -45,8 +51,8 @@ router = APIRouter(
 )
 async def create_task(
     task_data: TaskCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Crea una nueva tarea en un proyecto.
@@ -68,11 +74,11 @@ async def create_task(
         )
     
     try:
-        project_service = ProjectService(db)
+        project_service = AsyncService(db, ProjectService)
         
         # Verificar que el usuario es miembro del proyecto (o es admin)
         is_admin = current_user.role == "admin"
-        is_member = project_service.is_member(
+        is_member = await project_service.is_member(
             project_id=task_data.project_id, user_id=current_user.id
         )
         
@@ -83,15 +89,15 @@ async def create_task(
         
         # Si se asigna a alguien, verificar que ese usuario también es miembro
         if task_data.assigned_to_id:
-            if not project_service.is_member(
+            if not await project_service.is_member(
                 project_id=task_data.project_id, user_id=task_data.assigned_to_id
             ):
                 raise InvalidInputError(
                     "El usuario asignado no es miembro del proyecto"
                 )
         
-        task_service = TaskService(db)
-        task = task_service.create_task(
+        task_service = AsyncService(db, TaskService)
+        task = await task_service.create_task(
             project_id=task_data.project_id,
             task_data=task_data,
             creator_id=current_user.id,
@@ -110,6 +116,151 @@ async def create_task(
         )
 
 
+# CREATE BULK - POST /api/tasks/bulk
+@router.post(
+    "/bulk",
+    response_model=TaskBulkCreateResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Crear tareas en lote",
+    description="Crea muchas tareas en una sola petición con validación e inserción por lotes.",
+)
+async def create_tasks_bulk(
+    bulk_data: TaskBulkCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Crea muchas tareas (hasta 5000) en una sola petición.
+    
+    - **items**: Lista de tareas con el mismo formato que `POST /api/tasks`
+    - **mode**: `atomic` (todo o nada, default) o `partial` (se crean las válidas)
+    
+    La membresía en los proyectos y la de los usuarios asignados se valida una
+    vez por lote, y las tareas se insertan con un INSERT multi-fila.
+    La respuesta incluye el resultado de cada elemento (ID creado o error).
+    En modo `atomic`, si algún elemento es inválido no se crea ninguna tarea
+    y se responde 400 con el mismo informe por elemento.
+    """
+    if current_user.role == "read_only":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="READ_ONLY users cannot create tasks"
+        )
+    
+    try:
+        task_service = AsyncService(db, TaskService)
+        result = await task_service.create_tasks_bulk(
+            items=bulk_data.items,
+            creator_id=current_user.id,
+            creator_role=current_user.role,
+            mode=bulk_data.mode,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+    
+    if result.failed and bulk_data.mode == BulkMode.ATOMIC:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.model_dump(mode="json"),
+        )
+    return result
+
+
+# UPDATE BULK - PATCH /api/tasks/bulk
+@router.patch(
+    "/bulk",
+    response_model=TaskBulkUpdateResult,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar tareas en lote",
+    description="Cambia estado, prioridad o asignado de muchas tareas con un único UPDATE.",
+)
+async def update_tasks_bulk(
+    bulk_data: TaskBulkUpdate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Aplica el mismo cambio a muchas tareas en una sola petición.
+    
+    - **task_ids**: Lista de IDs de tareas (hasta 5000), o bien
+    - **filter**: Filtro con `project_id` (requerido) y `status`, `priority`, `assigned_to_id` (opcionales)
+    - **status**: Nuevo estado (opcional)
+    - **priority**: Nueva prioridad (opcional)
+    - **assigned_to_id**: Nuevo usuario asignado (opcional, `null` desasigna)
+    
+    El usuario debe ser miembro de todos los proyectos afectados (o admin), y el
+    nuevo asignado también. Los IDs solicitados que no existen se devuelven en
+    `not_found`. Los usuarios READ_ONLY no pueden actualizar tareas.
+    """
+    if current_user.role == "read_only":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="READ_ONLY users cannot update tasks"
+        )
+    
+    try:
+        task_service = AsyncService(db, TaskService)
+        return await task_service.update_tasks_bulk(
+            bulk_data=bulk_data,
+            user_id=current_user.id,
+            user_role=current_user.role,
+        )
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except InvalidInputError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+# SEARCH - GET /api/tasks/search
+@router.get(
+    "/search",
+    response_model=List[TaskSearchResult],
+    status_code=status.HTTP_200_OK,
+    summary="Buscar tareas",
+    description="Búsqueda de texto completo en título y descripción de las tareas accesibles.",
+)
+async def search_tasks(
+    q: str = Query(..., min_length=2, max_length=200, description="Texto a buscar"),
+    project_id: Optional[int] = Query(
+        None, description="Limitar la búsqueda a un proyecto (ID del proyecto)"
+    ),
+    limit: int = Query(20, ge=1, le=50, description="Número máximo de resultados"),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Busca tareas por contenido en todos los proyectos accesibles.
+    
+    - **q**: Texto a buscar (admite frases entre comillas y `-palabra` en PostgreSQL)
+    - **project_id**: Limitar a un proyecto - opcional
+    - **limit**: Número máximo de resultados (default: 20, máximo: 50)
+    
+    Los resultados se ordenan por relevancia e incluyen `rank` y un `snippet`
+    con los términos encontrados entre `<mark>` y `</mark>`.
+    Solo se buscan tareas de proyectos donde el usuario es propietario o miembro
+    (los administradores buscan en todos).
+    """
+    try:
+        task_service = AsyncService(db, TaskService)
+        return await task_service.search_tasks(
+            text=q,
+            user_id=current_user.id,
+            user_role=current_user.role,
+            project_id=project_id,
+            limit=limit,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
 # READ - GET /api/tasks/project/{project_id}
 @router.get(
     "/project/{project_id}",
@@ -120,6 +271,7 @@ async def create_task(
 )
 async def get_project_tasks(
     project_id: int,
+    response: Response,
     status_filter: Optional[str] = Query(
         None, description="Filtrar por estado (pending/in_progress/review/completed)"
     ),
@@ -132,10 +284,19 @@ async def get_project_tasks(
     creator_id: Optional[int] = Query(
         None, description="Filtrar por creador de la tarea (ID del usuario)"
     ),
-    skip: int = Query(0, ge=0, description="Número de registros a saltar"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor de paginación devuelto en el header X-Next-Cursor"
+    ),
+    sort: Optional[str] = Query(
+        None, description="Orden: campos separados por comas, '-' para descendente (p. ej. -priority,due_date)"
+    ),
+    skip: int = Query(
+        0, ge=0, deprecated=True,
+        description="Número de registros a saltar (obsoleto: usar cursor)"
+    ),
     limit: int = Query(50, ge=1, le=200, description="Número de registros a retornar"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Obtiene la lista de tareas de un proyecto con filtros opcionales.
@@ -145,17 +306,23 @@ async def get_project_tasks(
     - **priority_filter**: Filtrar por prioridad (low/medium/high/critical) - opcional
     - **assigned_to_id**: Filtrar por usuario asignado - opcional
     - **creator_id**: Filtrar por creador de la tarea - opcional
-    - **skip**: Offset para paginación (default: 0)
+    - **cursor**: Cursor de paginación (valor de `X-Next-Cursor` de la página anterior)
+    - **sort**: Orden por `priority`, `status`, `due_date`, `created_at`, `updated_at`, `title` o `id`
+      (p. ej. `-priority,due_date`); prioridad y estado siguen su orden lógico, no el alfabético
+    - **skip**: Offset para paginación (obsoleto, se ignora si hay cursor)
     - **limit**: Número máximo de resultados (default: 50)
     
+    El total de tareas que cumplen los filtros se devuelve en el header `X-Total-Count`
+    y, si hay más resultados, el cursor de la siguiente página en `X-Next-Cursor`.
+    
     Solo miembros del proyecto pueden ver sus tareas.
     """
     try:
-        project_service = ProjectService(db)
+        project_service = AsyncService(db, ProjectService)
         
         # Verificar que el usuario es miembro del proyecto (o es admin)
         is_admin = current_user.role == "admin"
-        is_member = project_service.is_member(
+        is_member = await project_service.is_member(
             project_id=project_id, user_id=current_user.id
         )
         
@@ -164,8 +331,8 @@ async def get_project_tasks(
                 "No tienes permisos para acceder a las tareas de este proyecto"
             )
         
-        task_service = TaskService(db)
-        tasks = task_service.get_project_tasks(
+        task_service = AsyncService(db, TaskService)
+        page = await task_service.get_project_tasks(
             project_id=project_id,
             status_filter=status_filter,
             priority_filter=priority_filter,
@@ -173,10 +340,17 @@ async def get_project_tasks(
             creator_id=creator_id,
             skip=skip,
             limit=limit,
+            cursor=cursor,
+            sort=sort,
         )
-        return tasks
+        response.headers["X-Total-Count"] = str(page.total)
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        return page.items
     except PermissionDeniedError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except InvalidInputError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except ProjectNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -194,6 +368,7 @@ async def get_project_tasks(
     description="Obtiene todas las tareas asignadas al usuario autenticado.",
 )
 async def get_my_tasks(
+    response: Response,
     status_filter: Optional[str] = Query(
         None, description="Filtrar por estado (pending/in_progress/review/completed)"
     ),
@@ -203,10 +378,19 @@ async def get_my_tasks(
     project_id: Optional[int] = Query(
         None, description="Filtrar por proyecto (ID del proyecto)"
     ),
-    skip: int = Query(0, ge=0, description="Número de registros a saltar"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor de paginación devuelto en el header X-Next-Cursor"
+    ),
+    sort: Optional[str] = Query(
+        None, description="Orden: campos separados por comas, '-' para descendente (p. ej. -priority,due_date)"
+    ),
+    skip: int = Query(
+        0, ge=0, deprecated=True,
+        description="Número de registros a saltar (obsoleto: usar cursor)"
+    ),
     limit: int = Query(50, ge=1, le=200, description="Número de registros a retornar"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Obtiene todas las tareas asignadas al usuario autenticado con filtros opcionales.
@@ -214,20 +398,33 @@ async def get_my_tasks(
     - **status_filter**: Filtrar por estado - opcional
     - **priority_filter**: Filtrar por prioridad - opcional
     - **project_id**: Filtrar por proyecto - opcional
-    - **skip**: Offset para paginación (default: 0)
+    - **cursor**: Cursor de paginación (valor de `X-Next-Cursor` de la página anterior)
+    - **sort**: Orden por `priority`, `status`, `due_date`, `created_at`, `updated_at`, `title` o `id`
+      (p. ej. `-priority,due_date`); prioridad y estado siguen su orden lógico, no el alfabético
+    - **skip**: Offset para paginación (obsoleto, se ignora si hay cursor)
     - **limit**: Número máximo de resultados (default: 50)
+    
+    El total de tareas que cumplen los filtros se devuelve en el header `X-Total-Count`
+    y, si hay más resultados, el cursor de la siguiente página en `X-Next-Cursor`.
     """
     try:
-        task_service = TaskService(db)
-        tasks = task_service.get_user_assigned_tasks(
+        task_service = AsyncService(db, TaskService)
+        page = await task_service.get_user_assigned_tasks(
             user_id=current_user.id,
             status_filter=status_filter,
             priority_filter=priority_filter,
             project_id=project_id,
             skip=skip,
             limit=limit,
+            cursor=cursor,
+            sort=sort,
         )
-        return tasks
+        response.headers["X-Total-Count"] = str(page.total)
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        return page.items
+    except InvalidInputError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -244,6 +441,7 @@ async def get_my_tasks(
 )
 async def get_user_assigned_tasks(
     user_id: int,
+    response: Response,
     status_filter: Optional[str] = Query(
         None, description="Filtrar por estado (pending/in_progress/review/completed)"
     ),
@@ -253,10 +451,19 @@ async def get_user_assigned_tasks(
     project_id: Optional[int] = Query(
         None, description="Filtrar por proyecto (ID del proyecto)"
     ),
-    skip: int = Query(0, ge=0, description="Número de registros a saltar"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor de paginación devuelto en el header X-Next-Cursor"
+    ),
+    sort: Optional[str] = Query(
+        None, description="Orden: campos separados por comas, '-' para descendente (p. ej. -priority,due_date)"
+    ),
+    skip: int = Query(
+        0, ge=0, deprecated=True,
+        description="Número de registros a saltar (obsoleto: usar cursor)"
+    ),
     limit: int = Query(50, ge=1, le=200, description="Número de registros a retornar"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Obtiene todas las tareas asignadas a un usuario específico con filtros opcionales.
@@ -265,9 +472,15 @@ async def get_user_assigned_tasks(
     - **status_filter**: Filtrar por estado - opcional
     - **priority_filter**: Filtrar por prioridad - opcional
     - **project_id**: Filtrar por proyecto - opcional
-    - **skip**: Offset para paginación (default: 0)
+    - **cursor**: Cursor de paginación (valor de `X-Next-Cursor` de la página anterior)
+    - **sort**: Orden por `priority`, `status`, `due_date`, `created_at`, `updated_at`, `title` o `id`
+      (p. ej. `-priority,due_date`); prioridad y estado siguen su orden lógico, no el alfabético
+    - **skip**: Offset para paginación (obsoleto, se ignora si hay cursor)
     - **limit**: Número máximo de resultados (default: 50)
     
+    El total de tareas que cumplen los filtros se devuelve en el header `X-Total-Count`
+    y, si hay más resultados, el cursor de la siguiente página en `X-Next-Cursor`.
+    
     Solo admin puede ver tareas de otros usuarios. Los demás solo ven sus propias tareas.
     """
     # Validar permisos: solo admin puede ver tareas de otros usuarios
@@ -281,16 +494,23 @@ async def get_user_assigned_tasks(
         )
     
     try:
-        task_service = TaskService(db)
-        tasks = task_service.get_user_assigned_tasks(
+        task_service = AsyncService(db, TaskService)
+        page = await task_service.get_user_assigned_tasks(
             user_id=user_id,
             status_filter=status_filter,
             priority_filter=priority_filter,
             project_id=project_id,
             skip=skip,
             limit=limit,
+            cursor=cursor,
+            sort=sort,
         )
-        return tasks
+        response.headers["X-Total-Count"] = str(page.total)
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        return page.items
+    except InvalidInputError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -307,8 +527,8 @@ async def get_user_assigned_tasks(
 )
 async def get_task(
     task_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_read_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Obtiene los detalles completos de una tarea.
@@ -318,16 +538,16 @@ async def get_task(
     El usuario debe ser miembro del proyecto que contiene la tarea.
     """
     try:
-        task_service = TaskService(db)
-        task = task_service.get_task(task_id=task_id)
+        task_service = AsyncService(db, TaskService)
+        task = await task_service.get_task(task_id=task_id)
         
         if not task:
             raise TaskNotFoundError(f"Tarea con ID {task_id} no encontrada")
         
         # Verificar permisos: usuario debe ser miembro del proyecto (o admin)
-        project_service = ProjectService(db)
+        project_service = AsyncService(db, ProjectService)
         is_admin = current_user.role == "admin"
-        is_member = project_service.is_member(
+        is_member = await project_service.is_member(
             project_id=task.project_id, user_id=current_user.id
         )
         
@@ -358,8 +578,8 @@ async def get_task(
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualiza una tarea existente.
@@ -381,16 +601,16 @@ async def update_task(
                 "READ_ONLY users cannot update tasks"
             )
         
-        task_service = TaskService(db)
-        task = task_service.get_task(task_id=task_id)
+        task_service = AsyncService(db, TaskService)
+        task = await task_service.get_task(task_id=task_id)
         
         if not task:
             raise TaskNotFoundError(f"Tarea con ID {task_id} no encontrada")
         
         # Verificar que el usuario es miembro del proyecto (o es admin)
-        project_service = ProjectService(db)
+        project_service = AsyncService(db, ProjectService)
         is_admin = current_user.role == "admin"
-        is_member = project_service.is_member(
+        is_member = await project_service.is_member(
             project_id=task.project_id, user_id=current_user.id
         )
         
@@ -401,7 +621,7 @@ async def update_task(
         
         # Si se asigna a alguien, verificar que es miembro del proyecto
         if task_data.assigned_to_id:
-            if not project_service.is_member(
+            if not await project_service.is_member(
                 project_id=task.project_id, user_id=task_data.assigned_to_id
             ):
                 raise InvalidInputError(
@@ -411,7 +631,7 @@ async def update_task(
         # Preparar datos para actualizar
         update_data = task_data.dict(exclude_unset=True)
         
-        updated_task = task_service.update_task(
+        updated_task = await task_service.update_task(
             task_id=task_id, update_data=update_data
         )
         
@@ -438,8 +658,8 @@ async def update_task(
 )
 async def delete_task(
     task_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Elimina una tarea.
@@ -456,8 +676,8 @@ async def delete_task(
                 "READ_ONLY users cannot delete tasks"
             )
         
-        task_service = TaskService(db)
-        task = task_service.get_task(task_id=task_id)
+        task_service = AsyncService(db, TaskService)
+        task = await task_service.get_task(task_id=task_id)
         
         if not task:
             raise TaskNotFoundError(f"Tarea con ID {task_id} no encontrada")
@@ -471,7 +691,7 @@ async def delete_task(
                 "Solo el creador o un administrador puede eliminar la tarea"
             )
         
-        success = task_service.delete_task(task_id=task_id)
+        success = await task_service.delete_task(task_id=task_id)
         
         if not success:
             raise TaskNotFoundError(f"Tarea con ID {task_id} no encontrada")
@@ -498,8 +718,8 @@ async def delete_task(
 async def update_task_status(
     task_id: int,
     new_status: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualiza el estado de una tarea.
@@ -519,16 +739,16 @@ async def update_task_status(
                 f"Estado inválido. Estados válidos: {', '.join(valid_statuses)}"
             )
         
-        task_service = TaskService(db)
-        task = task_service.get_task(task_id=task_id)
+        task_service = AsyncService(db, TaskService)
+        task = await task_service.get_task(task_id=task_id)
         
         if not task:
             raise TaskNotFoundError(f"Tarea con ID {task_id} no encontrada")
         
         # Verificar permisos: usuario debe ser miembro del proyecto (o admin)
-        project_service = ProjectService(db)
+        project_service = AsyncService(db, ProjectService)
         is_admin = current_user.role == "admin"
-        is_member = project_service.is_member(
+        is_member = await project_service.is_member(
             project_id=task.project_id, user_id=current_user.id
         )
         
@@ -537,7 +757,7 @@ async def update_task_status(
                 "No tienes permisos para actualizar esta tarea"
             )
         
-        updated_task = task_service.update_status(
+        updated_task = await task_service.update_status(
             task_id=task_id, new_status=new_status
         )
         
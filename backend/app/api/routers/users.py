@@ -2,14 +2,22 @@
 Router para gestión de usuarios (solo administradores)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.user import UserCreate, UserRead, UserUpdate, UserCreateAdmin, ChangePasswordRequest
 from app.services.user_management_service import UserManagementService
-from app.database.session import get_db
+from app.services.async_service import AsyncService
+from app.database.session import get_async_db, get_read_db
 from app.api.dependencies_rbac import get_current_user_from_header, require_admin
-from app.core.exceptions import UserAlreadyExistsError, UserNotFoundError, TaskFlowException
+from app.core.exceptions import (
+    UserAlreadyExistsError,
+    UserNotFoundError,
+    TaskFlowException,
+    InvalidInputError,
+    PermissionDeniedError,
+)
 from app.core.enums import UserRole
 
 router = APIRouter(prefix="/api/users", tags=["users-admin"])
@@ -18,7 +26,7 @@ router = APIRouter(prefix="/api/users", tags=["users-admin"])
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreateAdmin,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user_from_header)
 ):
     """
@@ -58,8 +66,8 @@ async def create_user(
                 )
             role_to_create = UserRole.READ_ONLY.value
         
-        service = UserManagementService(db)
-        new_user = service.create_user(
+        service = AsyncService(db, UserManagementService)
+        new_user = await service.create_user(
             username=user_data.username,
             email=user_data.email,
             password=user_data.password,
@@ -87,9 +95,11 @@ async def create_user(
 
 @router.get("/", response_model=list[UserRead])
 async def list_users(
-    skip: int = 0,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en el header X-Next-Cursor"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Obsoleto: usar cursor"),
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user_from_header)
 ):
     """
@@ -99,7 +109,9 @@ async def list_users(
     - READ_ONLY: ve solo READ_ONLY (solo a sí mismo)
     
     Args:
-        skip: Número de registros a saltar
+        response: Respuesta HTTP (para el header X-Next-Cursor)
+        cursor: Cursor de la página anterior
+        skip: Número de registros a saltar (obsoleto, se ignora si hay cursor)
         limit: Número máximo de registros
         db: Sesión de base de datos
         current_user: Usuario actual
@@ -107,33 +119,87 @@ async def list_users(
     Returns:
         Lista de usuarios filtrada por rol
     """
-    service = UserManagementService(db)
+    service = AsyncService(db, UserManagementService)
     
-    if current_user.role == UserRole.ADMIN.value:
-        # ADMIN ve todos
-        users = service.list_users(skip=skip, limit=limit)
-    elif current_user.role == UserRole.READ_WRITE.value:
-        # READ_WRITE ve solo READ_WRITE y READ_ONLY
-        users = service.list_users_by_roles(
-            roles=[UserRole.READ_WRITE.value, UserRole.READ_ONLY.value],
-            skip=skip,
-            limit=limit
-        )
-    else:  # READ_ONLY
-        # READ_ONLY ve solo READ_ONLY
-        users = service.list_users_by_roles(
-            roles=[UserRole.READ_ONLY.value],
-            skip=skip,
-            limit=limit
+    try:
+        if current_user.role == UserRole.ADMIN.value:
+            # ADMIN ve todos
+            page = await service.list_users(skip=skip, limit=limit, cursor=cursor)
+        elif current_user.role == UserRole.READ_WRITE.value:
+            # READ_WRITE ve solo READ_WRITE y READ_ONLY
+            page = await service.list_users_by_roles(
+                roles=[UserRole.READ_WRITE.value, UserRole.READ_ONLY.value],
+                skip=skip,
+                limit=limit,
+                cursor=cursor
+            )
+        else:  # READ_ONLY
+            # READ_ONLY ve solo READ_ONLY
+            page = await service.list_users_by_roles(
+                roles=[UserRole.READ_ONLY.value],
+                skip=skip,
+                limit=limit,
+                cursor=cursor
+            )
+    except InvalidInputError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     
-    return users
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+@router.get("/search", response_model=list[UserRead])
+async def search_users(
+    prefix: str = Query(..., min_length=1, max_length=50, description="Prefijo de username, email, nombre o apellido"),
+    project_id: Optional[int] = Query(None, description="Solo miembros de este proyecto"),
+    fuzzy: bool = Query(False, description="Incluir usernames parecidos (PostgreSQL)"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user_from_header)
+):
+    """
+    Buscar usuarios activos por prefijo (selector de asignados)
+    
+    - Sin project_id: misma visibilidad por rol que el listado de usuarios
+    - Con project_id: solo propietario y miembros del proyecto (requiere ser miembro o ADMIN)
+    
+    Args:
+        prefix: Prefijo a buscar (sin distinguir mayúsculas)
+        project_id: Limitar a miembros de un proyecto
+        fuzzy: Incluir usernames parecidos por trigramas (solo PostgreSQL)
+        limit: Número máximo de resultados
+        db: Sesión de base de datos
+        current_user: Usuario actual
+        
+    Returns:
+        Usuarios que coinciden, primero los que empiezan por el prefijo en el username
+    """
+    service = AsyncService(db, UserManagementService)
+    
+    try:
+        return await service.search_users(
+            prefix=prefix,
+            current_user_id=current_user.id,
+            current_user_role=current_user.role,
+            project_id=project_id,
+            fuzzy=fuzzy,
+            limit=limit,
+        )
+    except PermissionDeniedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e)
+        )
 
 
 @router.get("/{user_id}", response_model=UserRead)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user_from_header)
 ):
     """
@@ -151,8 +217,8 @@ async def get_user(
         Usuario solicitado
     """
     try:
-        service = UserManagementService(db)
-        user = service.get_user(user_id)
+        service = AsyncService(db, UserManagementService)
+        user = await service.get_user(user_id)
         
         # Validar que el usuario tenga permiso de ver este usuario
         if current_user.role == UserRole.ADMIN.value:
@@ -185,7 +251,7 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user_from_header)
 ):
     """
@@ -223,8 +289,8 @@ async def update_user(
                     detail=f"READ_WRITE users can only set READ_ONLY role. Requested: {user_update.role}"
                 )
         
-        service = UserManagementService(db)
-        updated_user = service.update_user(
+        service = AsyncService(db, UserManagementService)
+        updated_user = await service.update_user(
             user_id,
             email=user_update.email,
             role=user_update.role,
@@ -247,7 +313,7 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_200_OK)
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user_from_header)
 ):
     """
@@ -268,8 +334,8 @@ async def delete_user(
         )
     
     try:
-        service = UserManagementService(db)
-        service.delete_user(user_id)
+        service = AsyncService(db, UserManagementService)
+        await service.delete_user(user_id)
         return {"message": f"Usuario {user_id} desactivado exitosamente"}
     except UserNotFoundError as e:
         raise HTTPException(
@@ -281,7 +347,7 @@ async def delete_user(
 @router.post("/{user_id}/activate", status_code=status.HTTP_200_OK)
 async def activate_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user_from_header)
 ):
     """
@@ -302,8 +368,8 @@ async def activate_user(
         )
     
     try:
-        service = UserManagementService(db)
-        service.activate_user(user_id)
+        service = AsyncService(db, UserManagementService)
+        await service.activate_user(user_id)
         return {"message": f"Usuario {user_id} activado exitosamente"}
     except UserNotFoundError as e:
         raise HTTPException(
@@ -316,7 +382,7 @@ async def activate_user(
 async def change_password(
     user_id: int,
     request: ChangePasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user_from_header)
 ):
     """
@@ -343,8 +409,8 @@ async def change_password(
         )
     
     try:
-        service = UserManagementService(db)
-        service.change_password(user_id, request.new_password)
+        service = AsyncService(db, UserManagementService)
+        await service.change_password(user_id, request.new_password)
         return {"message": f"Contraseña del usuario {user_id} actualizada exitosamente"}
     except UserNotFoundError as e:
         raise HTTPException(
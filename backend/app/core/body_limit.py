@@ -0,0 +1,54 @@
+"""
+Request body size limit enforced while the body is received
+
+FastAPI parses form and file fields before running the endpoint and its
+dependencies, so a size check there only happens after the whole upload has
+been spooled to disk. This middleware rejects oversized bodies up front.
+"""
+import re
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware that caps the request body of the routes matching ``path``
+
+    A request announcing a larger Content-Length is answered 413 before any of
+    its body is read. Bodies without one (chunked uploads) are counted as they
+    arrive and fail with 413 as soon as they exceed the limit.
+    """
+
+    def __init__(self, app: ASGIApp, path: str, max_bytes: int):
+        self.app = app
+        self.path = re.compile(path)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.path.fullmatch(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"La petición supera el máximo de {self.max_bytes} bytes"
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length", b"").decode("latin-1")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Re-raised by FastAPI's body parsing and answered by the exception handlers
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
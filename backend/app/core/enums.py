@@ -25,3 +25,15 @@ class TaskStatus(str, Enum):
     IN_PROGRESS = "in_progress"
     REVIEW = "review"
     COMPLETED = "completed"
+
+
+class BulkMode(str, Enum):
+    """Error handling for bulk operations"""
+    ATOMIC = "atomic"    # all-or-nothing: any invalid item rejects the batch
+    PARTIAL = "partial"  # valid items are applied, invalid ones are reported
+
+
+class ExportFormat(str, Enum):
+    """Serialization of task exports and imports"""
+    NDJSON = "ndjson"  # one JSON object per line
+    CSV = "csv"
@@ -46,3 +46,13 @@ class InvalidCredentialsError(TaskFlowException):
 class InvalidTokenError(TaskFlowException):
     """Raised when token is invalid or expired"""
     pass
+
+
+class PasswordHashingBusyError(Exception):
+    """
+    Raised when the password hashing pool is saturated
+    
+    Deliberately not a TaskFlowException: routers map those to 4xx, while this
+    one must reach the global handler that answers 503 + Retry-After.
+    """
+    pass
@@ -0,0 +1,44 @@
+"""
+Minimal in-process latency metrics, exposed by GET /metrics
+"""
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+# Samples kept per metric for the percentiles
+LATENCY_WINDOW = 1000
+
+
+class LatencyStats:
+    """Count and max since start, plus p50/p95 over the last LATENCY_WINDOW samples"""
+
+    def __init__(self):
+        self.count = 0
+        self.max = 0.0
+        self._recent: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add one sample"""
+        with self._lock:
+            self.count += 1
+            self.max = max(self.max, seconds)
+            self._recent.append(seconds)
+
+    def stats(self) -> Dict[str, float]:
+        """Count, p50, p95 and max, in milliseconds"""
+        with self._lock:
+            recent = sorted(self._recent)
+            count, worst = self.count, self.max
+        if not recent:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": count,
+            "p50_ms": round(recent[len(recent) // 2] * 1000, 2),
+            "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 2),
+            "max_ms": round(worst * 1000, 2),
+        }
+
+
+# End-to-end time of POST /api/auth/login
+login_latency = LatencyStats()
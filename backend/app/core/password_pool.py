@@ -0,0 +1,108 @@
+"""
+Bounded worker pool for password hashing
+
+bcrypt costs hundreds of milliseconds of CPU per call. The services run on
+the event loop (through AsyncService), so hashing inline would stall every
+other request on the worker during a burst of logins. Instead ``offload``
+hands the call to a small thread pool (bcrypt releases the GIL, so threads
+hash in parallel without the pickling and start-up cost of processes) and
+the request waits for it without blocking the loop.
+
+At most PASSWORD_HASH_WORKERS calls run at once and PASSWORD_HASH_QUEUE more
+may wait; beyond that the call fails fast with PasswordHashingBusyError,
+which the API turns into a 503.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+import greenlet
+from sqlalchemy.util import await_only
+
+try:
+    # Private: the only marker of the run_sync greenlet in SQLAlchemy 2.0.23
+    from sqlalchemy.util._concurrency_py3k import _AsyncIoGreenlet
+except ImportError:  # moved or renamed; newer releases set __sqlalchemy_greenlet_provider__
+    _AsyncIoGreenlet = None
+
+from app.core.exceptions import PasswordHashingBusyError
+from app.core.metrics import LatencyStats
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+
+R = TypeVar("R")
+
+
+class PasswordPool:
+    """Thread pool with a bound on running + waiting calls and per-call latency stats"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue: int = PASSWORD_HASH_QUEUE):
+        self.workers = workers
+        self.queue = queue
+        self.in_flight = 0
+        self.rejected = 0
+        self.latency = LatencyStats()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., R], *args: Any) -> R:
+        """
+        Run ``fn(*args)`` on the pool
+
+        Raises:
+            PasswordHashingBusyError: If workers and queue are all taken
+        """
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue:
+                self.rejected += 1
+                raise PasswordHashingBusyError("Demasiadas operaciones de contraseña en curso")
+            self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, current depth (running + queued), rejections and latency (queue + hash)"""
+        with self._lock:
+            depth, rejected = self.in_flight, self.rejected
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue,
+            "depth": depth,
+            "queued": max(0, depth - self.workers),
+            "rejected": rejected,
+            "latency": self.latency.stats(),
+        }
+
+
+password_pool = PasswordPool()
+
+
+def offload(fn: Callable[..., R], *args: Any) -> R:
+    """
+    Call ``fn(*args)`` on the password pool from synchronous service code
+
+    Inside AsyncService (a run_sync greenlet) the request awaits the pool and
+    the event loop stays free. Scripts and jobs that use the services without
+    an event loop simply call ``fn`` inline.
+    """
+    if not _in_async_greenlet():
+        return fn(*args)
+    return await_only(password_pool.run(fn, *args))
+
+
+def _in_async_greenlet() -> bool:
+    """Whether we run inside SQLAlchemy's run_sync greenlet, where await_only works"""
+    current = greenlet.getcurrent()
+    # Newer SQLAlchemy releases flag their greenlets; 2.0.23 only has the class
+    if getattr(current, "__sqlalchemy_greenlet_provider__", False):
+        return True
+    return _AsyncIoGreenlet is not None and isinstance(current, _AsyncIoGreenlet)
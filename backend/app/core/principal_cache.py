@@ -0,0 +1,134 @@
+"""
+In-process caches of authenticated principals and token versions
+
+Every authenticated request needs the caller's id, role and active flag.
+Instead of selecting the users row each time, a small detached snapshot is
+kept per user id for a bounded time (LRU + TTL). Writes that change a user's
+role, status or password invalidate the entry explicitly, both immediately and
+again when their transaction commits, so a concurrent request cannot re-cache
+the old row in between.
+
+In claims mode (AUTH_CLAIMS_PRINCIPAL) read endpoints trust the role signed
+into the token instead, and only compare the token's ``ver`` claim with the
+user's current ``token_version``, kept in a second cache of the same kind.
+Those writes bump the version, which revokes every token issued before them.
+
+The cache is per process: with several workers, another worker's copy stays
+valid until its TTL expires (PRINCIPAL_CACHE_TTL_SECONDS).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+CLAIMS_PRINCIPAL = os.getenv("AUTH_CLAIMS_PRINCIPAL", "false").lower() in ("1", "true", "yes")
+
+# Session.info key holding the user ids to invalidate after commit
+PENDING_INVALIDATIONS_KEY = "principal_invalidations"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Detached snapshot of the authenticated user"""
+    id: int
+    role: str
+    is_active: bool
+
+
+class UserCache:
+    """Bounded LRU of per-user values (by user id), each entry expiring after ``ttl`` seconds"""
+
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_SIZE, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every invalidation; see put()
+        self.epoch = 0
+        self._entries: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Any]:
+        """Cached value, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user_id: int, value: Any, epoch: Optional[int] = None) -> Any:
+        """
+        Cache a user's value (evicting the least recently used one if full) and return it
+
+        Pass the ``epoch`` read before loading the value: if any invalidation
+        happened meanwhile, the loaded row may predate it and is not cached.
+        """
+        if self.maxsize <= 0:
+            return value
+        with self._lock:
+            if epoch is not None and epoch != self.epoch:
+                return value
+            self._entries[user_id] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget a user's value"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self.epoch += 1
+
+    def clear(self) -> None:
+        """Forget every value and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+principal_cache = UserCache()
+# Current token_version per user, checked against the ``ver`` claim in claims mode
+token_versions = UserCache()
+
+
+def invalidate_principal(db: Session, user_id: int) -> None:
+    """
+    Invalidate a user's cached principal and token version now and once ``db`` commits
+
+    Args:
+        db: Session whose transaction changes the user
+        user_id: User whose role, status or credentials change
+    """
+    principal_cache.invalidate(user_id)
+    token_versions.invalidate(user_id)
+    db.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id in session.info.pop(PENDING_INVALIDATIONS_KEY, ()):
+        principal_cache.invalidate(user_id)
+        token_versions.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
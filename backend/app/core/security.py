@@ -2,13 +2,42 @@
 Security utilities for JWT and password hashing
 """
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 import os
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.password_pool import offload
+from app.core.token_cache import token_digest, verified_tokens
+
+# Password hashing: the first scheme hashes new passwords, the others are only
+# verified (and rehashed on login). Cost per scheme via PASSWORD_<SCHEME>_ROUNDS,
+# e.g. PASSWORD_BCRYPT_ROUNDS=12. argon2 needs the argon2-cffi package.
+PASSWORD_SCHEMES = [
+    scheme.strip() for scheme in os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",") if scheme.strip()
+]
+
+
+def build_password_context(schemes: List[str]) -> CryptContext:
+    """
+    Build the passlib context for the given schemes, reading their cost from the environment
+    
+    Args:
+        schemes: Scheme names, preferred first
+        
+    Returns:
+        Context hashing with ``schemes[0]`` and flagging any other hash, or
+        one with a different cost, as needing an update
+    """
+    settings = {
+        f"{scheme}__rounds": int(os.environ[f"PASSWORD_{scheme.upper()}_ROUNDS"])
+        for scheme in schemes
+        if os.getenv(f"PASSWORD_{scheme.upper()}_ROUNDS")
+    }
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
+
+pwd_context = build_password_context(PASSWORD_SCHEMES)
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
@@ -18,7 +47,8 @@ ACCESS_TOKEN_EXPIRE_HOURS = 24
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt
+    Hash a password with the first scheme in PASSWORD_SCHEMES, at the cost set by
+    PASSWORD_<SCHEME>_ROUNDS (on the password pool when called from a request)
     
     Args:
         password: Plain password
@@ -26,12 +56,12 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    return offload(pwd_context.hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against its hash
+    Verify a password against its hash (on the password pool when called from a request)
     
     Args:
         plain_password: Plain password to verify
@@ -40,7 +70,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return offload(pwd_context.verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash is stale, rehash it with the current settings
+    
+    Args:
+        plain_password: Plain password to verify
+        hashed_password: Stored hash
+        
+    Returns:
+        (matches, new hash or None if the stored one is up to date)
+    """
+    return offload(pwd_context.verify_and_update, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -71,6 +115,9 @@ def decode_token(token: str) -> dict:
     """
     Decode and verify a JWT token
     
+    Tokens already verified are answered from the verified-token cache until
+    they expire, without checking the signature again.
+    
     Args:
         token: JWT token to decode
         
@@ -80,8 +127,13 @@ def decode_token(token: str) -> dict:
     Raises:
         JWTError: If token is invalid or expired
     """
+    key = token_digest(token)
+    payload = verified_tokens.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError as e:
         raise JWTError(f"Invalid token: {str(e)}")
+    verified_tokens.put(key, payload)
+    return payload
@@ -0,0 +1,74 @@
+"""
+In-process cache of verified JWT claims
+
+Clients send the same access token on every request, so the HS256 check and
+JSON parse in decode_token are repeated for identical input. Once a token has
+been verified its claims are kept, keyed by a SHA-256 digest of the token (the
+token itself is never stored), until the token's own ``exp``. The cache is a
+bounded LRU, so memory stays capped however many tokens are in circulation.
+
+Only successful verifications are cached; invalid tokens are rejected by the
+full check every time.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+def token_digest(token: str) -> bytes:
+    """Cache key of a token"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified claims by token digest, each expiring at the claim ``exp``"""
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Copy of the cached claims, or None if absent or the token has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, claims: Dict[str, Any]) -> None:
+        """Cache verified claims until their ``exp`` (tokens without one are not cached)"""
+        expires_at = claims.get("exp")
+        if self.maxsize <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = (float(expires_at), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every token and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+verified_tokens = VerifiedTokenCache()
@@ -0,0 +1,78 @@
+"""
+Request-scoped unit of work
+
+Repositories only flush: every statement of a request runs in one
+transaction on the request's session, and UnitOfWorkMiddleware commits it
+once, right before the response is sent. Error responses (status >= 400)
+and unhandled exceptions are never committed; the session is rolled back
+when get_async_db closes it.
+
+Scripts and jobs that use SessionLocal directly commit on their own.
+"""
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Key of the request session in the ASGI scope state (set by get_async_db)
+SESSION_STATE_KEY = "unit_of_work_session"
+
+# Methods that never write; their read transaction is just closed
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def register_session(state: dict, session: AsyncSession) -> None:
+    """Make ``session`` the unit of work of the request owning ``state``"""
+    state[SESSION_STATE_KEY] = session
+
+
+class UnitOfWorkMiddleware:
+    """
+    ASGI middleware that commits the request session before the response starts
+
+    Committing before ``http.response.start`` (rather than in the dependency
+    teardown, which runs after the response is sent) means a client never sees
+    a success for data that failed to commit. If the commit fails the response
+    is replaced by a 500.
+
+    Relies on FastAPI < 0.106, where dependency teardown (and so the closing
+    of the session by get_async_db) runs after the response is sent; from
+    0.106 on the session would already be closed here. fastapi is pinned
+    accordingly in requirements.txt.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        failed = False
+
+        async def send_after_commit(message: Message) -> None:
+            nonlocal failed
+            if failed:
+                return
+            if message["type"] == "http.response.start":
+                session = state.get(SESSION_STATE_KEY)
+                if session is not None and message["status"] < 400 and session.in_transaction():
+                    try:
+                        await session.commit()
+                    except Exception:
+                        logger.exception("Commit of %s %s failed", scope["method"], scope["path"])
+                        await session.rollback()
+                        failed = True
+                        response = JSONResponse(
+                            {"detail": "No se pudieron guardar los cambios"}, status_code=500
+                        )
+                        await response(scope, receive, send)
+                        return
+            await send(message)
+
+        await self.app(scope, receive, send_after_commit)
@@ -0,0 +1,3 @@
+"""
+Background jobs (run after the response or from the command line)
+"""
@@ -0,0 +1,64 @@
+"""
+Chunked purge of large projects
+
+Deleting a project relies on ON DELETE CASCADE, which removes all of its tasks
+in the same transaction. For projects with tens of thousands of tasks this job
+deletes the tasks in bounded batches (one short transaction each) and then the
+project itself.
+
+Usage:
+    python -m app.jobs.project_purge <project_id> [--batch-size N]
+"""
+import argparse
+import logging
+import os
+
+from app.database.session import SessionLocal
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+# Tasks deleted per transaction
+PURGE_BATCH_SIZE = int(os.getenv("PROJECT_PURGE_BATCH_SIZE", "1000"))
+
+
+def purge_project(project_id: int, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Delete a project's tasks in batches, then the project
+    
+    Args:
+        project_id: Project to purge
+        batch_size: Tasks deleted per transaction
+        
+    Returns:
+        Number of tasks deleted
+    """
+    db = SessionLocal()
+    try:
+        task_repo = TaskRepository(db)
+        total = 0
+        while True:
+            deleted = task_repo.delete_project_tasks_batch(project_id, batch_size)
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+        ProjectRepository(db).delete(project_id)
+        db.commit()
+        logger.info("Purged project %s (%s tasks)", project_id, total)
+        return total
+    except Exception:
+        logger.exception("Purge of project %s failed", project_id)
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Purge a project in batches")
+    parser.add_argument("project_id", type=int)
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(f"Deleted {purge_project(args.project_id, args.batch_size)} tasks")
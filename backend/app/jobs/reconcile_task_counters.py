@@ -0,0 +1,47 @@
+"""
+Rebuild project_task_counters from the tasks table
+
+The counters are maintained incrementally on every task write; this job
+recomputes them from scratch (in one transaction) to repair any drift, e.g.
+after manual SQL edits or a restore. Safe to run periodically.
+
+Usage:
+    python -m app.jobs.reconcile_task_counters [project_id ...]
+"""
+import argparse
+import logging
+from typing import Iterable, Optional
+
+from app.database.session import SessionLocal
+from app.repositories.task_counter_repository import TaskCounterRepository
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_task_counters(project_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recompute task counters for all projects, or only for the given ones
+    
+    Args:
+        project_ids: Projects to rebuild (None = all)
+    """
+    db = SessionLocal()
+    try:
+        TaskCounterRepository(db).rebuild(project_ids)
+        db.commit()
+        logger.info("Rebuilt task counters for %s", "all projects" if project_ids is None else project_ids)
+    except Exception:
+        db.rollback()
+        logger.exception("Task counter reconciliation failed")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-project task counters")
+    parser.add_argument("project_ids", type=int, nargs="*")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    reconcile_task_counters(args.project_ids or None)
+    print("Task counters rebuilt")
@@ -0,0 +1,65 @@
+"""
+Vacuum and reindex the hash partitions of tasks one at a time
+
+When tasks is partitioned (migration 0008, PostgreSQL only) each partition is
+an ordinary table, so maintenance can run partition by partition: every
+statement holds locks on a fraction of the data and a slow partition does not
+block the rest. REINDEX uses CONCURRENTLY so writes keep flowing.
+
+Usage:
+    python -m app.jobs.task_partition_maintenance [--reindex] [partition ...]
+"""
+import argparse
+import logging
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+
+from app.database.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+def list_task_partitions() -> List[str]:
+    """Names of the partitions of tasks (empty if the table is not partitioned)"""
+    if engine.dialect.name != "postgresql":
+        return []
+    with engine.connect() as conn:
+        return list(conn.scalars(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('tasks') ORDER BY c.relname"
+        )))
+
+
+def maintain_task_partitions(partitions: Optional[Iterable[str]] = None,
+                             reindex: bool = False) -> List[str]:
+    """
+    Run VACUUM (ANALYZE), and optionally REINDEX, on each partition separately
+
+    Args:
+        partitions: Partitions to process (None = all of them)
+        reindex: Also rebuild the partition's indexes
+
+    Returns:
+        The partitions processed
+    """
+    existing = list_task_partitions()
+    selected = existing if partitions is None else [p for p in partitions if p in existing]
+    # VACUUM and REINDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for partition in selected:
+            conn.execute(text(f'VACUUM (ANALYZE) "{partition}"'))
+            if reindex:
+                conn.execute(text(f'REINDEX TABLE CONCURRENTLY "{partition}"'))
+            logger.info("Maintained task partition %s", partition)
+    return selected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vacuum/reindex task partitions one by one")
+    parser.add_argument("partitions", nargs="*")
+    parser.add_argument("--reindex", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    done = maintain_task_partitions(args.partitions or None, reindex=args.reindex)
+    print(f"Maintained {len(done)} task partitions")
@@ -2,15 +2,24 @@
 FastAPI application entry point
 """
 import os
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 
-from app.database.session import create_tables, get_db, SessionLocal
+from app.database.session import create_tables, get_db, SessionLocal, async_engine, replicas
+from app.database.unit_of_work import UnitOfWorkMiddleware
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.exceptions import PasswordHashingBusyError
+from app.core.metrics import login_latency
+from app.core.password_pool import password_pool
+from app.core.principal_cache import principal_cache
+from app.core.token_cache import verified_tokens
+from app.services.task_import import IMPORT_MAX_BYTES
 from app.api.routers import auth, users, projects, tasks
+from app.api.dependencies_rbac import require_admin
 
 
 # Startup event
@@ -62,6 +71,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("Shutting down TaskFlow API...")
+    await async_engine.dispose()
+    await replicas.dispose()
 
 
 # Create FastAPI application
@@ -136,6 +147,14 @@ app.openapi = custom_openapi
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 
+# Reject oversized task imports before the upload is spooled
+# (added before CORS so the 413 still carries the CORS headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    path=r"/api/projects/\d+/tasks/import",
+    max_bytes=IMPORT_MAX_BYTES,
+)
+
 # Configure CORS
 cors_origins = os.getenv("CORS_ORIGINS", "*").split(",")
 app.add_middleware(
@@ -144,8 +163,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
+# Commit each write request's transaction once, before its response is sent
+app.add_middleware(UnitOfWorkMiddleware)
+
+
+@app.exception_handler(PasswordHashingBusyError)
+async def password_pool_busy_handler(request: Request, exc: PasswordHashingBusyError):
+    """Password pool saturated: reject at once and let the client retry"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Servicio ocupado, inténtalo de nuevo en unos segundos"},
+        headers={"Retry-After": "1"},
+    )
+
 # Include routers
 try:
     from app.api.routers import auth, users, projects, tasks
@@ -209,6 +242,22 @@ async def health_check():
     return {"status": "healthy", "service": "TaskFlow API"}
 
 
+@app.get("/metrics", tags=["health"], dependencies=[Depends(require_admin)])
+async def metrics():
+    """
+    In-process cache counters (per worker), admin only
+    
+    Returns:
+        Cache hit/miss counters, login latency and password pool depth
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": verified_tokens.stats(),
+        "login_latency": login_latency.stats(),
+        "password_pool": password_pool.stats(),
+    }
+
+
 @app.get("/", tags=["root"])
 async def root():
     """
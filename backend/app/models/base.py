@@ -1,6 +1,13 @@
 """
 Base model for SQLAlchemy ORM
 """
+import os
+
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+# Default loader strategy for relationships. Responses declare their eager
+# loads explicitly (see app/repositories/loaders.py); test runs set this to
+# "raise" so any unplanned lazy load (an N+1 in the making) fails loudly.
+RELATIONSHIP_LAZY = os.getenv("SQLALCHEMY_RELATIONSHIP_LAZY", "select")
@@ -5,5 +5,7 @@ from app.models.base import Base
 from app.models.user import User
 from app.models.project import Project
 from app.models.task import Task
+from app.models.project_task_counter import ProjectTaskCounter
+from app.models import task_search  # noqa: F401  (registers the search DDL)
 
-__all__ = ["Base", "User", "Project", "Task"]
+__all__ = ["Base", "User", "Project", "Task", "ProjectTaskCounter"]
@@ -2,10 +2,10 @@
 Project model
 """
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 
-from app.models.base import Base
+from app.models.base import Base, RELATIONSHIP_LAZY
 
 # Association table for many-to-many relationship between Project and User
 project_members = Table(
@@ -13,6 +13,8 @@ project_members = Table(
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key starts with project_id; this one serves "projects of a user"
+    Index("ix_project_members_user_id", "user_id", "project_id"),
 )
 
 
@@ -25,7 +27,7 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(100), nullable=False)
     descripcion = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(
@@ -34,23 +36,29 @@ class Project(Base):
         onupdate=lambda: datetime.now(timezone.utc)
     )
 
-    # Relationships
+    # Relationships (tasks and memberships are removed by the ON DELETE CASCADE
+    # foreign keys; passive_deletes keeps the ORM from loading them to delete row by row)
     owner = relationship(
         "User",
         back_populates="owned_projects",
-        foreign_keys=[owner_id]
+        foreign_keys=[owner_id],
+        lazy=RELATIONSHIP_LAZY
     )
     
     members = relationship(
         "User",
         secondary=project_members,
-        back_populates="member_projects"
+        back_populates="member_projects",
+        passive_deletes=True,
+        lazy=RELATIONSHIP_LAZY
     )
     
     tasks = relationship(
         "Task",
         back_populates="project",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy=RELATIONSHIP_LAZY
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,31 @@
+"""
+Project task counter model
+"""
+from sqlalchemy import Column, Integer, ForeignKey, Enum
+
+from app.models.base import Base
+from app.core.enums import TaskPriority, TaskStatus
+
+
+class ProjectTaskCounter(Base):
+    """
+    Denormalized number of tasks per (project, status, priority)
+    
+    Maintained by TaskRepository in the same transaction as every task write,
+    so project progress can be read without scanning the tasks table.
+    Rebuilt from scratch by app.jobs.reconcile_task_counters.
+    """
+    __tablename__ = "project_task_counters"
+
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    status = Column(Enum(TaskStatus), primary_key=True)
+    priority = Column(Enum(TaskPriority), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProjectTaskCounter(project_id={self.project_id}, status={self.status}, "
+            f"priority={self.priority}, count={self.count})>"
+        )
@@ -2,11 +2,27 @@
 Task model
 """
 from datetime import datetime, timezone, date
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, SmallInteger, String, Text, DateTime, Date, ForeignKey, Enum, Index, text
+from sqlalchemy.orm import relationship, synonym
 
-from app.models.base import Base
+from app.models.base import Base, RELATIONSHIP_LAZY
 from app.core.enums import TaskPriority, TaskStatus
+from app.core.constants import PRIORITY_LEVELS, STATUS_ORDER
+
+# Predicate for the partial index on open tasks that have a due date
+# (enum columns store member names, e.g. 'COMPLETED')
+OPEN_TASKS_WITH_DUE_DATE = "status <> 'COMPLETED' AND due_date IS NOT NULL"
+
+
+def _rank_case(column: str, ranks: dict) -> str:
+    """CASE expression mapping stored enum names to their integer rank"""
+    whens = " ".join(f"WHEN '{member.name}' THEN {rank}" for member, rank in ranks.items())
+    return f"CASE {column} {whens} END"
+
+
+# Integer ranks used to sort by priority / workflow order in the database
+PRIORITY_RANK_SQL = _rank_case("priority", PRIORITY_LEVELS)
+STATUS_RANK_SQL = _rank_case("status", STATUS_ORDER)
 
 
 class Task(Base):
@@ -14,17 +30,35 @@ class Task(Base):
     Task model representing project tasks
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_status_priority", "project_id", "status", "priority"),
+        Index("ix_tasks_assigned_status", "assigned_to_id", "status"),
+        Index("ix_tasks_creator_id", "creator_id"),
+        Index(
+            "ix_tasks_open_due_date",
+            "project_id",
+            "due_date",
+            postgresql_where=text(OPEN_TASKS_WITH_DUE_DATE),
+            sqlite_where=text(OPEN_TASKS_WITH_DUE_DATE),
+        ),
+    )
+    # Fetch the generated rank columns with RETURNING on INSERT/UPDATE instead
+    # of expiring them (no refresh round trip after a flush)
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
     status = Column(Enum(TaskStatus), default=TaskStatus.PENDING, nullable=False)
+    # Generated from priority/status (core.constants), so any write keeps them in sync
+    priority_rank = Column(SmallInteger, Computed(PRIORITY_RANK_SQL, persisted=True))
+    status_rank = Column(SmallInteger, Computed(STATUS_RANK_SQL, persisted=True))
     due_date = Column(Date, nullable=True)
     
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    assigned_to_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    assigned_to_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(
@@ -36,20 +70,32 @@ class Task(Base):
     # Relationships
     project = relationship(
         "Project",
-        back_populates="tasks"
+        back_populates="tasks",
+        lazy=RELATIONSHIP_LAZY
     )
     
     creator = relationship(
         "User",
         back_populates="created_tasks",
-        foreign_keys=[creator_id]
+        foreign_keys=[creator_id],
+        lazy=RELATIONSHIP_LAZY
     )
     
     assigned_to_user = relationship(
         "User",
         back_populates="assigned_tasks",
-        foreign_keys=[assigned_to_id]
+        foreign_keys=[assigned_to_id],
+        lazy=RELATIONSHIP_LAZY
     )
+    
+    # Name used by the TaskReadWithAssignee schema
+    assigned_to = synonym("assigned_to_user")
 
     def __repr__(self) -> str:
         return f"<Task(id={self.id}, title='{self.title}', status={self.status})>"
+
+
+# Sorted listings (sort=-priority,due_date and sort=status,-priority)
+Index("ix_tasks_project_priority_rank", Task.project_id, Task.priority_rank.desc(), Task.due_date, Task.id)
+Index("ix_tasks_project_status_rank", Task.project_id, Task.status_rank, Task.priority_rank.desc(), Task.id)
+Index("ix_tasks_assigned_priority_rank", Task.assigned_to_id, Task.priority_rank.desc(), Task.due_date, Task.id)
@@ -0,0 +1,69 @@
+"""
+Full-text search structures for tasks
+
+The search index lives outside the ORM mapping because it is dialect-specific:
+- PostgreSQL: a generated tsvector column on tasks with a GIN index
+- SQLite: an external-content FTS5 table kept in sync by triggers
+
+The DDL is attached to the tasks table, so create_all() builds it for new
+databases; migration 0005 adds it to existing ones.
+"""
+from sqlalchemy import DDL, event
+
+from app.models.task import Task
+
+# Text search configuration used for the tsvector column and queries
+SEARCH_CONFIG = "spanish"
+
+# Name of the generated column / FTS table (not mapped on Task)
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_FTS_TABLE = "tasks_fts"
+
+POSTGRESQL_DDL = [
+    f"""
+    ALTER TABLE tasks ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN ({SEARCH_VECTOR_COLUMN})",
+]
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_FTS_TABLE} USING fts5(
+        title, description, content='tasks', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+for _statement in POSTGRESQL_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
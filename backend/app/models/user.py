@@ -2,10 +2,10 @@
 User model
 """
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, DDL, Index, event, func
 from sqlalchemy.orm import relationship
 
-from app.models.base import Base
+from app.models.base import Base, RELATIONSHIP_LAZY
 from app.core.enums import UserRole
 
 
@@ -23,6 +23,8 @@ class User(Base):
     hashed_password = Column(String(300), nullable=False)  # Aumentado a 300 para bcrypt
     role = Column(String(20), nullable=False, default=UserRole.READ_WRITE.value)
     is_active = Column(Boolean, default=True)
+    # Signed into tokens as "ver"; bumped to revoke every token issued before
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(
         DateTime,
@@ -30,32 +32,67 @@ class User(Base):
         onupdate=lambda: datetime.now(timezone.utc)
     )
 
-    # Relationships
+    # Relationships (dependent rows are removed or unassigned by the database
+    # through ON DELETE CASCADE / SET NULL, see passive_deletes)
     owned_projects = relationship(
         "Project",
         back_populates="owner",
         foreign_keys="Project.owner_id",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy=RELATIONSHIP_LAZY
     )
     
     member_projects = relationship(
         "Project",
         secondary="project_members",
-        back_populates="members"
+        back_populates="members",
+        passive_deletes=True,
+        lazy=RELATIONSHIP_LAZY
     )
     
     created_tasks = relationship(
         "Task",
         back_populates="creator",
         foreign_keys="Task.creator_id",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy=RELATIONSHIP_LAZY
     )
     
     assigned_tasks = relationship(
         "Task",
         back_populates="assigned_to_user",
-        foreign_keys="Task.assigned_to_id"
+        foreign_keys="Task.assigned_to_id",
+        passive_deletes=True,
+        lazy=RELATIONSHIP_LAZY
     )
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
+
+
+# Prefix lookups (assignee pickers) compare lower(column) against a prefix.
+# text_pattern_ops lets PostgreSQL use the btree for LIKE 'abc%' under any
+# collation; on SQLite these are plain expression indexes serving range scans.
+USER_PREFIX_INDEXES = [
+    Index(
+        f"ix_users_{name}_prefix",
+        func.lower(column).label(f"{name}_lower"),
+        postgresql_ops={f"{name}_lower": "text_pattern_ops"},
+    )
+    for name, column in (
+        ("username", User.username),
+        ("email", User.email),
+        ("first_name", User.first_name),
+        ("last_name", User.last_name),
+    )
+]
+
+# Trigram index for fuzzy username matches (PostgreSQL only, needs pg_trgm)
+USER_TRIGRAM_INDEX = "ix_users_username_trgm"
+for _statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS {USER_TRIGRAM_INDEX} ON users USING GIN (lower(username) gin_trgm_ops)",
+):
+    event.listen(User.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
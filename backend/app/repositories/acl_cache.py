@@ -0,0 +1,45 @@
+"""
+Request-scoped permission cache
+
+The cache lives in ``Session.info``; since every request gets its own
+session, memoized membership/ownership answers never outlive the request
+that computed them.
+"""
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+# (check, project_id, user_id)
+CacheKey = Tuple[str, int, int]
+
+
+class PermissionCache:
+    """Memoizes project membership and ownership checks for one session"""
+
+    SESSION_KEY = "permission_cache"
+
+    def __init__(self):
+        self._entries: Dict[CacheKey, bool] = {}
+
+    @classmethod
+    def for_session(cls, db: Session) -> "PermissionCache":
+        """Get (or create) the cache attached to a session"""
+        cache = db.info.get(cls.SESSION_KEY)
+        if cache is None:
+            cache = cls()
+            db.info[cls.SESSION_KEY] = cache
+        return cache
+
+    def get(self, check: str, project_id: int, user_id: int) -> Optional[bool]:
+        """Get a memoized answer, or None if it was never computed"""
+        return self._entries.get((check, project_id, user_id))
+
+    def set(self, check: str, project_id: int, user_id: int, allowed: bool) -> bool:
+        """Memoize an answer and return it"""
+        self._entries[(check, project_id, user_id)] = allowed
+        return allowed
+
+    def invalidate_project(self, project_id: int) -> None:
+        """Forget every answer about a project (after membership/ownership changes)"""
+        for key in [key for key in self._entries if key[1] == project_id]:
+            del self._entries[key]
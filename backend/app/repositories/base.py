@@ -1,9 +1,16 @@
 """
 Base repository class for all repositories
+
+Repositories flush but never commit: the request's unit of work (see
+app/database/unit_of_work.py) commits once per request, and scripts using
+SessionLocal commit themselves.
 """
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from typing import TypeVar, Generic, List, Optional
 
+from app.repositories.pagination import Page, SortKey, paginate
+
 T = TypeVar('T')
 
 
@@ -16,17 +23,17 @@ class BaseRepository(Generic[T]):
     
     def create(self, **kwargs) -> T:
         """Create a new entity"""
-        entity = self.model(**kwargs)
-        self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
-        return entity
+        return self.create_from_obj(self.model(**kwargs))
     
     def create_from_obj(self, obj: T) -> T:
-        """Create a new entity from an object"""
+        """
+        Create a new entity from an object
+        
+        The INSERT is flushed so the generated ID (and any server default,
+        fetched with RETURNING) is available without a refresh.
+        """
         self.db.add(obj)
-        self.db.commit()
-        self.db.refresh(obj)
+        self.db.flush()
         return obj
     
     def get_by_id(self, entity_id: int) -> Optional[T]:
@@ -41,19 +48,37 @@ class BaseRepository(Generic[T]):
         """Get all entities with pagination"""
         return self.db.query(self.model).offset(skip).limit(limit).all()
     
+    def get_page(self, limit: int = 100, cursor: Optional[str] = None, skip: int = 0) -> Page[T]:
+        """Get a page of entities ordered by ID (keyset pagination, skip is a deprecated fallback)"""
+        items, next_cursor = paginate(
+            self.db.query(self.model), [SortKey(self.model.id, "id")], limit, cursor, skip
+        )
+        return Page(items, next_cursor)
+    
     def update(self, entity_id: int, **kwargs) -> Optional[T]:
-        """Update an entity"""
-        entity = self.get_by_id(entity_id)
-        if not entity:
-            return None
+        """
+        Update an entity with a single UPDATE ... RETURNING
+        
+        The returned row is loaded into the entity (refreshing it if it is
+        already in the session), so no SELECT runs before or after. Keys that
+        are not columns of the model are ignored.
         
-        for key, value in kwargs.items():
-            if hasattr(entity, key):
-                setattr(entity, key, value)
+        Returns:
+            The updated entity, or None if no row has that ID
+        """
+        columns = self.model.__mapper__.column_attrs.keys()
+        values = {key: value for key, value in kwargs.items() if key in columns}
+        if not values:
+            return self.get_by_id(entity_id)
         
-        self.db.commit()
-        self.db.refresh(entity)
-        return entity
+        stmt = (
+            update(self.model)
+            .where(self.model.id == entity_id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return self.db.execute(stmt).scalars().first()
     
     def delete(self, entity_id: int) -> bool:
         """Delete an entity"""
@@ -62,5 +87,5 @@ class BaseRepository(Generic[T]):
             return False
         
         self.db.delete(entity)
-        self.db.commit()
+        self.db.flush()
         return True
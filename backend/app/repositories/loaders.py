@@ -0,0 +1,25 @@
+"""
+Loader options for each response shape
+
+Every schema that embeds relationships has a matching tuple of loader
+options here. Repositories apply them to the queries that feed those
+schemas, so a list costs a fixed number of queries regardless of its size.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.models import Project, Task, User
+
+# TaskReadWithAssignee: creator and assignee are many-to-one, so joining them
+# does not multiply rows and keeps LIMIT/OFFSET correct
+TASK_WITH_ASSIGNEE = (
+    joinedload(Task.creator).load_only(User.id, User.username, User.email),
+    joinedload(Task.assigned_to_user).load_only(User.id, User.username, User.email),
+)
+
+# ProjectReadWithDetails: collections are loaded with one extra SELECT each
+PROJECT_WITH_DETAILS = (
+    selectinload(Project.members).load_only(
+        User.id, User.username, User.email, User.first_name, User.last_name
+    ),
+    selectinload(Project.tasks).load_only(Task.id, Task.title),
+)
@@ -0,0 +1,182 @@
+"""
+Keyset (cursor) pagination helpers shared by the repositories
+
+A cursor is an opaque, URL-safe token that encodes the sort key of the last
+row of a page, together with the sort order it was issued for. The next page
+is fetched with a WHERE clause on that key instead of OFFSET, so deep pages
+cost the same as the first one and rows inserted while paging are neither
+skipped nor duplicated.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Generic, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import and_, false, or_
+from sqlalchemy.orm import Query
+
+from app.core.exceptions import InvalidInputError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One component of a keyset sort order
+
+    Attributes:
+        column: Column (or expression) used in ORDER BY / WHERE
+        attr: Attribute read from each row to build the cursor
+        descending: Sort direction
+        nullable: Whether the column may hold NULLs (sorted last)
+    """
+    column: Any
+    attr: str
+    descending: bool = False
+    nullable: bool = False
+
+    def order_clause(self):
+        """ORDER BY clause for this key (NULLs always last)"""
+        clause = self.column.desc() if self.descending else self.column.asc()
+        return clause.nulls_last() if self.nullable else clause
+
+    def after(self, value: Any):
+        """Predicate for rows strictly after ``value`` on this key"""
+        if value is None:
+            # NULLs sort last, so nothing comes after a NULL on this key
+            return false()
+        condition = self.column < value if self.descending else self.column > value
+        if self.nullable:
+            condition = or_(condition, self.column.is_(None))
+        return condition
+
+    def equals(self, value: Any):
+        """Predicate for rows tied with ``value`` on this key"""
+        return self.column.is_(None) if value is None else self.column == value
+
+
+class Page(NamedTuple, Generic[T]):
+    """A page of results plus the cursor to request the next one"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def sort_signature(keys: Sequence[SortKey]) -> str:
+    """Key names and directions of a sort order, e.g. ``-priority_rank,id``"""
+    return ",".join(("-" if key.descending else "") + key.attr for key in keys)
+
+
+def encode_cursor(values: Sequence[Any], signature: str) -> str:
+    """
+    Encode a sort key as an opaque cursor token
+
+    Args:
+        values: Sort key values of the last row of a page
+        signature: sort_signature of the order the page was fetched in
+
+    Returns:
+        URL-safe cursor token
+    """
+    raw = json.dumps(
+        {"s": signature, "v": [_encode_value(v) for v in values]}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, signature: str, size: int) -> List[Any]:
+    """
+    Decode a cursor token produced by encode_cursor
+
+    Args:
+        cursor: Cursor token
+        signature: sort_signature of the order being requested
+        size: Expected number of sort key values
+
+    Returns:
+        Sort key values
+
+    Raises:
+        InvalidInputError: If the cursor is malformed or for another sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = data["v"]
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("unexpected cursor shape")
+        decoded = [_decode_value(v) for v in values]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidInputError("Cursor de paginación inválido")
+    if data.get("s") != signature:
+        raise InvalidInputError("El cursor de paginación corresponde a otro orden (sort)")
+    return decoded
+
+
+def keyset_predicate(keys: Sequence[SortKey], values: Sequence[Any]):
+    """
+    Build the WHERE clause selecting rows after ``values`` in ``keys`` order
+
+    Expands (k1, k2, ...) > (v1, v2, ...) into
+    k1 > v1 OR (k1 = v1 AND k2 > v2) OR ..., honouring each key's direction
+    and NULL placement.
+    """
+    branches = []
+    for i, key in enumerate(keys):
+        ties = [keys[j].equals(values[j]) for j in range(i)]
+        branches.append(and_(*ties, key.after(values[i])))
+    return or_(*branches)
+
+
+def paginate(query: Query, keys: Sequence[SortKey], limit: int,
+             cursor: Optional[str] = None, skip: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of ``query`` ordered by ``keys``
+
+    Args:
+        query: Filtered query (without ORDER BY / LIMIT)
+        keys: Sort order; must end with a unique key (usually the id)
+        limit: Page size
+        cursor: Cursor from a previous page (takes precedence over skip)
+        skip: Deprecated offset fallback, used only without cursor
+
+    Returns:
+        Tuple (rows, next cursor or None when there are no more rows)
+    """
+    signature = sort_signature(keys)
+    if cursor:
+        query = query.filter(keyset_predicate(keys, decode_cursor(cursor, signature, len(keys))))
+
+    query = query.order_by(*[key.order_clause() for key in keys])
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, key.attr) for key in keys], signature)
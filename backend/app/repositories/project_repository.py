@@ -1,11 +1,19 @@
 """
 Project repository for project data operations
 """
+from sqlalchemy import Select, delete, exists, or_, select, union
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Set, Tuple, Union
 
 from app.models.models import Project, User
+from app.models.project import project_members
+from app.repositories.acl_cache import PermissionCache
 from app.repositories.base import BaseRepository
+from app.repositories.loaders import PROJECT_WITH_DETAILS
+from app.repositories.pagination import Page, SortKey, paginate
+
+# Projects are paged by id
+PROJECT_ORDER = [SortKey(Project.id, "id")]
 
 
 class ProjectRepository(BaseRepository):
@@ -13,10 +21,19 @@ class ProjectRepository(BaseRepository):
     
     def __init__(self, db: Session):
         super().__init__(db, Project)
+        self.permissions = PermissionCache.for_session(db)
+    
+    def get_with_details(self, project_id: int) -> Optional[Project]:
+        """Get a project with members and tasks eagerly loaded"""
+        return self.db.query(Project).options(*PROJECT_WITH_DETAILS).filter(
+            Project.id == project_id
+        ).first()
     
-    def get_all_projects(self, skip: int = 0, limit: int = 100) -> List[Project]:
-        """Get all projects (admin only)"""
-        return self.db.query(Project).offset(skip).limit(limit).all()
+    def get_all_projects(self, skip: int = 0, limit: int = 100,
+                         cursor: Optional[str] = None) -> Page[Project]:
+        """Get a page of all projects (admin only)"""
+        items, next_cursor = paginate(self.db.query(Project), PROJECT_ORDER, limit, cursor, skip)
+        return Page(items, next_cursor)
     
     def get_by_owner(self, owner_id: int, skip: int = 0, limit: int = 100) -> List[Project]:
         """Get projects owned by a user"""
@@ -24,15 +41,38 @@ class ProjectRepository(BaseRepository):
             Project.owner_id == owner_id
         ).offset(skip).limit(limit).all()
     
-    def get_user_projects(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Project]:
-        """Get projects where user is owner or member"""
-        from sqlalchemy import or_
-        return self.db.query(Project).filter(
+    def get_user_projects(self, user_id: int, skip: int = 0, limit: int = 100,
+                          cursor: Optional[str] = None) -> Page[Project]:
+        """Get a page of projects where user is owner or member"""
+        query = self.db.query(Project).filter(
             or_(
                 Project.owner_id == user_id,
                 Project.members.any(User.id == user_id)
             )
-        ).offset(skip).limit(limit).all()
+        )
+        items, next_cursor = paginate(query, PROJECT_ORDER, limit, cursor, skip)
+        return Page(items, next_cursor)
+    
+    @staticmethod
+    def accessible_project_ids(user_id: int) -> Select:
+        """
+        SELECT of the ids of projects the user owns or is a member of
+        
+        Meant to be embedded as ``project_id IN (...)`` so access checks run
+        inside the caller's query instead of once per result.
+        """
+        return union(
+            select(Project.id).where(Project.owner_id == user_id),
+            select(project_members.c.project_id).where(project_members.c.user_id == user_id),
+        )
+    
+    @staticmethod
+    def member_user_ids(project_id: int) -> Select:
+        """SELECT of the ids of the project's owner and members (for ``user_id IN (...)``)"""
+        return union(
+            select(Project.owner_id).where(Project.id == project_id),
+            select(project_members.c.user_id).where(project_members.c.project_id == project_id),
+        )
     
     def get_by_member(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Project]:
         """Get projects where user is a member"""
@@ -42,52 +82,120 @@ class ProjectRepository(BaseRepository):
     
     def add_member(self, project_id: int, user_id: int) -> bool:
         """Add user as member to project"""
-        project = self.get_by_id(project_id)
-        if not project:
+        if not self.get_by_id(project_id):
             return False
         
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+        if not self.db.query(User.id).filter(User.id == user_id).first():
             return False
         
-        if user not in project.members:
-            project.members.append(user)
-            self.db.commit()
+        already_member = self.db.scalar(select(exists().where(
+            project_members.c.project_id == project_id,
+            project_members.c.user_id == user_id,
+        )))
+        if not already_member:
+            self.db.execute(project_members.insert().values(project_id=project_id, user_id=user_id))
+            self.permissions.invalidate_project(project_id)
         
         return True
     
     def remove_member(self, project_id: int, user_id: int) -> bool:
         """Remove user as member from project"""
-        project = self.get_by_id(project_id)
-        if not project:
+        if not self.get_by_id(project_id):
             return False
         
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+        if not self.db.query(User.id).filter(User.id == user_id).first():
             return False
         
-        if user in project.members:
-            project.members.remove(user)
-            self.db.commit()
+        result = self.db.execute(project_members.delete().where(
+            project_members.c.project_id == project_id,
+            project_members.c.user_id == user_id,
+        ))
+        if result.rowcount:
+            self.permissions.invalidate_project(project_id)
         
         return True
     
+    def delete(self, entity_id: int) -> bool:
+        """
+        Delete a project with a single DELETE statement and forget cached permissions on it
+        
+        Tasks and memberships are removed by the ON DELETE CASCADE foreign keys,
+        so nothing is loaded into the session.
+        """
+        result = self.db.execute(delete(Project).where(Project.id == entity_id))
+        self.permissions.invalidate_project(entity_id)
+        return bool(result.rowcount)
+    
     def is_member(self, project_id: int, user_id: int) -> bool:
-        """Check if user is a member of the project (includes owner)"""
-        project = self.get_by_id(project_id)
-        if not project:
-            return False
+        """
+        Check if user is a member of the project (includes owner)
         
-        # Owner is automatically a member
-        if project.owner_id == user_id:
-            return True
+        Resolved with a single EXISTS query and memoized for the request.
+        """
+        cached = self.permissions.get("member", project_id, user_id)
+        if cached is not None:
+            return cached
         
-        return any(member.id == user_id for member in project.members)
+        # Owner is automatically a member
+        is_owner = exists().where(Project.id == project_id, Project.owner_id == user_id)
+        is_listed = exists().where(
+            project_members.c.project_id == project_id,
+            project_members.c.user_id == user_id,
+        )
+        allowed = bool(self.db.scalar(select(or_(is_owner, is_listed))))
+        return self.permissions.set("member", project_id, user_id, allowed)
     
     def is_owner(self, project_id: int, user_id: int) -> bool:
-        """Check if user is the owner of the project"""
-        project = self.get_by_id(project_id)
-        if not project:
-            return False
+        """Check if user is the owner of the project (single EXISTS query, memoized)"""
+        cached = self.permissions.get("owner", project_id, user_id)
+        if cached is not None:
+            return cached
+        
+        allowed = bool(self.db.scalar(
+            select(exists().where(Project.id == project_id, Project.owner_id == user_id))
+        ))
+        return self.permissions.set("owner", project_id, user_id, allowed)
+    
+    def get_membership_map(self, project_ids: Union[Iterable[int], Select],
+                           user_id: int) -> Dict[int, bool]:
+        """
+        Map each existing project to whether the user is owner or member
+        
+        One query for the whole set; projects missing from the result do not exist.
+        ``project_ids`` may also be a SELECT of project ids, which is embedded as a
+        subquery. The answers also warm the request permission cache.
+        """
+        if not isinstance(project_ids, Select):
+            project_ids = set(project_ids)
+        is_listed = exists().where(
+            project_members.c.project_id == Project.id,
+            project_members.c.user_id == user_id,
+        )
+        rows = self.db.execute(
+            select(Project.id, or_(Project.owner_id == user_id, is_listed))
+            .where(Project.id.in_(project_ids))
+        ).all()
+        return {
+            project_id: self.permissions.set("member", project_id, user_id, bool(allowed))
+            for project_id, allowed in rows
+        }
+    
+    def get_member_pairs(self, project_ids: Iterable[int],
+                         user_ids: Iterable[int]) -> Set[Tuple[int, int]]:
+        """
+        Get the (project_id, user_id) pairs, among the given ids, where the user
+        is owner or member of the project (one query)
+        """
+        project_ids, user_ids = set(project_ids), set(user_ids)
+        if not project_ids or not user_ids:
+            return set()
         
-        return project.owner_id == user_id
+        listed = select(project_members.c.project_id, project_members.c.user_id).where(
+            project_members.c.project_id.in_(project_ids),
+            project_members.c.user_id.in_(user_ids),
+        )
+        owners = select(Project.id, Project.owner_id).where(
+            Project.id.in_(project_ids),
+            Project.owner_id.in_(user_ids),
+        )
+        return {(project_id, user_id) for project_id, user_id in self.db.execute(union(listed, owners))}
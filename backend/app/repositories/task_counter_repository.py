@@ -0,0 +1,114 @@
+"""
+Task counter repository for the denormalized per-project task counts
+"""
+from collections import Counter
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.enums import TaskPriority, TaskStatus
+from app.models.models import ProjectTaskCounter, Task
+
+# (project_id, status, priority)
+CounterKey = Tuple[int, TaskStatus, TaskPriority]
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def counter_key(project_id: int, status, priority) -> CounterKey:
+    """Build a counter key, normalizing plain strings to the task enums"""
+    return project_id, TaskStatus(status), TaskPriority(priority)
+
+
+class TaskCounterRepository:
+    """
+    Repository for project_task_counters
+    
+    Writes never commit: they join the transaction of the task write that
+    caused them, so counters and tasks change atomically.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def apply(self, deltas: Mapping[CounterKey, int]) -> None:
+        """Add the given deltas to the counters with a single upsert"""
+        rows = [
+            {"project_id": project_id, "status": status, "priority": priority, "count": delta}
+            for (project_id, status, priority), delta in deltas.items()
+            if delta
+        ]
+        if not rows:
+            return
+        
+        table = ProjectTaskCounter.__table__
+        stmt = UPSERT_INSERTS[self.db.get_bind().dialect.name](table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.project_id, table.c.status, table.c.priority],
+            set_={"count": table.c.count + stmt.excluded.count},
+        )
+        self.db.execute(stmt, rows)
+    
+    def record(self, removed: Iterable[tuple] = (), added: Iterable[tuple] = ()) -> None:
+        """
+        Apply the counter changes for tasks leaving and entering each bucket
+        
+        Args:
+            removed: (project_id, status, priority) of tasks deleted or moved out
+            added: (project_id, status, priority) of tasks created or moved in
+        """
+        deltas: Counter = Counter()
+        for row in removed:
+            deltas[counter_key(*row)] -= 1
+        for row in added:
+            deltas[counter_key(*row)] += 1
+        self.apply(deltas)
+    
+    def get_progress(self, project_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        """
+        Get (total, completed) task counts per project from the counters
+        
+        Reads at most one row per status and priority for each project,
+        independently of how many tasks the project has.
+        """
+        total = func.sum(ProjectTaskCounter.count)
+        rows = self.db.execute(
+            select(
+                ProjectTaskCounter.project_id,
+                total,
+                total.filter(ProjectTaskCounter.status == TaskStatus.COMPLETED),
+            )
+            .where(ProjectTaskCounter.project_id.in_(set(project_ids)))
+            .group_by(ProjectTaskCounter.project_id)
+        ).all()
+        return {project_id: (total or 0, completed or 0) for project_id, total, completed in rows}
+    
+    def rebuild(self, project_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Recompute counters from the tasks table (all projects, or only the given ones)
+        
+        Does not commit; callers run it in one transaction so readers never see
+        the counters half rebuilt.
+        """
+        table = ProjectTaskCounter.__table__
+        counts = select(
+            Task.project_id, Task.status, Task.priority, func.count()
+        ).group_by(Task.project_id, Task.status, Task.priority)
+        clear = delete(table)
+        if project_ids is not None:
+            project_ids = set(project_ids)
+            counts = counts.where(Task.project_id.in_(project_ids))
+            clear = clear.where(table.c.project_id.in_(project_ids))
+        
+        self.db.execute(clear)
+        self.db.execute(
+            insert(table).from_select(
+                ["project_id", "status", "priority", "count"], counts
+            )
+        )
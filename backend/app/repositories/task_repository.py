@@ -3,11 +3,133 @@ Repositorio para operaciones de Tarea
 Implementa métodos específicos de tarea además de CRUD base
 """
 
-from sqlalchemy.orm import Session
-from app.models.models import Task
+from sqlalchemy import Row, Select, delete, func, insert, select, update
+from sqlalchemy.orm import Session, Query
+from app.models.models import Task, User
 from app.repositories.base import BaseRepository
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.repositories.loaders import TASK_WITH_ASSIGNEE
+from app.repositories.pagination import Page, SortKey, paginate
 from app.core.enums import TaskStatus, TaskPriority
-from typing import Optional, List
+from app.core.exceptions import InvalidInputError
+from datetime import date
+from typing import Any, Dict, Optional, List, Sequence
+
+
+# Campos aceptados por sort= -> (columna, atributo para el cursor, admite NULL)
+# priority y status ordenan por su rango entero (PRIORITY_LEVELS / STATUS_ORDER)
+TASK_SORT_FIELDS = {
+    "priority": (Task.priority_rank, "priority_rank", False),
+    "status": (Task.status_rank, "status_rank", False),
+    "due_date": (Task.due_date, "due_date", True),
+    "created_at": (Task.created_at, "created_at", True),
+    "updated_at": (Task.updated_at, "updated_at", True),
+    "title": (Task.title, "title", False),
+    "id": (Task.id, "id", False),
+}
+
+
+def parse_task_sort(sort: Optional[str]) -> List[SortKey]:
+    """
+    Convertir un parámetro sort (p. ej. "-priority,due_date") en claves de orden
+    
+    Un "-" delante invierte el sentido. Siempre se termina por id para que el
+    orden sea total y la paginación por cursor sea estable.
+    
+    Raises:
+        InvalidInputError: Si algún campo no es ordenable o está repetido
+    """
+    keys: List[SortKey] = []
+    seen = set()
+    for token in (sort or "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        descending = token.startswith("-")
+        name = token.lstrip("-+")
+        if name not in TASK_SORT_FIELDS or name in seen:
+            valid = ", ".join(TASK_SORT_FIELDS)
+            raise InvalidInputError(f"Orden inválido: '{token}'. Campos válidos: {valid}")
+        seen.add(name)
+        column, attr, nullable = TASK_SORT_FIELDS[name]
+        keys.append(SortKey(column, attr, descending, nullable))
+    if "id" not in seen:
+        keys.append(SortKey(Task.id, "id"))
+    return keys
+
+
+class TaskQueryBuilder:
+    """
+    Constructor componible de consultas de tareas
+    Cada filtro se traduce a una cláusula WHERE; el orden y la paginación
+    se aplican después de filtrar para que las páginas salgan completas
+    """
+
+    def __init__(self, db: Session, options: Sequence = ()):
+        """
+        Inicializar constructor sobre la tabla de tareas
+        
+        Args:
+            db: Sesión de SQLAlchemy
+            options: Opciones de carga de la forma de respuesta (ver loaders.py)
+        """
+        self._query: Query = db.query(Task).options(*options)
+        self._order: List[SortKey] = [SortKey(Task.id, "id")]
+
+    def in_project(self, project_id: Optional[int]) -> "TaskQueryBuilder":
+        """Filtrar por proyecto (ignorado si es None)"""
+        if project_id is not None:
+            self._query = self._query.filter(Task.project_id == project_id)
+        return self
+
+    def assigned_to(self, user_id: Optional[int]) -> "TaskQueryBuilder":
+        """Filtrar por usuario asignado (ignorado si es None)"""
+        if user_id is not None:
+            self._query = self._query.filter(Task.assigned_to_id == user_id)
+        return self
+
+    def created_by(self, user_id: Optional[int]) -> "TaskQueryBuilder":
+        """Filtrar por creador (ignorado si es None)"""
+        if user_id is not None:
+            self._query = self._query.filter(Task.creator_id == user_id)
+        return self
+
+    def with_status(self, status: Optional[TaskStatus]) -> "TaskQueryBuilder":
+        """Filtrar por estado (ignorado si es None)"""
+        if status is not None:
+            self._query = self._query.filter(Task.status == status)
+        return self
+
+    def with_priority(self, priority: Optional[TaskPriority]) -> "TaskQueryBuilder":
+        """Filtrar por prioridad (ignorado si es None)"""
+        if priority is not None:
+            self._query = self._query.filter(Task.priority == priority)
+        return self
+
+    def sorted_by(self, keys: Optional[List[SortKey]]) -> "TaskQueryBuilder":
+        """Ordenar por las claves dadas (ver parse_task_sort); por defecto, por id"""
+        if keys:
+            self._order = keys
+        return self
+
+    def count(self) -> int:
+        """Contar las tareas que cumplen los filtros (sin paginar)"""
+        return self._query.enable_eagerloads(False).order_by(None).count()
+
+    def page(self, limit: int = 50, cursor: Optional[str] = None, skip: int = 0) -> Page[Task]:
+        """
+        Obtener una página de resultados ya filtrados
+        
+        Args:
+            limit: Límite de registros
+            cursor: Cursor de la página anterior (paginación por clave)
+            skip: Registros a saltar (obsoleto, solo si no hay cursor)
+            
+        Returns:
+            Página con las tareas, el cursor siguiente y el total filtrado
+        """
+        items, next_cursor = paginate(self._query, self._order, limit, cursor, skip)
+        return Page(items, next_cursor, self.count())
 
 
 class TaskRepository(BaseRepository[Task]):
@@ -19,6 +141,305 @@ class TaskRepository(BaseRepository[Task]):
     def __init__(self, db: Session):
         """Inicializar repositorio de tarea"""
         super().__init__(db, Task)
+        self.counters = TaskCounterRepository(db)
+
+    @staticmethod
+    def _bucket(task: Task) -> tuple:
+        """Clave (proyecto, estado, prioridad) de la tarea en project_task_counters"""
+        return task.project_id, task.status, task.priority
+
+    def create_from_obj(self, obj: Task) -> Task:
+        """Crear una tarea y sumarla a los contadores del proyecto en la misma transacción"""
+        self.db.add(obj)
+        self.db.flush()
+        self.counters.record(added=[self._bucket(obj)])
+        return obj
+
+    def update(self, entity_id: int, **kwargs) -> Optional[Task]:
+        """
+        Actualizar una tarea con un UPDATE ... RETURNING y mover su contador
+        
+        Si cambian estado o prioridad, antes se lee y bloquea el bucket actual
+        (SELECT ... FOR UPDATE) para que dos cambios concurrentes no descuadren
+        los contadores; el resto de cambios es una sola sentencia.
+        """
+        before = None
+        if "status" in kwargs or "priority" in kwargs:
+            before = self.db.execute(
+                select(Task.project_id, Task.status, Task.priority)
+                .where(Task.id == entity_id)
+                .with_for_update()
+            ).first()
+            if before is None:
+                return None
+
+        task = super().update(entity_id, **kwargs)
+        if task is not None and before is not None:
+            after = self._bucket(task)
+            if tuple(before) != after:
+                self.counters.record(removed=[tuple(before)], added=[after])
+        return task
+
+    def delete(self, entity_id: int) -> bool:
+        """Eliminar una tarea con un solo DELETE ... RETURNING y restarla de los contadores"""
+        removed = self.db.execute(
+            delete(Task)
+            .where(Task.id == entity_id)
+            .returning(Task.project_id, Task.status, Task.priority),
+            execution_options={"synchronize_session": False},
+        ).all()
+        self.counters.record(removed=removed)
+        return bool(removed)
+
+    def query(self, options: Sequence = ()) -> TaskQueryBuilder:
+        """Crear un constructor de consultas de tareas con las opciones de carga dadas"""
+        return TaskQueryBuilder(self.db, options)
+
+    def get_with_assignee(self, task_id: int) -> Optional[Task]:
+        """
+        Obtener una tarea con creador y asignado ya cargados
+        
+        Args:
+            task_id: ID de la tarea
+            
+        Returns:
+            Tarea o None
+        """
+        return self.db.query(Task).options(*TASK_WITH_ASSIGNEE).filter(Task.id == task_id).first()
+
+    def find_tasks(self, project_id: Optional[int] = None,
+                   assigned_to_id: Optional[int] = None,
+                   creator_id: Optional[int] = None,
+                   status: Optional[TaskStatus] = None,
+                   priority: Optional[TaskPriority] = None,
+                   skip: int = 0, limit: int = 50,
+                   cursor: Optional[str] = None,
+                   options: Sequence = (),
+                   sort: Optional[str] = None) -> Page[Task]:
+        """
+        Buscar tareas aplicando todos los filtros en SQL
+        
+        Args:
+            project_id: Filtrar por proyecto (opcional)
+            assigned_to_id: Filtrar por usuario asignado (opcional)
+            creator_id: Filtrar por creador (opcional)
+            status: Filtrar por estado (opcional)
+            priority: Filtrar por prioridad (opcional)
+            skip: Registros a saltar (obsoleto, solo si no hay cursor)
+            limit: Límite de registros
+            cursor: Cursor de la página anterior (opcional)
+            options: Opciones de carga de la forma de respuesta (opcional)
+            sort: Orden, p. ej. "-priority,due_date" (opcional, por defecto id)
+            
+        Returns:
+            Página de tareas con cursor siguiente y total de tareas que cumplen los filtros
+            
+        Raises:
+            InvalidInputError: Si el orden o el cursor no son válidos
+        """
+        builder = (
+            self.query(options)
+            .in_project(project_id)
+            .assigned_to(assigned_to_id)
+            .created_by(creator_id)
+            .with_status(status)
+            .with_priority(priority)
+            .sorted_by(parse_task_sort(sort))
+        )
+        return builder.page(limit, cursor, skip)
+
+    def bulk_insert(self, rows: List[Dict[str, Any]], ordered: bool = True) -> List[int]:
+        """
+        Insertar muchas tareas con un INSERT multi-fila ... RETURNING
+        
+        SQLAlchemy agrupa las filas en sentencias de varios VALUES, por lo que
+        miles de tareas cuestan unos pocos viajes a la base de datos. Pedir los
+        IDs en orden obliga en algunos motores (SQLite) a insertar fila a fila;
+        quien no necesita casar IDs con filas debe pasar ``ordered=False``.
+        
+        Args:
+            rows: Diccionarios con las columnas de cada tarea
+            ordered: Devolver los IDs en el orden de ``rows``
+            
+        Returns:
+            IDs generados (en el mismo orden que ``rows`` si ``ordered``)
+        """
+        if not rows:
+            return []
+        stmt = insert(Task).returning(
+            Task.id, Task.project_id, Task.status, Task.priority,
+            sort_by_parameter_order=ordered,
+        )
+        created = self.db.execute(stmt, rows).all()
+        self.counters.record(added=[row[1:] for row in created])
+        return [row.id for row in created]
+
+    @staticmethod
+    def bulk_criteria(task_ids: Optional[Sequence[int]] = None,
+                      project_id: Optional[int] = None,
+                      status: Optional[TaskStatus] = None,
+                      priority: Optional[TaskPriority] = None,
+                      assigned_to_id: Optional[int] = None) -> List[Any]:
+        """
+        Construir las cláusulas WHERE que seleccionan las tareas de una operación masiva
+        
+        Args:
+            task_ids: IDs explícitos de tareas (opcional)
+            project_id: Filtrar por proyecto (opcional)
+            status: Filtrar por estado (opcional)
+            priority: Filtrar por prioridad (opcional)
+            assigned_to_id: Filtrar por usuario asignado (opcional)
+            
+        Returns:
+            Lista de condiciones para ``where(*criteria)``
+        """
+        criteria = []
+        if task_ids is not None:
+            criteria.append(Task.id.in_(set(task_ids)))
+        if project_id is not None:
+            criteria.append(Task.project_id == project_id)
+        if status is not None:
+            criteria.append(Task.status == status)
+        if priority is not None:
+            criteria.append(Task.priority == priority)
+        if assigned_to_id is not None:
+            criteria.append(Task.assigned_to_id == assigned_to_id)
+        return criteria
+
+    @staticmethod
+    def project_ids_where(criteria: Sequence[Any]) -> Select:
+        """SELECT de los proyectos que contienen tareas que cumplen ``criteria`` (para subconsultas)"""
+        return select(Task.project_id).where(*criteria).distinct()
+
+    def bulk_update(self, criteria: Sequence[Any], values: Dict[str, Any]) -> List[int]:
+        """
+        Actualizar muchas tareas con un único UPDATE ... WHERE ... RETURNING
+        
+        Las tareas no se cargan en la sesión; ``updated_at`` se actualiza por el
+        ``onupdate`` de la columna. Si cambian estado o prioridad, las filas se
+        bloquean antes para mover sus contadores. Hace un solo COMMIT.
+        
+        Args:
+            criteria: Cláusulas WHERE (ver ``bulk_criteria``)
+            values: Columnas a modificar
+            
+        Returns:
+            IDs de las tareas actualizadas
+        """
+        moves_buckets = "status" in values or "priority" in values
+        if moves_buckets:
+            before = self.db.execute(
+                select(Task.id, Task.project_id, Task.status, Task.priority)
+                .where(*criteria)
+                .with_for_update()
+            ).all()
+            if not before:
+                return []
+            criteria = [Task.id.in_([row.id for row in before])]
+
+        stmt = (
+            update(Task)
+            .where(*criteria)
+            .values(**values)
+            .returning(Task.id, Task.project_id, Task.status, Task.priority)
+            .execution_options(synchronize_session=False)
+        )
+        after = self.db.execute(stmt).all()
+        if moves_buckets:
+            self.counters.record(
+                removed=[row[1:] for row in before], added=[row[1:] for row in after]
+            )
+        return sorted(row.id for row in after)
+
+    def delete_project_tasks_batch(self, project_id: int, batch_size: int) -> int:
+        """
+        Eliminar hasta ``batch_size`` tareas de un proyecto
+        
+        Quien llama confirma cada lote por separado (ver jobs/project_purge.py),
+        de modo que purgar un proyecto enorme no mantiene bloqueos durante toda
+        la operación.
+        
+        Args:
+            project_id: ID del proyecto
+            batch_size: Máximo de tareas a eliminar en este lote
+            
+        Returns:
+            Número de tareas eliminadas
+        """
+        batch = select(Task.id).where(Task.project_id == project_id).limit(batch_size)
+        removed = self.db.execute(
+            delete(Task)
+            .where(Task.id.in_(batch))
+            .returning(Task.project_id, Task.status, Task.priority),
+            execution_options={"synchronize_session": False},
+        ).all()
+        self.counters.record(removed=removed)
+        return len(removed)
+
+    @staticmethod
+    def export_query(project_id: int) -> Select:
+        """
+        SELECT de todas las tareas de un proyecto para exportarlas
+        
+        Devuelve columnas planas (sin entidades ORM) con el username del
+        asignado ya resuelto, ordenadas por id. Al ser una única sentencia,
+        toda la exportación lee de la misma instantánea.
+        
+        Args:
+            project_id: ID del proyecto
+        """
+        return (
+            select(
+                Task.id, Task.title, Task.description, Task.status, Task.priority,
+                Task.due_date, Task.project_id, Task.creator_id, Task.assigned_to_id,
+                User.username.label("assigned_to_username"),
+                Task.created_at, Task.updated_at,
+            )
+            .outerjoin(User, User.id == Task.assigned_to_id)
+            .where(Task.project_id == project_id)
+            .order_by(Task.id)
+        )
+
+    def get_stats_rows(self, project_ids: Sequence[int], today: date,
+                       week_end: date) -> List[Row]:
+        """
+        Contar tareas por proyecto y asignado en una sola consulta agregada
+        
+        Cada fila es un grupo (project_id, assigned_to_id) con su total y
+        columnas ``status_<estado>``, ``priority_<prioridad>``, ``overdue`` y
+        ``due_this_week`` calculadas con COUNT(*) FILTER (WHERE ...).
+        
+        Args:
+            project_ids: IDs de los proyectos
+            today: Fecha de referencia para vencidas
+            week_end: Fin (exclusivo) de la ventana "vence esta semana"
+            
+        Returns:
+            Filas agregadas por proyecto y asignado
+        """
+        is_open = Task.status != TaskStatus.COMPLETED
+        columns = [
+            Task.project_id,
+            Task.assigned_to_id,
+            func.count().label("total"),
+            *(
+                func.count().filter(Task.status == status).label(f"status_{status.value}")
+                for status in TaskStatus
+            ),
+            *(
+                func.count().filter(Task.priority == priority).label(f"priority_{priority.value}")
+                for priority in TaskPriority
+            ),
+            func.count().filter(is_open, Task.due_date < today).label("overdue"),
+            func.count().filter(
+                is_open, Task.due_date >= today, Task.due_date < week_end
+            ).label("due_this_week"),
+        ]
+        return self.db.execute(
+            select(*columns)
+            .where(Task.project_id.in_(set(project_ids)))
+            .group_by(Task.project_id, Task.assigned_to_id)
+        ).all()
 
     def get_project_tasks(self, project_id: int, skip: int = 0, limit: int = 50) -> List[Task]:
         """
@@ -101,12 +522,7 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             Tarea actualizada o None
         """
-        task = self.get(task_id)
-        if task:
-            task.status = status
-            self.db.commit()
-            self.db.refresh(task)
-        return task
+        return self.update(task_id, status=status)
 
     def count_by_status(self, project_id: int, status: TaskStatus) -> int:
         """
@@ -0,0 +1,127 @@
+"""
+Task search repository: full-text search over task titles and descriptions
+"""
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import Select, column, func, literal, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from app.models.models import Task
+from app.models.task_search import SEARCH_CONFIG, SEARCH_FTS_TABLE, SEARCH_VECTOR_COLUMN
+from app.repositories.project_repository import ProjectRepository
+
+# Markers around matched terms in snippets
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# FTS5 external-content table (rowid = tasks.id)
+tasks_fts = table(SEARCH_FTS_TABLE, column("rowid"), column("title"), column("description"))
+
+
+class TaskSearchHit(NamedTuple):
+    """A matching task with its relevance and highlighted snippet"""
+    task: Task
+    rank: float
+    snippet: Optional[str]
+
+
+def to_fts5_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word is quoted (so FTS5
+    operators in user input are literal) and matched as a prefix, all required
+    """
+    terms = [word.replace('"', '""') for word in text.split()]
+    return " ".join(f'"{term}"*' for term in terms if term)
+
+
+class TaskSearchRepository:
+    """
+    Repository for task full-text search
+    
+    Uses the tsvector column + GIN index on PostgreSQL and the FTS5 table on
+    SQLite. Access control is part of the search query: non-admin callers only
+    match tasks of projects they own or belong to.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def search(self, text: str, user_id: int, is_admin: bool = False,
+               project_id: Optional[int] = None, limit: int = 20) -> List[TaskSearchHit]:
+        """
+        Search tasks by content, best matches first
+        
+        Args:
+            text: Free-text query
+            user_id: Caller, whose project access limits the results
+            is_admin: Admins search every project
+            project_id: Restrict to one project (optional)
+            limit: Maximum number of hits
+            
+        Returns:
+            Hits ordered by relevance
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = self._postgresql_query(text)
+        elif dialect == "sqlite":
+            stmt = self._sqlite_query(text)
+            if stmt is None:
+                return []
+        else:
+            stmt = self._fallback_query(text)
+        
+        if not is_admin:
+            stmt = stmt.where(Task.project_id.in_(ProjectRepository.accessible_project_ids(user_id)))
+        if project_id is not None:
+            stmt = stmt.where(Task.project_id == project_id)
+        
+        rows = self.db.execute(stmt.limit(limit)).all()
+        return [TaskSearchHit(task, float(rank or 0), snippet) for task, rank, snippet in rows]
+    
+    @staticmethod
+    def _postgresql_query(text: str) -> Select:
+        """Ranked tsvector match with ts_headline snippets (uses the GIN index)"""
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        vector = literal_column(f"tasks.{SEARCH_VECTOR_COLUMN}")
+        query = func.websearch_to_tsquery(config, text)
+        rank = func.ts_rank(vector, query)
+        snippet = func.ts_headline(
+            config,
+            func.coalesce(Task.description, Task.title),
+            query,
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxFragments=2, MaxWords=20, MinWords=5",
+        )
+        return (
+            select(Task, rank.label("rank"), snippet.label("snippet"))
+            .where(vector.op("@@")(query))
+            .order_by(rank.desc(), Task.id)
+        )
+    
+    @staticmethod
+    def _sqlite_query(text: str) -> Optional[Select]:
+        """BM25-ranked FTS5 match with snippet(); None if the text has no terms"""
+        match = to_fts5_query(text)
+        if not match:
+            return None
+        # bm25() is lower for better matches; negate so higher rank = better
+        rank = -func.bm25(literal_column(SEARCH_FTS_TABLE))
+        snippet = func.snippet(
+            literal_column(SEARCH_FTS_TABLE), -1, HIGHLIGHT_START, HIGHLIGHT_END, "…", 12
+        )
+        return (
+            select(Task, rank.label("rank"), snippet.label("snippet"))
+            .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(literal_column(SEARCH_FTS_TABLE).op("MATCH")(match))
+            .order_by(rank.desc(), Task.id)
+        )
+    
+    @staticmethod
+    def _fallback_query(text: str) -> Select:
+        """Unranked substring match for backends without a search index"""
+        pattern = f"%{text}%"
+        return (
+            select(Task, literal(0.0).label("rank"), literal(None).label("snippet"))
+            .where(or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+            .order_by(Task.id)
+        )
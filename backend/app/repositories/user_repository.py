@@ -2,11 +2,12 @@
 User repository for user data operations
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional, List
+from sqlalchemy import Select, case, func, or_, select, true
+from typing import Dict, Iterable, Optional, List, Tuple
 
 from app.models.models import User
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import Page, SortKey, paginate
 
 
 class UserRepository(BaseRepository):
@@ -36,3 +37,78 @@ class UserRepository(BaseRepository):
     def get_by_role(self, role: str, skip: int = 0, limit: int = 100) -> List[User]:
         """Get users by role"""
         return self.db.query(User).filter(User.role == role).offset(skip).limit(limit).all()
+
+    
+    def get_by_roles(self, roles: List[str], limit: int = 100,
+                     cursor: Optional[str] = None, skip: int = 0) -> Page[User]:
+        """Get a page of users having any of the given roles"""
+        query = self.db.query(User).filter(User.role.in_(roles))
+        items, next_cursor = paginate(query, [SortKey(User.id, "id")], limit, cursor, skip)
+        return Page(items, next_cursor)
+
+    
+    def search_by_prefix(self, prefix: str, roles: Optional[List[str]] = None,
+                         user_ids: Optional[Select] = None, fuzzy: bool = False,
+                         limit: int = 10) -> List[User]:
+        """
+        Find active users whose username, email, first or last name starts with a prefix
+        
+        Each column has a lower() expression index, so every branch of the OR is an
+        index range scan. On PostgreSQL ``fuzzy`` also matches usernames by trigram
+        similarity (pg_trgm). Usernames starting with the prefix rank first.
+        
+        Args:
+            prefix: Case-insensitive prefix
+            roles: Only users with these roles (optional)
+            user_ids: SELECT of allowed user ids, e.g. a project's members (optional)
+            fuzzy: Also include similar usernames (PostgreSQL only)
+            limit: Maximum number of users
+        """
+        prefix = prefix.lower()
+        columns = [User.username, User.email, User.first_name, User.last_name]
+        is_postgresql = self.db.get_bind().dialect.name == "postgresql"
+        
+        if is_postgresql:
+            pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            matches = [func.lower(column).like(pattern, escape="\\") for column in columns]
+        else:
+            # Range scan [prefix, next prefix) is equivalent to LIKE 'prefix%' under
+            # binary collation and, unlike LIKE on an expression, uses the index
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            matches = [
+                (func.lower(column) >= prefix) & (func.lower(column) < upper)
+                for column in columns
+            ]
+        
+        username_first = case((matches[0], 0), else_=1)
+        order = [username_first]
+        if fuzzy and is_postgresql:
+            matches.append(func.lower(User.username).op("%")(prefix))
+            order.append(func.similarity(func.lower(User.username), prefix).desc())
+        
+        query = self.db.query(User).filter(User.is_active == True, or_(*matches))
+        if roles is not None:
+            query = query.filter(User.role.in_(roles))
+        if user_ids is not None:
+            query = query.filter(User.id.in_(user_ids))
+        return query.order_by(*order, func.lower(User.username)).limit(limit).all()
+
+    
+    def resolve_usernames(self, usernames: Iterable[str],
+                          member_ids: Optional[Select] = None) -> Dict[str, Tuple[int, bool]]:
+        """
+        Map usernames to (user id, allowed) with one query
+        
+        Args:
+            usernames: Usernames to look up (unknown ones are left out of the result)
+            member_ids: SELECT of allowed user ids, e.g. a project's members;
+                ``allowed`` is True for every user when omitted
+        """
+        usernames = set(usernames)
+        if not usernames:
+            return {}
+        allowed = User.id.in_(member_ids) if member_ids is not None else true()
+        rows = self.db.execute(
+            select(User.username, User.id, allowed).where(User.username.in_(usernames))
+        )
+        return {username: (user_id, bool(is_allowed)) for username, user_id, is_allowed in rows}
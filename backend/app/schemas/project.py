@@ -4,7 +4,7 @@ Schemas de validación para Proyecto usando Pydantic
 
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 
 class UserReadSimple(BaseModel):
@@ -57,9 +57,38 @@ class ProjectRead(ProjectBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectProgress(BaseModel):
+    """Avance de un proyecto según sus tareas completadas"""
+    total: int = 0
+    completed: int = 0
+    percent: float = 0.0
+
+
+class ProjectReadWithProgress(ProjectRead):
+    """Schema de proyecto con su avance (para listados)"""
+    progress: ProjectProgress = ProjectProgress()
+
+
 class ProjectReadWithDetails(ProjectRead):
     """Schema de proyecto con miembros y tareas"""
     members: List[UserReadSimple] = []
     tasks: List[TaskRead] = []
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class AssigneeTaskCount(BaseModel):
+    """Número de tareas de un usuario asignado (None = sin asignar)"""
+    assigned_to_id: Optional[int] = None
+    count: int
+
+
+class ProjectTaskStats(BaseModel):
+    """Estadísticas de tareas de un proyecto"""
+    project_id: int
+    total: int = 0
+    by_status: Dict[str, int] = {}
+    by_priority: Dict[str, int] = {}
+    by_assignee: List[AssigneeTaskCount] = []
+    overdue: int = 0
+    due_this_week: int = 0
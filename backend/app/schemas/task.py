@@ -2,10 +2,13 @@
 Schemas de validación para Tarea usando Pydantic
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import Optional
-from app.core.enums import TaskPriority, TaskStatus
+from typing import Optional, List
+from app.core.enums import TaskPriority, TaskStatus, BulkMode
+
+# Máximo de elementos aceptados por una operación masiva
+BULK_MAX_ITEMS = 5000
 
 
 class UserReadMinimal(BaseModel):
@@ -63,3 +66,87 @@ class TaskReadWithAssignee(TaskRead):
 
     class Config:
         from_attributes = True
+
+
+class TaskSearchResult(TaskRead):
+    """Resultado de búsqueda: tarea con relevancia y fragmento resaltado"""
+    rank: float
+    snippet: Optional[str] = None
+
+
+class TaskBulkCreate(BaseModel):
+    """Schema para crear tareas en lote"""
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    mode: BulkMode = BulkMode.ATOMIC
+
+
+class TaskBulkItemResult(BaseModel):
+    """Resultado de un elemento de una operación masiva"""
+    index: int
+    success: bool
+    task_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class TaskBulkCreateResult(BaseModel):
+    """Resultado de una creación masiva de tareas"""
+    mode: BulkMode
+    created: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
+
+class TaskBulkFilter(BaseModel):
+    """Filtro que selecciona las tareas de una actualización masiva"""
+    project_id: int
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assigned_to_id: Optional[int] = None
+
+
+class TaskBulkUpdate(BaseModel):
+    """Schema para actualizar tareas en lote (por IDs o por filtro)"""
+    task_ids: Optional[List[int]] = Field(None, min_length=1, max_length=BULK_MAX_ITEMS)
+    filter: Optional[TaskBulkFilter] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assigned_to_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_target_and_changes(self):
+        """Exigir exactamente un selector (task_ids o filter) y al menos un cambio"""
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError("Indica task_ids o filter (solo uno de los dos)")
+        if not self.changes():
+            raise ValueError("Indica al menos un cambio: status, priority o assigned_to_id")
+        if "status" in self.model_fields_set and self.status is None:
+            raise ValueError("status no puede ser null")
+        if "priority" in self.model_fields_set and self.priority is None:
+            raise ValueError("priority no puede ser null")
+        return self
+
+    def changes(self) -> dict:
+        """Columnas a modificar; assigned_to_id explícitamente null desasigna"""
+        return self.model_dump(include={"status", "priority", "assigned_to_id"}, exclude_unset=True)
+
+
+class TaskBulkUpdateResult(BaseModel):
+    """Resultado de una actualización masiva de tareas"""
+    updated: int
+    task_ids: List[int]
+    not_found: List[int] = []
+
+
+class TaskImportRowError(BaseModel):
+    """Error de una fila de un fichero de importación"""
+    line: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    """Resultado de una importación de tareas desde fichero"""
+    mode: BulkMode
+    created: int
+    failed: int
+    errors: List[TaskImportRowError]
+    errors_truncated: bool = False
@@ -0,0 +1,65 @@
+"""
+Async access to the synchronous services
+
+Services and repositories are written against a synchronous ``Session``.
+``AsyncService`` runs them on an ``AsyncSession`` through ``run_sync``: the
+code stays the same, but every query is awaited on the async driver, so the
+event loop keeps serving other requests while the database works. Scripts
+can keep using the services directly with ``SessionLocal``.
+"""
+from typing import Any, Callable, Generic, Optional, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+S = TypeVar("S")
+R = TypeVar("R")
+
+
+class AsyncService(Generic[S]):
+    """
+    Awaitable proxy over a synchronous service
+    
+    Every public method of the wrapped service becomes a coroutine:
+    ``await AsyncService(db, TaskService).get_task(task_id=1)``
+    """
+
+    def __init__(self, db: AsyncSession, service_cls: Type[S]):
+        """
+        Inicializar proxy
+        
+        Args:
+            db: Sesión asíncrona de la petición
+            service_cls: Clase del servicio síncrono a envolver
+        """
+        self.db = db
+        self.service_cls = service_cls
+        self._service: Optional[S] = None
+
+    def _bind(self, session: Session) -> S:
+        """Build the wrapped service once, on the session's sync facade"""
+        if self._service is None:
+            self._service = self.service_cls(session)
+        return self._service
+
+    async def run(self, fn: Callable[[S], R]) -> R:
+        """
+        Run a callable against the wrapped service
+        
+        Args:
+            fn: Callable receiving the synchronous service
+            
+        Returns:
+            Whatever the callable returns
+        """
+        return await self.db.run_sync(lambda session: fn(self._bind(session)))
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_") or not callable(getattr(self.service_cls, name, None)):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self.run(lambda service: getattr(service, name)(*args, **kwargs))
+
+        call.__name__ = name
+        return call
@@ -2,12 +2,15 @@
 Authentication service
 """
 from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.models.models import User
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password, verify_and_update_password, create_access_token
 from app.core.exceptions import InvalidCredentialsError, UserAlreadyExistsError
 from app.core.enums import UserRole
+from app.core.principal_cache import Principal
 
 
 class AuthService:
@@ -71,8 +74,7 @@ class AuthService:
         )
         
         self.db.add(new_user)
-        self.db.commit()
-        self.db.refresh(new_user)
+        self.db.flush()
         
         return new_user
     
@@ -80,6 +82,9 @@ class AuthService:
         """
         Authenticate user and return access token
         
+        A valid password whose stored hash is stale (see PASSWORD_SCHEMES) is
+        rehashed with the current settings as part of the login.
+        
         Args:
             username: Username
             password: Plain password
@@ -92,19 +97,32 @@ class AuthService:
         """
         # Find user
         user = self.db.query(User).filter(User.username == username).first()
+        if not user:
+            raise InvalidCredentialsError("Invalid username or password")
         
-        if not user or not verify_password(password, user.hashed_password):
+        valid, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not valid:
             raise InvalidCredentialsError("Invalid username or password")
         
         if not user.is_active:
             raise InvalidCredentialsError("User is not active")
         
+        # The stored hash uses a deprecated scheme or outdated cost: replace it
+        # (updated_at is kept, the password itself did not change)
+        if new_hash:
+            self.db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(hashed_password=new_hash, updated_at=User.updated_at)
+            )
+        
         # Create access token
         access_token = create_access_token(
             data={
                 "sub": str(user.id),
                 "username": user.username,
-                "role": user.role
+                "role": user.role,
+                "ver": user.token_version
             }
         )
         
@@ -138,3 +156,28 @@ class AuthService:
             raise ValueError("User not found")
         
         return user
+    
+    def get_principal(self, user_id: int) -> Optional[Principal]:
+        """
+        Get the id, role and active flag of a user (no full row, no ORM entity)
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Principal snapshot, or None if the user does not exist
+        """
+        row = self.db.query(User.id, User.role, User.is_active).filter(User.id == user_id).first()
+        return Principal(id=row.id, role=row.role, is_active=row.is_active) if row else None
+    
+    def get_token_version(self, user_id: int) -> Optional[int]:
+        """
+        Get the current token version of a user (a single column, no ORM entity)
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Token version, or None if the user does not exist
+        """
+        return self.db.query(User.token_version).filter(User.id == user_id).scalar()
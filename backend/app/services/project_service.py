@@ -5,9 +5,18 @@ Maneja operaciones relacionadas con proyectos
 
 from sqlalchemy.orm import Session
 from app.models.models import Project, User
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectRead, ProjectReadWithDetails
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectUpdate,
+    ProjectRead,
+    ProjectReadWithDetails,
+    ProjectReadWithProgress,
+    ProjectProgress,
+)
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.repositories.pagination import Page
 from app.core.exceptions import (
     ProjectNotFoundError,
     UserNotFoundError,
@@ -32,6 +41,7 @@ class ProjectService:
         """
         self.project_repo = ProjectRepository(db)
         self.user_repo = UserRepository(db)
+        self.counter_repo = TaskCounterRepository(db)
 
     def create_project(self, project_data: ProjectCreate, owner_id: int) -> ProjectRead:
         """
@@ -74,24 +84,29 @@ class ProjectService:
         Raises:
             ProjectNotFoundError: Si el proyecto no existe
         """
-        project = self.project_repo.get(project_id)
+        project = self.project_repo.get_with_details(project_id)
         if not project:
             raise ProjectNotFoundError(f"Proyecto {project_id} no encontrado")
 
         return ProjectReadWithDetails.from_orm(project)
 
-    def get_user_projects(self, user_id: int, user_role: str, skip: int = 0, limit: int = 10) -> List[ProjectRead]:
+    def get_user_projects(self, user_id: int, user_role: str, skip: int = 0, limit: int = 10,
+                          cursor: Optional[str] = None) -> Page[ProjectReadWithProgress]:
         """
-        Obtener proyectos del usuario
+        Obtener proyectos del usuario con su avance
+        
+        El avance se lee de project_task_counters (una consulta para toda la
+        página), sin recorrer las tareas de cada proyecto.
         
         Args:
             user_id: ID del usuario
             user_role: Rol del usuario (admin, read_write, read_only)
-            skip: Registros a saltar
+            skip: Registros a saltar (obsoleto, solo si no hay cursor)
             limit: Límite de registros
+            cursor: Cursor de la página anterior (opcional)
             
         Returns:
-            Lista de proyectos
+            Página de proyectos con avance y el cursor siguiente
         """
         # Verificar que el usuario existe
         user = self.user_repo.get(user_id)
@@ -100,12 +115,23 @@ class ProjectService:
 
         # Admin ve todos los proyectos
         if user_role == "admin":
-            projects = self.project_repo.get_all_projects(skip, limit)
+            page = self.project_repo.get_all_projects(skip, limit, cursor)
         else:
             # Otros roles solo ven los que son propietarios o miembros
-            projects = self.project_repo.get_user_projects(user_id, skip, limit)
+            page = self.project_repo.get_user_projects(user_id, skip, limit, cursor)
         
-        return [ProjectRead.from_orm(project) for project in projects]
+        progress = self.counter_repo.get_progress(project.id for project in page.items)
+        items = []
+        for project in page.items:
+            total, completed = progress.get(project.id, (0, 0))
+            item = ProjectReadWithProgress.model_validate(project)
+            item.progress = ProjectProgress(
+                total=total,
+                completed=completed,
+                percent=round(100 * completed / total, 1) if total else 0.0,
+            )
+            items.append(item)
+        return Page(items, page.next_cursor)
 
     def update_project(self, project_id: int, project_update: ProjectUpdate, 
                       current_user_id: int) -> ProjectRead:
@@ -130,6 +156,8 @@ class ProjectService:
 
         update_data = project_update.dict(exclude_unset=True)
         updated_project = self.project_repo.update(project_id, **update_data)
+        if not updated_project:
+            raise ProjectNotFoundError(f"Proyecto {project_id} no encontrado")
 
         return ProjectRead.from_orm(updated_project)
 
@@ -0,0 +1,79 @@
+"""
+Exportación de tareas en streaming (NDJSON o CSV)
+
+Las filas se leen con un cursor del servidor (``stream`` + ``yield_per``) y
+se serializan por lotes, de modo que la memoria usada no depende del número
+de tareas del proyecto.
+"""
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Iterable, List, Sequence
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import ExportFormat
+
+# Filas pedidas al cursor del servidor en cada viaje
+EXPORT_BATCH_SIZE = int(os.getenv("TASK_EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Valor serializable: enums por su valor y fechas en ISO 8601"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """Un objeto JSON por línea"""
+    return "".join(
+        json.dumps(dict(zip(columns, map(_plain, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _encode_csv(rows: Iterable[Sequence[Any]]) -> str:
+    """Filas CSV (los NULL quedan como celdas vacías)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_export(db: AsyncSession, query: Select,
+                        export_format: ExportFormat) -> AsyncIterator[str]:
+    """
+    Recorrer la consulta con un cursor del servidor y emitir trozos serializados
+    
+    Args:
+        db: Sesión asíncrona (debe seguir abierta mientras dure la respuesta)
+        query: SELECT de columnas planas (ver TaskRepository.export_query)
+        export_format: ndjson o csv
+        
+    Yields:
+        Un trozo de texto por lote de filas
+    """
+    result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    columns: List[str] = list(result.keys())
+    if export_format == ExportFormat.CSV:
+        yield _encode_csv([columns])
+    try:
+        async for rows in result.partitions():
+            if export_format == ExportFormat.CSV:
+                yield _encode_csv(rows)
+            else:
+                yield _encode_ndjson(columns, rows)
+    finally:
+        await result.close()
@@ -0,0 +1,195 @@
+"""
+Importación de tareas desde ficheros CSV o NDJSON
+
+Los ficheros se recorren fila a fila sobre el fichero subido (que Starlette
+guarda en disco a partir de 1 MB), sin cargarlos enteros en memoria. Leer,
+decodificar y validar cada lote es trabajo de CPU, así que se hace en el
+threadpool; el bucle de eventos solo atiende las consultas de cada lote
+(resolver usernames e insertar), que TaskService ejecuta en la sesión.
+"""
+import csv
+import io
+import json
+import os
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.enums import BulkMode, ExportFormat, TaskPriority
+from app.core.exceptions import InvalidInputError
+from app.schemas.task import TaskCreate, TaskImportResult, TaskImportRowError
+
+# Filas validadas e insertadas en cada lote
+IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", "2000"))
+
+# Límites de una importación: tamaño del fichero y número de filas
+IMPORT_MAX_BYTES = int(os.getenv("TASK_IMPORT_MAX_BYTES", str(50 * 1024 * 1024)))
+IMPORT_MAX_ROWS = int(os.getenv("TASK_IMPORT_MAX_ROWS", "100000"))
+
+# Máximo de errores detallados en la respuesta (el resto solo se cuenta)
+IMPORT_MAX_ERRORS = 1000
+
+# (línea del fichero, campos de la fila) o (línea, mensaje de error de formato)
+ImportRow = Tuple[int, Any]
+
+# (línea, tarea validada | mensaje de error, username de assigned_to)
+ParsedRow = Tuple[int, Union[TaskCreate, str], Optional[str]]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[ExportFormat]:
+    """Deducir el formato por extensión o tipo de contenido"""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return ExportFormat.CSV
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return ExportFormat.NDJSON
+    return None
+
+
+def _blank_to_none(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Las celdas CSV vacías equivalen a campos omitidos"""
+    return {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def iter_rows(stream: BinaryIO, file_format: ExportFormat) -> Iterator[ImportRow]:
+    """
+    Recorrer las filas de un fichero binario
+    
+    Las filas mal formadas (JSON inválido o que no es un objeto) se devuelven
+    como una cadena con el error, para informarlas sin abortar la lectura.
+    
+    Args:
+        stream: Fichero abierto en modo binario
+        file_format: csv (con cabecera) o ndjson
+        
+    Yields:
+        (número de línea, dict de campos | mensaje de error)
+        
+    Raises:
+        InvalidInputError: Si el fichero no es texto UTF-8 o el CSV está corrupto
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if file_format == ExportFormat.CSV:
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, _blank_to_none(row)
+        else:
+            for line_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    yield line_number, "JSON inválido"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, "Cada línea debe ser un objeto JSON"
+                    continue
+                yield line_number, row
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise InvalidInputError(f"Fichero ilegible: {e}")
+    finally:
+        # El fichero subido lo cierra Starlette
+        text.detach()
+
+
+def parse_row(project_id: int, row: Any) -> Tuple[Union[TaskCreate, str], Optional[str]]:
+    """
+    Validar una fila contra TaskCreate (el asignado se resuelve después)
+    
+    Returns:
+        (tarea validada | mensaje de error, username de assigned_to)
+    """
+    if isinstance(row, str):
+        return row, None
+    username = row.get("assigned_to")
+    due_date = row.get("due_date")
+    if isinstance(due_date, str) and len(due_date) == 10:
+        due_date += "T00:00:00"  # fecha sin hora, como la exporta la API
+    try:
+        item = TaskCreate(
+            title=row.get("title"),
+            description=row.get("description"),
+            priority=row.get("priority") or TaskPriority.MEDIUM,
+            due_date=due_date,
+            project_id=project_id,
+        )
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+        ), None
+    return item, username if username is None else str(username)
+
+
+def parse_batch(rows: Iterator[ImportRow], project_id: int,
+                size: int = IMPORT_BATCH_SIZE) -> List[ParsedRow]:
+    """Leer y validar el siguiente lote de filas (vacío al final del fichero)"""
+    return [(line, *parse_row(project_id, row)) for line, row in islice(rows, size)]
+
+
+async def import_tasks(db: AsyncSession, project_id: int, stream: BinaryIO,
+                       file_format: ExportFormat, creator_id: int, creator_role: str = None,
+                       mode: BulkMode = BulkMode.ATOMIC) -> TaskImportResult:
+    """
+    Importar tareas a un proyecto desde un fichero, por lotes
+    
+    Cada lote se lee y valida en el threadpool; después TaskService resuelve
+    los usernames de ``assigned_to`` (solo miembros del proyecto) con una
+    consulta y lo inserta con un INSERT multi-fila. Solo se conservan en
+    memoria el lote actual y el informe de errores.
+    
+    Args:
+        db: Sesión asíncrona de la petición
+        project_id: ID del proyecto destino
+        stream: Fichero subido, en modo binario
+        file_format: csv (con cabecera) o ndjson
+        creator_id: ID del usuario que importa
+        creator_role: Rol del usuario (admin, read_write, read_only)
+        mode: ATOMIC (todo o nada) o PARTIAL (se insertan las válidas)
+        
+    Returns:
+        Tareas creadas y errores por línea
+        
+    Raises:
+        ProjectNotFoundError: Si el proyecto no existe
+        PermissionDeniedError: Si no es miembro del proyecto ni admin
+        InvalidInputError: Si el fichero es ilegible o supera IMPORT_MAX_ROWS filas
+    """
+    from app.services.async_service import AsyncService
+    from app.services.task_service import TaskService
+
+    service = AsyncService(db, TaskService)
+    member_ids = await service.get_import_member_ids(project_id, creator_id, creator_role)
+    result = TaskImportResult(mode=mode, created=0, failed=0, errors=[])
+    rows = iter_rows(stream, file_format)
+    total = 0
+
+    while True:
+        batch = await run_in_threadpool(parse_batch, rows, project_id)
+        if not batch:
+            break
+        total += len(batch)
+        if total > IMPORT_MAX_ROWS:
+            raise InvalidInputError(f"El fichero supera el máximo de {IMPORT_MAX_ROWS} filas")
+
+        # En modo atómico basta con seguir validando tras el primer error: nada se confirmará
+        created, errors = await service.import_batch(
+            project_id, creator_id, batch, member_ids,
+            insert=not (mode == BulkMode.ATOMIC and result.failed),
+            all_or_nothing=mode == BulkMode.ATOMIC,
+        )
+        result.created += created
+        for line, error in errors:
+            result.failed += 1
+            if len(result.errors) < IMPORT_MAX_ERRORS:
+                result.errors.append(TaskImportRowError(line=line, error=error))
+            else:
+                result.errors_truncated = True
+
+    if mode == BulkMode.ATOMIC and result.failed:
+        result.created = 0
+    return result
@@ -3,13 +3,29 @@ Servicio de gestión de tareas
 Maneja operaciones relacionadas con tareas
 """
 
+from sqlalchemy import Select
 from sqlalchemy.orm import Session
 from app.models.models import Task, Project, User
-from app.schemas.task import TaskCreate, TaskUpdate, TaskRead, TaskReadWithAssignee
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskRead,
+    TaskReadWithAssignee,
+    TaskBulkCreateResult,
+    TaskBulkItemResult,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskSearchResult,
+)
+from app.schemas.project import ProjectTaskStats, AssigneeTaskCount
 from app.repositories.task_repository import TaskRepository
+from app.repositories.task_search_repository import TaskSearchRepository
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.user_repository import UserRepository
-from app.core.enums import TaskStatus
+from app.repositories.loaders import TASK_WITH_ASSIGNEE
+from app.repositories.pagination import Page
+from app.services.task_import import ParsedRow
+from app.core.enums import TaskStatus, TaskPriority, BulkMode
 from app.core.exceptions import (
     TaskNotFoundError,
     ProjectNotFoundError,
@@ -17,7 +33,8 @@ from app.core.exceptions import (
     PermissionDeniedError,
     InvalidInputError
 )
-from typing import List, Optional
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
 
 
 class TaskService:
@@ -34,6 +51,7 @@ class TaskService:
             db: Sesión de SQLAlchemy
         """
         self.task_repo = TaskRepository(db)
+        self.search_repo = TaskSearchRepository(db)
         self.project_repo = ProjectRepository(db)
         self.user_repo = UserRepository(db)
 
@@ -85,6 +103,294 @@ class TaskService:
         created_task = self.task_repo.create_from_obj(task)
         return TaskRead.from_orm(created_task)
 
+    def create_tasks_bulk(self, items: List[TaskCreate], creator_id: int,
+                          creator_role: str = None,
+                          mode: BulkMode = BulkMode.ATOMIC) -> TaskBulkCreateResult:
+        """
+        Crear muchas tareas en una sola operación
+        
+        La membresía del creador y de los asignados se valida con una consulta
+        por lote (no por tarea) y las filas válidas se insertan con un único
+        INSERT multi-fila y un solo COMMIT.
+        
+        Args:
+            items: Tareas a crear
+            creator_id: ID del usuario creador
+            creator_role: Rol del usuario creador (admin, read_write, read_only)
+            mode: ATOMIC (todo o nada) o PARTIAL (se insertan las válidas)
+            
+        Returns:
+            Resultado por elemento con el ID creado o el error
+        """
+        is_admin = creator_role == "admin"
+        project_ids = {item.project_id for item in items}
+        membership = self.project_repo.get_membership_map(project_ids, creator_id)
+        member_pairs = self.project_repo.get_member_pairs(
+            project_ids, {item.assigned_to_id for item in items if item.assigned_to_id}
+        )
+
+        errors = {}
+        for index, item in enumerate(items):
+            if item.project_id not in membership:
+                errors[index] = f"Proyecto {item.project_id} no encontrado"
+            elif not (is_admin or membership[item.project_id]):
+                errors[index] = "No eres miembro de este proyecto"
+            elif item.assigned_to_id and (item.project_id, item.assigned_to_id) not in member_pairs:
+                errors[index] = "El usuario asignado no es miembro del proyecto"
+
+        if errors and mode == BulkMode.ATOMIC:
+            results = [
+                TaskBulkItemResult(
+                    index=index,
+                    success=False,
+                    error=errors.get(index, "No insertada: el lote contiene errores"),
+                )
+                for index in range(len(items))
+            ]
+            return TaskBulkCreateResult(mode=mode, created=0, failed=len(errors), results=results)
+
+        valid = [index for index in range(len(items)) if index not in errors]
+        task_ids = self.task_repo.bulk_insert([
+            {
+                "title": items[index].title,
+                "description": items[index].description,
+                "project_id": items[index].project_id,
+                "creator_id": creator_id,
+                "assigned_to_id": items[index].assigned_to_id,
+                "priority": items[index].priority,
+                "due_date": items[index].due_date,
+            }
+            for index in valid
+        ])
+        created = dict(zip(valid, task_ids))
+
+        results = [
+            TaskBulkItemResult(index=index, success=True, task_id=created[index])
+            if index in created
+            else TaskBulkItemResult(index=index, success=False, error=errors[index])
+            for index in range(len(items))
+        ]
+        return TaskBulkCreateResult(
+            mode=mode, created=len(created), failed=len(errors), results=results
+        )
+
+    def get_import_member_ids(self, project_id: int, creator_id: int,
+                              creator_role: str = None) -> Select:
+        """
+        Comprobar que el usuario puede importar al proyecto
+        
+        Args:
+            project_id: ID del proyecto destino
+            creator_id: ID del usuario que importa
+            creator_role: Rol del usuario (admin, read_write, read_only)
+            
+        Returns:
+            SELECT (sin ejecutar) de los IDs de los miembros del proyecto
+            (posibles asignados), para usarlo como subconsulta en cada lote
+            
+        Raises:
+            ProjectNotFoundError: Si el proyecto no existe
+            PermissionDeniedError: Si no es miembro del proyecto ni admin
+        """
+        membership = self.project_repo.get_membership_map([project_id], creator_id)
+        if project_id not in membership:
+            raise ProjectNotFoundError(f"Proyecto {project_id} no encontrado")
+        if creator_role != "admin" and not membership[project_id]:
+            raise PermissionDeniedError("No eres miembro de este proyecto")
+        return self.project_repo.member_user_ids(project_id)
+
+    def import_batch(self, project_id: int, creator_id: int, batch: List[ParsedRow],
+                     member_ids: Select, insert: bool = True,
+                     all_or_nothing: bool = False) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Resolver los asignados de un lote ya validado e insertar sus tareas
+        
+        Los usernames de ``assigned_to`` se resuelven con una única consulta
+        (solo miembros del proyecto) y las tareas se insertan con un INSERT
+        multi-fila.
+        
+        Args:
+            project_id: ID del proyecto destino
+            creator_id: ID del usuario que importa
+            batch: Filas de task_import.parse_batch
+            member_ids: SELECT de los IDs de los miembros (get_import_member_ids)
+            insert: False para solo informar errores (importación atómica ya fallida)
+            all_or_nothing: No insertar nada si alguna fila del lote falla
+            
+        Returns:
+            (tareas creadas, errores (línea, mensaje))
+        """
+        assignees = self.user_repo.resolve_usernames(
+            {username for _, item, username in batch
+             if username is not None and not isinstance(item, str)},
+            member_ids,
+        )
+        valid, errors = [], []
+        for line, item, username in batch:
+            if isinstance(item, str):
+                errors.append((line, item))
+                continue
+            if username is not None:
+                assignee = assignees.get(username)
+                if assignee is None:
+                    errors.append((line, f"Usuario '{username}' no encontrado"))
+                    continue
+                if not assignee[1]:
+                    errors.append((line, f"El usuario '{username}' no es miembro del proyecto"))
+                    continue
+                item.assigned_to_id = assignee[0]
+            valid.append(item)
+
+        if not valid or not insert or (all_or_nothing and errors):
+            return 0, errors
+        created = self.task_repo.bulk_insert([
+            {
+                "title": item.title,
+                "description": item.description,
+                "project_id": project_id,
+                "creator_id": creator_id,
+                "assigned_to_id": item.assigned_to_id,
+                "priority": item.priority,
+                "due_date": item.due_date,
+            }
+            for item in valid
+        ], ordered=False)
+        return len(created), errors
+
+    def update_tasks_bulk(self, bulk_data: TaskBulkUpdate, user_id: int,
+                          user_role: str = None) -> TaskBulkUpdateResult:
+        """
+        Aplicar el mismo cambio de estado, prioridad o asignado a muchas tareas
+        
+        Los permisos sobre todos los proyectos afectados se resuelven con una
+        consulta, y las tareas se modifican con un único UPDATE ... RETURNING
+        y un solo COMMIT.
+        
+        Args:
+            bulk_data: Tareas a modificar (IDs o filtro) y cambios
+            user_id: ID del usuario que realiza el cambio
+            user_role: Rol del usuario (admin, read_write, read_only)
+            
+        Returns:
+            IDs actualizados e IDs solicitados que no existen
+            
+        Raises:
+            PermissionDeniedError: Si no es miembro de algún proyecto afectado ni admin
+            InvalidInputError: Si el asignado no es miembro de algún proyecto afectado
+        """
+        selector = bulk_data.filter
+        criteria = self.task_repo.bulk_criteria(
+            task_ids=bulk_data.task_ids,
+            project_id=selector.project_id if selector else None,
+            status=selector.status if selector else None,
+            priority=selector.priority if selector else None,
+            assigned_to_id=selector.assigned_to_id if selector else None,
+        )
+        membership = self.project_repo.get_membership_map(
+            self.task_repo.project_ids_where(criteria), user_id
+        )
+
+        if user_role != "admin" and not all(membership.values()):
+            raise PermissionDeniedError(
+                "No eres miembro de todos los proyectos de las tareas seleccionadas"
+            )
+
+        changes = bulk_data.changes()
+        assignee_id = changes.get("assigned_to_id")
+        if assignee_id:
+            member_pairs = self.project_repo.get_member_pairs(membership, {assignee_id})
+            if len(member_pairs) != len(membership):
+                raise InvalidInputError(
+                    "El usuario asignado no es miembro de todos los proyectos afectados"
+                )
+
+        task_ids = self.task_repo.bulk_update(criteria, changes) if membership else []
+        not_found = sorted(set(bulk_data.task_ids or ()) - set(task_ids))
+        return TaskBulkUpdateResult(updated=len(task_ids), task_ids=task_ids, not_found=not_found)
+
+    def get_project_stats(self, project_ids: List[int], user_id: int,
+                          user_role: str = None) -> List[ProjectTaskStats]:
+        """
+        Obtener estadísticas de tareas de uno o varios proyectos
+        
+        Una consulta resuelve existencia y permisos de todos los proyectos y otra
+        (agregada con FILTER) calcula todos los contadores.
+        
+        Args:
+            project_ids: IDs de los proyectos
+            user_id: ID del usuario que consulta
+            user_role: Rol del usuario (admin, read_write, read_only)
+            
+        Returns:
+            Estadísticas por proyecto, en el orden solicitado
+            
+        Raises:
+            ProjectNotFoundError: Si algún proyecto no existe
+            PermissionDeniedError: Si no es miembro de algún proyecto ni admin
+        """
+        project_ids = list(dict.fromkeys(project_ids))
+        membership = self.project_repo.get_membership_map(project_ids, user_id)
+        missing = [project_id for project_id in project_ids if project_id not in membership]
+        if missing:
+            raise ProjectNotFoundError(
+                f"Proyecto {', '.join(map(str, missing))} no encontrado"
+            )
+        if user_role != "admin" and not all(membership.values()):
+            raise PermissionDeniedError(
+                "No tienes permisos para acceder a todos los proyectos solicitados"
+            )
+
+        today = date.today()
+        stats = {
+            project_id: ProjectTaskStats(
+                project_id=project_id,
+                by_status={status.value: 0 for status in TaskStatus},
+                by_priority={priority.value: 0 for priority in TaskPriority},
+            )
+            for project_id in project_ids
+        }
+        rows = self.task_repo.get_stats_rows(project_ids, today, today + timedelta(days=7))
+        for row in rows:
+            project_stats = stats[row.project_id]
+            project_stats.total += row.total
+            project_stats.overdue += row.overdue
+            project_stats.due_this_week += row.due_this_week
+            for status in TaskStatus:
+                project_stats.by_status[status.value] += row._mapping[f"status_{status.value}"]
+            for priority in TaskPriority:
+                project_stats.by_priority[priority.value] += row._mapping[f"priority_{priority.value}"]
+            project_stats.by_assignee.append(
+                AssigneeTaskCount(assigned_to_id=row.assigned_to_id, count=row.total)
+            )
+        return [stats[project_id] for project_id in project_ids]
+
+    def get_export_query(self, project_id: int, user_id: int,
+                         user_role: str = None) -> Select:
+        """
+        Comprobar permisos y obtener la consulta de exportación de un proyecto
+        
+        La consulta no se ejecuta aquí: el router la recorre con un cursor
+        del servidor (ver task_export.py) para no cargar todas las tareas.
+        
+        Args:
+            project_id: ID del proyecto
+            user_id: ID del usuario que exporta
+            user_role: Rol del usuario (admin, read_write, read_only)
+            
+        Returns:
+            SELECT de las tareas del proyecto
+            
+        Raises:
+            ProjectNotFoundError: Si el proyecto no existe
+            PermissionDeniedError: Si no es miembro del proyecto ni admin
+        """
+        membership = self.project_repo.get_membership_map([project_id], user_id)
+        if project_id not in membership:
+            raise ProjectNotFoundError(f"Proyecto {project_id} no encontrado")
+        if user_role != "admin" and not membership[project_id]:
+            raise PermissionDeniedError("No tienes permisos para exportar este proyecto")
+        return self.task_repo.export_query(project_id)
+
     def get_task(self, task_id: int) -> TaskReadWithAssignee:
         """
         Obtener detalles de una tarea
@@ -98,99 +404,165 @@ class TaskService:
         Raises:
             TaskNotFoundError: Si la tarea no existe
         """
-        task = self.task_repo.get(task_id)
+        task = self.task_repo.get_with_assignee(task_id)
         if not task:
             raise TaskNotFoundError(f"Tarea {task_id} no encontrada")
 
         return TaskReadWithAssignee.from_orm(task)
 
+    def search_tasks(self, text: str, user_id: int, user_role: str = None,
+                     project_id: Optional[int] = None,
+                     limit: int = 20) -> List[TaskSearchResult]:
+        """
+        Buscar tareas por título y descripción en los proyectos accesibles
+        
+        La restricción de membresía forma parte de la consulta de búsqueda,
+        no se comprueba resultado a resultado.
+        
+        Args:
+            text: Texto a buscar
+            user_id: ID del usuario que busca
+            user_role: Rol del usuario (admin ve todos los proyectos)
+            project_id: Limitar a un proyecto (opcional)
+            limit: Máximo de resultados
+            
+        Returns:
+            Tareas ordenadas por relevancia, con fragmento resaltado
+        """
+        hits = self.search_repo.search(
+            text,
+            user_id=user_id,
+            is_admin=user_role == "admin",
+            project_id=project_id,
+            limit=limit,
+        )
+        return [
+            TaskSearchResult(
+                **TaskRead.from_orm(hit.task).model_dump(),
+                rank=hit.rank,
+                snippet=hit.snippet,
+            )
+            for hit in hits
+        ]
+
     def get_project_tasks(self, project_id: int, skip: int = 0, 
                          limit: int = 50, status_filter: Optional[str] = None,
                          priority_filter: Optional[str] = None,
                          assigned_to_id: Optional[int] = None,
-                         creator_id: Optional[int] = None) -> List[TaskRead]:
+                         creator_id: Optional[int] = None,
+                         cursor: Optional[str] = None,
+                         sort: Optional[str] = None) -> Page[TaskReadWithAssignee]:
         """
         Obtener todas las tareas de un proyecto con filtros opcionales
         
         Args:
             project_id: ID del proyecto
-            skip: Registros a saltar
+            skip: Registros a saltar (obsoleto, solo si no hay cursor)
             limit: Límite de registros
             status_filter: Filtrar por estado (opcional)
             priority_filter: Filtrar por prioridad (opcional)
             assigned_to_id: Filtrar por usuario asignado (opcional)
             creator_id: Filtrar por creador (opcional)
+            cursor: Cursor de la página anterior (opcional)
+            sort: Orden, p. ej. "-priority,due_date" (opcional)
             
         Returns:
-            Lista de tareas
+            Página de tareas con cursor siguiente y total filtrado
             
         Raises:
             ProjectNotFoundError: Si el proyecto no existe
+            InvalidInputError: Si el estado, la prioridad o el orden no son válidos
         """
         project = self.project_repo.get(project_id)
         if not project:
             raise ProjectNotFoundError(f"Proyecto {project_id} no encontrado")
 
-        tasks = self.task_repo.get_project_tasks(project_id, skip, limit)
-        
-        # Filtrar por estado si se especifica
-        if status_filter:
-            tasks = [t for t in tasks if t.status == status_filter]
-        
-        # Filtrar por prioridad si se especifica
-        if priority_filter:
-            tasks = [t for t in tasks if t.priority == priority_filter]
-        
-        # Filtrar por usuario asignado si se especifica
-        if assigned_to_id is not None:
-            tasks = [t for t in tasks if t.assigned_to_id == assigned_to_id]
-        
-        # Filtrar por creador si se especifica
-        if creator_id is not None:
-            tasks = [t for t in tasks if t.creator_id == creator_id]
-        
-        return [TaskRead.from_orm(task) for task in tasks]
+        page = self.task_repo.find_tasks(
+            project_id=project_id,
+            assigned_to_id=assigned_to_id,
+            creator_id=creator_id,
+            status=self._parse_status(status_filter),
+            priority=self._parse_priority(priority_filter),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            options=TASK_WITH_ASSIGNEE,
+            sort=sort,
+        )
+        return Page(
+            [TaskReadWithAssignee.from_orm(task) for task in page.items],
+            page.next_cursor,
+            page.total,
+        )
 
     def get_user_assigned_tasks(self, user_id: int, skip: int = 0, 
                                limit: int = 50, status_filter: Optional[str] = None,
                                priority_filter: Optional[str] = None,
-                               project_id: Optional[int] = None) -> List[TaskRead]:
+                               project_id: Optional[int] = None,
+                               cursor: Optional[str] = None,
+                               sort: Optional[str] = None) -> Page[TaskReadWithAssignee]:
         """
         Obtener tareas asignadas al usuario con filtros opcionales
         
         Args:
             user_id: ID del usuario
-            skip: Registros a saltar
+            skip: Registros a saltar (obsoleto, solo si no hay cursor)
             limit: Límite de registros
             status_filter: Filtrar por estado (opcional)
             priority_filter: Filtrar por prioridad (opcional)
             project_id: Filtrar por proyecto (opcional)
+            cursor: Cursor de la página anterior (opcional)
+            sort: Orden, p. ej. "-priority,due_date" (opcional)
             
         Returns:
-            Lista de tareas asignadas
+            Página de tareas asignadas con cursor siguiente y total filtrado
             
         Raises:
             UserNotFoundError: Si el usuario no existe
+            InvalidInputError: Si el estado, la prioridad o el orden no son válidos
         """
         user = self.user_repo.get(user_id)
         if not user:
             raise UserNotFoundError(f"Usuario {user_id} no encontrado")
 
-        tasks = self.task_repo.get_user_assigned_tasks(user_id, skip, limit)
-        
-        # Filtrar por estado si se especifica
-        if status_filter:
-            tasks = [t for t in tasks if t.status == status_filter]
-        
-        # Filtrar por prioridad si se especifica
-        if priority_filter:
-            tasks = [t for t in tasks if t.priority == priority_filter]
-        
-        # Filtrar por proyecto si se especifica
-        if project_id is not None:
-            tasks = [t for t in tasks if t.project_id == project_id]
-        
-        return [TaskRead.from_orm(task) for task in tasks]
+        page = self.task_repo.find_tasks(
+            project_id=project_id,
+            assigned_to_id=user_id,
+            status=self._parse_status(status_filter),
+            priority=self._parse_priority(priority_filter),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            options=TASK_WITH_ASSIGNEE,
+            sort=sort,
+        )
+        return Page(
+            [TaskReadWithAssignee.from_orm(task) for task in page.items],
+            page.next_cursor,
+            page.total,
+        )
+
+    @staticmethod
+    def _parse_status(value: Optional[str]) -> Optional[TaskStatus]:
+        """Convertir el filtro de estado a TaskStatus"""
+        if not value:
+            return None
+        try:
+            return TaskStatus(value)
+        except ValueError:
+            valid = ", ".join(s.value for s in TaskStatus)
+            raise InvalidInputError(f"Estado inválido. Estados válidos: {valid}")
+
+    @staticmethod
+    def _parse_priority(value: Optional[str]) -> Optional[TaskPriority]:
+        """Convertir el filtro de prioridad a TaskPriority"""
+        if not value:
+            return None
+        try:
+            return TaskPriority(value)
+        except ValueError:
+            valid = ", ".join(p.value for p in TaskPriority)
+            raise InvalidInputError(f"Prioridad inválida. Prioridades válidas: {valid}")
 
     def update_task(self, task_id: int, update_data: dict) -> TaskRead:
         """
@@ -207,17 +579,16 @@ class TaskService:
             TaskNotFoundError: Si la tarea no existe
             UserNotFoundError: Si el usuario asignado no existe
         """
-        task = self.task_repo.get(task_id)
-        if not task:
-            raise TaskNotFoundError(f"Tarea {task_id} no encontrada")
-
         # Verificar que el usuario asignado existe (si se especifica)
         if 'assigned_to_id' in update_data and update_data['assigned_to_id']:
             assigned_user = self.user_repo.get(update_data['assigned_to_id'])
             if not assigned_user:
                 raise UserNotFoundError(f"Usuario {update_data['assigned_to_id']} no encontrado")
 
+        # UPDATE ... RETURNING: si no devuelve fila, la tarea no existe
         updated_task = self.task_repo.update(task_id, **update_data)
+        if not updated_task:
+            raise TaskNotFoundError(f"Tarea {task_id} no encontrada")
 
         return TaskRead.from_orm(updated_task)
 
@@ -254,9 +625,7 @@ class TaskService:
         Raises:
             TaskNotFoundError: Si la tarea no existe
         """
-        task = self.task_repo.get(task_id)
-        if not task:
-            raise TaskNotFoundError(f"Tarea {task_id} no encontrada")
-
         updated_task = self.task_repo.update_status(task_id, new_status)
+        if not updated_task:
+            raise TaskNotFoundError(f"Tarea {task_id} no encontrada")
         return TaskRead.from_orm(updated_task)
@@ -9,9 +9,12 @@ from sqlalchemy.orm import Session
 from app.models.models import User
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 from app.repositories.user_repository import UserRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.pagination import Page
 from app.core.security import hash_password
-from app.core.exceptions import UserAlreadyExistsError, UserNotFoundError
+from app.core.exceptions import UserAlreadyExistsError, UserNotFoundError, PermissionDeniedError
 from app.core.enums import UserRole
+from app.core.principal_cache import invalidate_principal
 
 
 class UserManagementService:
@@ -27,6 +30,7 @@ class UserManagementService:
             db: Sesión de SQLAlchemy
         """
         self.user_repo = UserRepository(db)
+        self.project_repo = ProjectRepository(db)
         self.db = db
 
     def create_user(
@@ -100,33 +104,78 @@ class UserManagementService:
             raise UserNotFoundError(f"Usuario con ID {user_id} no encontrado")
         return UserRead.from_orm(user)
 
-    def list_users(self, skip: int = 0, limit: int = 50) -> List[UserRead]:
+    def list_users(self, skip: int = 0, limit: int = 50,
+                   cursor: Optional[str] = None) -> Page[UserRead]:
         """
         Listar todos los usuarios
         
         Args:
-            skip: Número de registros a saltar
+            skip: Número de registros a saltar (obsoleto, solo si no hay cursor)
             limit: Número máximo de registros
+            cursor: Cursor de la página anterior (opcional)
             
         Returns:
-            Lista de usuarios
+            Página de usuarios con el cursor siguiente
         """
-        users = self.user_repo.get_all(skip=skip, limit=limit)
-        return [UserRead.from_orm(user) for user in users]
+        page = self.user_repo.get_page(limit=limit, cursor=cursor, skip=skip)
+        return Page([UserRead.from_orm(user) for user in page.items], page.next_cursor)
 
-    def list_users_by_roles(self, roles: List[str], skip: int = 0, limit: int = 50) -> List[UserRead]:
+    def list_users_by_roles(self, roles: List[str], skip: int = 0, limit: int = 50,
+                            cursor: Optional[str] = None) -> Page[UserRead]:
         """
         Listar usuarios filtrados por rol
         
         Args:
             roles: Lista de roles a filtrar
-            skip: Número de registros a saltar
+            skip: Número de registros a saltar (obsoleto, solo si no hay cursor)
             limit: Número máximo de registros
+            cursor: Cursor de la página anterior (opcional)
+            
+        Returns:
+            Página de usuarios con los roles especificados y el cursor siguiente
+        """
+        page = self.user_repo.get_by_roles(roles, limit=limit, cursor=cursor, skip=skip)
+        return Page([UserRead.from_orm(user) for user in page.items], page.next_cursor)
+
+    def search_users(self, prefix: str, current_user_id: int, current_user_role: str,
+                     project_id: Optional[int] = None, fuzzy: bool = False,
+                     limit: int = 10) -> List[UserRead]:
+        """
+        Buscar usuarios activos por prefijo (username, email, nombre o apellido)
+        
+        Sin proyecto, aplica la misma visibilidad por rol que el listado de
+        usuarios. Con proyecto, devuelve solo su propietario y miembros, y el
+        usuario actual debe pertenecer al proyecto (o ser admin).
+        
+        Args:
+            prefix: Prefijo a buscar (sin distinguir mayúsculas)
+            current_user_id: ID del usuario que busca
+            current_user_role: Rol del usuario que busca
+            project_id: Limitar a miembros de un proyecto (opcional)
+            fuzzy: Incluir usernames parecidos (solo PostgreSQL)
+            limit: Número máximo de resultados
             
         Returns:
-            Lista de usuarios con los roles especificados
+            Usuarios encontrados, primero los que empiezan por el prefijo en el username
+            
+        Raises:
+            PermissionDeniedError: Si no pertenece al proyecto indicado
         """
-        users = self.db.query(User).filter(User.role.in_(roles)).offset(skip).limit(limit).all()
+        roles, user_ids = None, None
+        if project_id is not None:
+            if current_user_role != UserRole.ADMIN.value and not self.project_repo.is_member(
+                project_id, current_user_id
+            ):
+                raise PermissionDeniedError("No tienes permisos para acceder a este proyecto")
+            user_ids = ProjectRepository.member_user_ids(project_id)
+        elif current_user_role == UserRole.READ_WRITE.value:
+            roles = [UserRole.READ_WRITE.value, UserRole.READ_ONLY.value]
+        elif current_user_role != UserRole.ADMIN.value:
+            roles = [UserRole.READ_ONLY.value]
+
+        users = self.user_repo.search_by_prefix(
+            prefix, roles=roles, user_ids=user_ids, fuzzy=fuzzy, limit=limit
+        )
         return [UserRead.from_orm(user) for user in users]
 
     def update_user(self, user_id: int, **kwargs) -> UserRead:
@@ -144,10 +193,6 @@ class UserManagementService:
             UserNotFoundError: Si el usuario no existe
             ValueError: Si se intenta actualizar un campo no permitido
         """
-        user = self.user_repo.get(user_id)
-        if not user:
-            raise UserNotFoundError(f"Usuario con ID {user_id} no encontrado")
-
         # Campos permitidos
         allowed_fields = ["email", "first_name", "last_name", "role"]
         
@@ -165,8 +210,15 @@ class UserManagementService:
             if update_data["role"] not in valid_roles:
                 raise ValueError(f"Rol inválido. Roles válidos: {', '.join(valid_roles)}")
 
+        # Un cambio de rol revoca los tokens emitidos con el rol anterior
+        if "role" in update_data:
+            update_data["token_version"] = User.token_version + 1
+
         # Actualizar solo los campos permitidos
         user_updated = self.user_repo.update(user_id, **update_data)
+        if not user_updated:
+            raise UserNotFoundError(f"Usuario con ID {user_id} no encontrado")
+        invalidate_principal(self.db, user_id)
         return UserRead.from_orm(user_updated)
 
     def delete_user(self, user_id: int) -> bool:
@@ -182,12 +234,10 @@ class UserManagementService:
         Raises:
             UserNotFoundError: Si el usuario no existe
         """
-        user = self.user_repo.get(user_id)
-        if not user:
-            raise UserNotFoundError(f"Usuario con ID {user_id} no encontrado")
-
         # No eliminar el usuario, solo marcarlo como inactivo
-        self.user_repo.update(user_id, is_active=False)
+        if not self.user_repo.update(user_id, is_active=False, token_version=User.token_version + 1):
+            raise UserNotFoundError(f"Usuario con ID {user_id} no encontrado")
+        invalidate_principal(self.db, user_id)
         return True
 
     def activate_user(self, user_id: int) -> bool:
@@ -203,11 +253,9 @@ class UserManagementService:
         Raises:
             UserNotFoundError: Si el usuario no existe
         """
-        user = self.user_repo.get(user_id)
-        if not user:
+        if not self.user_repo.update(user_id, is_active=True):
             raise UserNotFoundError(f"Usuario con ID {user_id} no encontrado")
-
-        self.user_repo.update(user_id, is_active=True)
+        invalidate_principal(self.db, user_id)
         return True
 
     def change_password(self, user_id: int, new_password: str) -> bool:
@@ -224,9 +272,11 @@ class UserManagementService:
         Raises:
             UserNotFoundError: Si el usuario no existe
         """
-        user = self.user_repo.get(user_id)
-        if not user:
+        if not self.user_repo.update(
+            user_id,
+            hashed_password=hash_password(new_password),
+            token_version=User.token_version + 1,
+        ):
             raise UserNotFoundError(f"Usuario con ID {user_id} no encontrado")
-
-        self.user_repo.update(user_id, hashed_password=hash_password(new_password))
+        invalidate_principal(self.db, user_id)
         return True
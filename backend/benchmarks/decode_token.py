@@ -0,0 +1,50 @@
+"""
+Micro-benchmark: cost of decode_token per request, with and without the
+verified-token cache
+
+Usage (from backend/):
+    python -m benchmarks.decode_token [--requests 100000] [--tokens 100]
+
+Each simulated request decodes one of ``--tokens`` distinct tokens, as a
+server with that many active clients would see.
+"""
+import argparse
+import time
+
+from app.core.security import create_access_token, decode_token
+from app.core.token_cache import verified_tokens
+
+
+def run(requests: int, tokens: list) -> float:
+    """Microseconds per decode_token call"""
+    started = time.perf_counter()
+    for i in range(requests):
+        decode_token(tokens[i % len(tokens)])
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": str(user_id), "role": "read_write"})
+              for user_id in range(args.tokens)]
+
+    maxsize = verified_tokens.maxsize
+    verified_tokens.maxsize = 0
+    uncached = run(args.requests, tokens)
+    verified_tokens.maxsize = maxsize
+
+    verified_tokens.clear()
+    cached = run(args.requests, tokens)
+
+    print(f"{args.requests} requests over {args.tokens} tokens")
+    print(f"  full verification : {uncached:8.2f} us/request")
+    print(f"  verified cache    : {cached:8.2f} us/request  ({uncached / cached:.1f}x)")
+    print(f"  cache stats       : {verified_tokens.stats()}")
+
+
+if __name__ == "__main__":
+    main()
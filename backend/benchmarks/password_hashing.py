@@ -0,0 +1,42 @@
+"""
+Benchmark: password hashes per second per core for each configured scheme
+
+Usage (from backend/):
+    PASSWORD_SCHEMES=bcrypt,pbkdf2_sha256 PASSWORD_BCRYPT_ROUNDS=10 \\
+        python -m benchmarks.password_hashing [--seconds 2]
+
+Hashing runs on a single thread, so the rate is per core; verification costs
+the same as hashing for these schemes.
+"""
+import argparse
+import time
+
+from app.core.security import PASSWORD_SCHEMES, pwd_context
+
+
+def hashes_per_second(scheme: str, seconds: float) -> float:
+    """Hash repeatedly with the context's settings for ``scheme`` for about ``seconds``"""
+    handler = pwd_context.handler(scheme)
+    count = 0
+    started = time.perf_counter()
+    while True:
+        handler.hash("correct horse battery staple")
+        count += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for scheme in PASSWORD_SCHEMES:
+        rate = hashes_per_second(scheme, args.seconds)
+        sample = pwd_context.handler(scheme).hash("x")
+        print(f"{scheme:16} {rate:10.1f} hashes/s/core  {1000 / rate:8.2f} ms/hash  {sample[:30]}")
+
+
+if __name__ == "__main__":
+    main()
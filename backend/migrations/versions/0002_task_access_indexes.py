@@ -0,0 +1,73 @@
+"""task access pattern indexes
+
+Índices compuestos y parciales para los filtros habituales de tareas y para
+la membresía de proyectos. En PostgreSQL se crean con CONCURRENTLY (fuera de
+la transacción de la migración) para poder aplicarlos sin bloquear escrituras.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_TASKS_WITH_DUE_DATE = "status <> 'COMPLETED' AND due_date IS NOT NULL"
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    ("ix_tasks_project_status_priority", "tasks", ["project_id", "status", "priority"], {}),
+    ("ix_tasks_assigned_status", "tasks", ["assigned_to_id", "status"], {}),
+    ("ix_tasks_creator_id", "tasks", ["creator_id"], {}),
+    (
+        "ix_tasks_open_due_date",
+        "tasks",
+        ["project_id", "due_date"],
+        {
+            "postgresql_where": sa.text(OPEN_TASKS_WITH_DUE_DATE),
+            "sqlite_where": sa.text(OPEN_TASKS_WITH_DUE_DATE),
+        },
+    ),
+    ("ix_project_members_user_id", "project_members", ["user_id", "project_id"], {}),
+    ("ix_projects_owner_id", "projects", ["owner_id"], {}),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if _is_postgresql():
+        # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in INDEXES:
+                op.create_index(
+                    name, table, columns,
+                    postgresql_concurrently=True, if_not_exists=True, **kwargs
+                )
+    else:
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(
+                    name, table_name=table,
+                    postgresql_concurrently=True, if_exists=True
+                )
+    else:
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,55 @@
+"""unassign tasks in the database when their assignee is deleted
+
+tasks.assigned_to_id pasa a ON DELETE SET NULL para que el ORM pueda confiar
+en la base de datos (passive_deletes) en lugar de cargar y modificar cada
+tarea asignada antes de borrar un usuario.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nombre por defecto de PostgreSQL para la FK sin nombre de 0001
+PG_FK_NAME = "tasks_assigned_to_id_fkey"
+# En SQLite las FK no tienen nombre; la convención se lo asigna al reflejar la tabla
+SQLITE_NAMING = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+SQLITE_FK_NAME = "fk_tasks_assigned_to_id_users"
+
+
+def _replace_fk(ondelete: Union[str, None]) -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # NOT VALID: el cambio solo toma el bloqueo exclusivo un instante, sin
+        # recorrer la tabla; la validación va después, en su propia transacción,
+        # con un bloqueo que no impide leer ni escribir en tasks
+        op.drop_constraint(PG_FK_NAME, "tasks", type_="foreignkey")
+        op.create_foreign_key(
+            PG_FK_NAME, "tasks", "users", ["assigned_to_id"], ["id"], ondelete=ondelete,
+            postgresql_not_valid=True,
+        )
+        with op.get_context().autocommit_block():
+            op.execute(f"ALTER TABLE tasks VALIDATE CONSTRAINT {PG_FK_NAME}")
+    else:
+        with op.batch_alter_table("tasks", naming_convention=SQLITE_NAMING) as batch_op:
+            batch_op.drop_constraint(SQLITE_FK_NAME, type_="foreignkey")
+            batch_op.create_foreign_key(
+                SQLITE_FK_NAME, "users", ["assigned_to_id"], ["id"], ondelete=ondelete
+            )
+
+
+def upgrade() -> None:
+    _replace_fk("SET NULL")
+
+
+def downgrade() -> None:
+    _replace_fk(None)
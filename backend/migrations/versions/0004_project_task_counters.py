@@ -0,0 +1,59 @@
+"""project task counters
+
+Tabla desnormalizada con el número de tareas por proyecto, estado y
+prioridad. La mantiene TaskRepository en la misma transacción que cada
+escritura de tareas; aquí se crea y se rellena a partir de las tareas existentes.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Los tipos enum ya existen desde 0001 (PostgreSQL); no volver a crearlos
+    op.create_table(
+        "project_task_counters",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "PENDING", "IN_PROGRESS", "REVIEW", "COMPLETED",
+                name="taskstatus", create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "priority",
+            postgresql.ENUM(
+                "LOW", "MEDIUM", "HIGH", "CRITICAL",
+                name="taskpriority", create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "status", "priority"),
+    )
+    op.execute(
+        "INSERT INTO project_task_counters (project_id, status, priority, count) "
+        "SELECT project_id, status, priority, COUNT(*) FROM tasks "
+        "GROUP BY project_id, status, priority"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_task_counters")
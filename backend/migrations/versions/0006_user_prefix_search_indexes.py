@@ -0,0 +1,58 @@
+"""user prefix search indexes
+
+Índices de expresión lower(columna) para búsquedas por prefijo de usuarios
+(username, email, nombre, apellido). En PostgreSQL usan text_pattern_ops para
+servir LIKE 'abc%' con cualquier collation, y se añade un índice GIN de
+trigramas (pg_trgm) sobre el username para la búsqueda aproximada.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREFIX_COLUMNS = ["username", "email", "first_name", "last_name"]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if _is_postgresql():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+        with op.get_context().autocommit_block():
+            for name in PREFIX_COLUMNS:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_{name}_prefix "
+                    f"ON users (lower({name}) text_pattern_ops)"
+                )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_trgm "
+                "ON users USING GIN (lower(username) gin_trgm_ops)"
+            )
+    else:
+        for name in PREFIX_COLUMNS:
+            op.create_index(
+                f"ix_users_{name}_prefix", "users", [sa.text(f"lower({name})")],
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if _is_postgresql():
+        op.execute("DROP INDEX IF EXISTS ix_users_username_trgm")
+    for name in PREFIX_COLUMNS:
+        op.drop_index(f"ix_users_{name}_prefix", table_name="users", if_exists=True)
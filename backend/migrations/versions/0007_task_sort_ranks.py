@@ -0,0 +1,95 @@
+"""task sort ranks
+
+Columnas generadas priority_rank y status_rank (rangos enteros de
+PRIORITY_LEVELS y STATUS_ORDER) para ordenar en la base de datos, e índices
+para los listados ordenados más habituales.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.task_search import SEARCH_FTS_TABLE, SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIORITY_RANK_SQL = (
+    "CASE priority WHEN 'CRITICAL' THEN 4 WHEN 'HIGH' THEN 3 "
+    "WHEN 'MEDIUM' THEN 2 WHEN 'LOW' THEN 1 END"
+)
+STATUS_RANK_SQL = (
+    "CASE status WHEN 'PENDING' THEN 1 WHEN 'IN_PROGRESS' THEN 2 "
+    "WHEN 'REVIEW' THEN 3 WHEN 'COMPLETED' THEN 4 END"
+)
+
+# (name, columns)
+INDEXES = [
+    ("ix_tasks_project_priority_rank", ["project_id", sa.text("priority_rank DESC"), "due_date", "id"]),
+    ("ix_tasks_project_status_rank", ["project_id", "status_rank", sa.text("priority_rank DESC"), "id"]),
+    ("ix_tasks_assigned_priority_rank", ["assigned_to_id", sa.text("priority_rank DESC"), "due_date", "id"]),
+]
+
+
+def _rank_columns():
+    return [
+        sa.Column("priority_rank", sa.SmallInteger(), sa.Computed(PRIORITY_RANK_SQL, persisted=True)),
+        sa.Column("status_rank", sa.SmallInteger(), sa.Computed(STATUS_RANK_SQL, persisted=True)),
+    ]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _restore_sqlite_search() -> None:
+    """
+    Volver a crear los triggers FTS5 de 0005, que se pierden al recrear tasks,
+    y resincronizar el índice de búsqueda con la tabla
+    """
+    for statement in SQLITE_DDL:
+        op.execute(statement)
+    op.execute(f"INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    if _is_postgresql():
+        # Añadir columnas STORED reescribe la tabla (bloqueo exclusivo durante la copia)
+        for column in _rank_columns():
+            op.add_column("tasks", column)
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(
+                    name, "tasks", columns, postgresql_concurrently=True, if_not_exists=True
+                )
+    else:
+        # SQLite no permite ALTER TABLE ADD COLUMN ... STORED: se recrea la tabla
+        # (y con ella desaparecen sus triggers)
+        with op.batch_alter_table("tasks", recreate="always") as batch_op:
+            for column in _rank_columns():
+                batch_op.add_column(column)
+        _restore_sqlite_search()
+        for name, columns in INDEXES:
+            op.create_index(name, "tasks", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="tasks", if_exists=True)
+    if _is_postgresql():
+        op.drop_column("tasks", "status_rank")
+        op.drop_column("tasks", "priority_rank")
+    else:
+        with op.batch_alter_table("tasks", recreate="always") as batch_op:
+            batch_op.drop_column("status_rank")
+            batch_op.drop_column("priority_rank")
+        _restore_sqlite_search()
@@ -0,0 +1,125 @@
+"""tasks hash partitioning
+
+Opcional, solo PostgreSQL: convierte ``tasks`` en una tabla particionada por
+HASH (project_id) con TASKS_HASH_PARTITIONS particiones (tasks_p0, tasks_p1,
+...). Sin la variable (o con 0) la migración no hace nada; para activarla más
+tarde basta con ``alembic downgrade 0007`` y volver a ``upgrade`` con la
+variable definida.
+
+Las consultas con project_id se podan a una sola partición, y cada partición
+es una tabla normal que puede hacer VACUUM o REINDEX por separado (ver
+app/jobs/task_partition_maintenance.py). El modelo ORM no cambia: la clave
+primaria pasa a ser (id, project_id), porque PostgreSQL exige que incluya la
+clave de partición, pero id sigue saliendo de la misma secuencia.
+
+La copia reescribe la tabla entera bajo un bloqueo exclusivo: conviene
+ejecutarla en una ventana de mantenimiento.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import os
+import re
+from typing import List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = int(os.getenv("TASKS_HASH_PARTITIONS", "0"))
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'tasks'::regclass)"
+    )))
+
+
+def _take_indexes(table: str) -> List[str]:
+    """Guardar las definiciones de los índices (salvo la PK) y borrarlos de ``table``"""
+    rows = op.get_bind().execute(sa.text(
+        "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+        "JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = CAST(:table AS regclass) AND NOT x.indisprimary"
+    ), {"table": table}).all()
+    for name, _ in rows:
+        op.execute(f'DROP INDEX "{name}"')
+    return [definition for _, definition in rows]
+
+
+def _take_foreign_keys(table: str) -> List[Tuple[str, str]]:
+    """Guardar las claves foráneas (nombre, definición) y borrarlas de ``table``"""
+    rows = op.get_bind().execute(sa.text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), {"table": table}).all()
+    for name, _ in rows:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    return list(rows)
+
+
+def _rebuild_tasks(partitions: int) -> None:
+    """
+    Recrear ``tasks`` (particionada si ``partitions`` > 0) copiando las filas
+
+    Índices y claves foráneas se quitan de la tabla vieja antes de copiar y se
+    recrean con el mismo nombre sobre la nueva; en una tabla particionada cada
+    índice se propaga a todas las particiones.
+    """
+    op.execute("ALTER TABLE tasks RENAME TO tasks_old")
+    op.execute("ALTER TABLE tasks_old RENAME CONSTRAINT tasks_pkey TO tasks_old_pkey")
+    indexes = _take_indexes("tasks_old")
+    foreign_keys = _take_foreign_keys("tasks_old")
+
+    partition_by = " PARTITION BY HASH (project_id)" if partitions else ""
+    op.execute(
+        "CREATE TABLE tasks (LIKE tasks_old INCLUDING DEFAULTS INCLUDING GENERATED "
+        f"INCLUDING STORAGE INCLUDING COMMENTS){partition_by}"
+    )
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE tasks_p{remainder} PARTITION OF tasks "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+
+    # Las columnas generadas (rangos, search_vector) se recalculan al insertar
+    columns = ", ".join(
+        name for name, in op.get_bind().execute(sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'tasks_old' "
+            "AND is_generated = 'NEVER' ORDER BY ordinal_position"
+        ))
+    )
+    op.execute(f"INSERT INTO tasks ({columns}) SELECT {columns} FROM tasks_old")
+
+    primary_key = "id, project_id" if partitions else "id"
+    op.execute(f"ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY ({primary_key})")
+    for definition in indexes:
+        op.execute(re.sub(r" ON ([\w\"]+\.)?tasks_old ", r" ON \1tasks ", definition, count=1))
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE tasks ADD CONSTRAINT "{name}" {definition}')
+
+    # La secuencia de id pertenece a la tabla vieja: sin esto se borraría con ella
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id")
+    op.execute("DROP TABLE tasks_old")
+    op.execute("ANALYZE tasks")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or PARTITIONS <= 0 or _is_partitioned():
+        return
+    _rebuild_tasks(PARTITIONS)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or not _is_partitioned():
+        return
+    _rebuild_tasks(0)
@@ -0,0 +1,35 @@
+"""user token version
+
+Añade ``users.token_version``, el contador que firma cada token en el claim
+``ver``. Cambiar el rol, desactivar al usuario o cambiar su contraseña lo
+incrementa, y con AUTH_CLAIMS_PRINCIPAL los tokens con una versión anterior
+dejan de aceptarse. Los usuarios existentes empiezan en 0.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
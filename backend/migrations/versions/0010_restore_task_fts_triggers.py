@@ -0,0 +1,38 @@
+"""restore task fts triggers
+
+Solo SQLite: hasta que 0007 volvió a crearlos, la recreación de ``tasks`` en
+esa migración borraba los triggers FTS5 de 0005, y las tareas nuevas o
+editadas dejaban de aparecer en la búsqueda. Esta migración los crea si
+faltan y reconstruye ``tasks_fts`` en las bases ya migradas; en las demás no
+cambia nada.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.task_search import SEARCH_FTS_TABLE, SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in SQLITE_DDL:
+        op.execute(statement)
+    op.execute(f"INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    # Los triggers forman parte del esquema de 0005; no se quitan
+    pass
@@ -0,0 +1,131 @@
+"""
+Shared pytest configuration
+"""
+import os
+import tempfile
+
+# Relationships raise on unplanned lazy loads while testing (see app/models/base.py),
+# so new N+1 queries fail loudly instead of silently slowing down listings
+os.environ.setdefault("SQLALCHEMY_RELATIONSHIP_LAZY", "raise")
+
+# Throwaway SQLite database, cheap password hashes and a small import limit; set before the app is imported
+_TEST_DIR = tempfile.mkdtemp(prefix="taskflow-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}")
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")
+# Small enough for the tests to exceed it
+os.environ.setdefault("TASK_IMPORT_MAX_BYTES", str(256 * 1024))
+
+import itertools  # noqa: E402
+from typing import Dict, List, NamedTuple, Optional, Sequence  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "AdminTaskFlow@2025!")
+PASSWORD = "password1"
+
+_ids = itertools.count()
+
+
+def unique(prefix: str) -> str:
+    """Name not used by any other test of the session"""
+    return f"{prefix}{next(_ids)}"
+
+
+class ApiUser(NamedTuple):
+    """User created through the API, with its auth header"""
+    id: int
+    username: str
+    headers: Dict[str, str]
+
+
+def login(client: TestClient, username: str, password: str) -> Dict[str, str]:
+    """Authorization header for a user"""
+    response = client.post("/api/auth/login", data={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """API client sharing one database (and the app's startup seed) for the session"""
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client) -> Dict[str, str]:
+    return login(client, ADMIN_USERNAME, ADMIN_PASSWORD)
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed on the async engine while the test runs"""
+    from app.database.session import async_engine
+
+    executed: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="session")
+def make_user(client, admin_headers):
+    """Create a user through the API and log it in"""
+
+    def make(role: str = "read_write") -> ApiUser:
+        username = unique("user")
+        response = client.post(
+            "/api/users/",
+            json={"username": username, "email": f"{username}@example.com",
+                  "password": PASSWORD, "role": role},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201, response.text
+        return ApiUser(response.json()["id"], username, login(client, username, PASSWORD))
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def make_project(client):
+    """Create a project owned by ``owner``, optionally adding members"""
+
+    def make(owner: ApiUser, members: Sequence[ApiUser] = ()) -> int:
+        response = client.post("/api/projects", json={"nombre": unique("Proyecto ")}, headers=owner.headers)
+        assert response.status_code == 201, response.text
+        project_id = response.json()["id"]
+        for member in members:
+            response = client.post(
+                f"/api/projects/{project_id}/members",
+                params={"member_id": member.id},
+                headers=owner.headers,
+            )
+            assert response.status_code == 201, response.text
+        return project_id
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def make_task(client):
+    """Create a task through the API and return its JSON"""
+
+    def make(user: ApiUser, project_id: int, title: Optional[str] = None, **fields) -> dict:
+        response = client.post(
+            "/api/tasks",
+            json={"title": title or unique("Tarea "), "project_id": project_id, **fields},
+            headers=user.headers,
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return make
@@ -0,0 +1,81 @@
+"""
+POST /api/tasks/bulk in ATOMIC and PARTIAL modes
+"""
+import pytest
+
+
+@pytest.fixture
+def setup(make_user, make_project):
+    """Owner with a project and a user that is not a member of it"""
+    owner = make_user()
+    outsider = make_user()
+    return owner, outsider, make_project(owner)
+
+
+def project_titles(client, user, project_id):
+    response = client.get(f"/api/tasks/project/{project_id}?limit=100", headers=user.headers)
+    assert response.status_code == 200, response.text
+    return sorted(task["title"] for task in response.json())
+
+
+def items(project_id, outsider):
+    return [
+        {"title": "Tarea válida", "project_id": project_id},
+        {"title": "Asignada a un extraño", "project_id": project_id, "assigned_to_id": outsider.id},
+        {"title": "Otra válida", "project_id": project_id, "priority": "high"},
+    ]
+
+
+def test_atomic_rejects_the_whole_batch_with_a_per_item_report(client, setup):
+    owner, outsider, project_id = setup
+
+    response = client.post(
+        "/api/tasks/bulk",
+        json={"items": items(project_id, outsider), "mode": "atomic"},
+        headers=owner.headers,
+    )
+
+    assert response.status_code == 400, response.text
+    report = response.json()["detail"]
+    assert report["mode"] == "atomic"
+    assert report["created"] == 0 and report["failed"] == 1
+    assert not any(r["success"] or r["task_id"] for r in report["results"])
+    errors = {r["index"]: r["error"] for r in report["results"]}
+    assert "miembro" in errors[1]
+    # The valid items are reported as not inserted because of the batch
+    assert errors[0] == errors[2] != errors[1]
+    assert project_titles(client, owner, project_id) == []
+
+
+def test_partial_inserts_valid_items_and_reports_failed_ones(client, setup):
+    owner, outsider, project_id = setup
+
+    response = client.post(
+        "/api/tasks/bulk",
+        json={"items": items(project_id, outsider), "mode": "partial"},
+        headers=owner.headers,
+    )
+
+    assert response.status_code == 201, response.text
+    result = response.json()
+    assert result["created"] == 2 and result["failed"] == 1
+    by_index = {r["index"]: r for r in result["results"]}
+    assert by_index[0]["success"] and by_index[0]["task_id"]
+    assert not by_index[1]["success"] and by_index[1]["error"] and by_index[1]["task_id"] is None
+    assert by_index[2]["success"] and by_index[2]["task_id"]
+    assert project_titles(client, owner, project_id) == ["Otra válida", "Tarea válida"]
+
+
+def test_items_in_a_foreign_project_fail(client, setup, make_project):
+    owner, outsider, _ = setup
+    foreign = make_project(outsider)
+
+    response = client.post(
+        "/api/tasks/bulk",
+        json={"items": [{"title": "Intrusa", "project_id": foreign}], "mode": "partial"},
+        headers=owner.headers,
+    )
+
+    assert response.status_code == 201, response.text
+    assert response.json()["created"] == 0 and response.json()["failed"] == 1
+    assert project_titles(client, outsider, foreign) == []
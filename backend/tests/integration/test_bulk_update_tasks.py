@@ -0,0 +1,83 @@
+"""
+PATCH /api/tasks/bulk (TaskService.update_tasks_bulk / TaskRepository.bulk_update)
+"""
+
+
+def task_fields(client, user, task_id):
+    response = client.get(f"/api/tasks/{task_id}", headers=user.headers)
+    assert response.status_code == 200, response.text
+    task = response.json()
+    return task["status"], task["priority"]
+
+
+def test_update_spanning_several_projects(client, make_user, make_project, make_task):
+    user = make_user()
+    first, second = make_project(user), make_project(user)
+    tasks = [make_task(user, first), make_task(user, first), make_task(user, second)]
+    untouched = make_task(user, second)
+
+    response = client.patch(
+        "/api/tasks/bulk",
+        json={"task_ids": [task["id"] for task in tasks], "status": "in_progress", "priority": "high"},
+        headers=user.headers,
+    )
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["updated"] == 3 and result["not_found"] == []
+    assert sorted(result["task_ids"]) == sorted(task["id"] for task in tasks)
+    for task in tasks:
+        assert task_fields(client, user, task["id"]) == ("in_progress", "high")
+    assert task_fields(client, user, untouched["id"]) == ("pending", "medium")
+
+
+def test_missing_ids_are_reported_as_not_found(client, make_user, make_project, make_task):
+    user = make_user()
+    task = make_task(user, make_project(user))
+
+    response = client.patch(
+        "/api/tasks/bulk",
+        json={"task_ids": [task["id"], 987654321], "status": "completed"},
+        headers=user.headers,
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"] == 1
+    assert response.json()["not_found"] == [987654321]
+    assert task_fields(client, user, task["id"])[0] == "completed"
+
+
+def test_tasks_of_a_foreign_project_are_forbidden(client, make_user, make_project, make_task):
+    user, stranger = make_user(), make_user()
+    own = make_task(user, make_project(user))
+    foreign = make_task(stranger, make_project(stranger))
+
+    response = client.patch(
+        "/api/tasks/bulk",
+        json={"task_ids": [own["id"], foreign["id"]], "status": "completed"},
+        headers=user.headers,
+    )
+
+    assert response.status_code == 403, response.text
+    # Nothing is updated, not even the caller's own task
+    assert task_fields(client, user, own["id"])[0] == "pending"
+    assert task_fields(client, stranger, foreign["id"])[0] == "pending"
+
+
+def test_filter_selects_tasks_of_one_project(client, make_user, make_project, make_task):
+    user = make_user()
+    project, other = make_project(user), make_project(user)
+    low = make_task(user, project, priority="low")
+    high = make_task(user, project, priority="high")
+    elsewhere = make_task(user, other, priority="low")
+
+    response = client.patch(
+        "/api/tasks/bulk",
+        json={"filter": {"project_id": project, "priority": "low"}, "status": "review"},
+        headers=user.headers,
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["task_ids"] == [low["id"]]
+    assert task_fields(client, user, high["id"])[0] == "pending"
+    assert task_fields(client, user, elsewhere["id"])[0] == "pending"
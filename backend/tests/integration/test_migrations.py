@@ -0,0 +1,78 @@
+"""
+Migrations on SQLite: tasks written after upgrading must be searchable
+
+0007 recreates tasks on SQLite; the FTS5 triggers from 0005 have to survive it.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.models import Project, Task, User
+from app.repositories.task_search_repository import TaskSearchRepository
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def alembic(database_url: str, *args: str) -> None:
+    """Run the alembic CLI against ``database_url`` (env.py reads DATABASE_URL at import)"""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": database_url},
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def migrated_url(tmp_path) -> str:
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    alembic(url, "upgrade", "head")
+    return url
+
+
+def add_task(db: Session, title: str) -> Task:
+    owner = db.query(User).filter(User.username == "migrator").first()
+    if owner is None:
+        owner = User(username="migrator", email="migrator@example.com", hashed_password="x")
+        db.add(owner)
+        db.flush()
+        db.add(Project(nombre="Migrado", owner_id=owner.id))
+        db.flush()
+    project = db.query(Project).filter(Project.owner_id == owner.id).first()
+    task = Task(title=title, project_id=project.id, creator_id=owner.id)
+    db.add(task)
+    db.commit()
+    return task
+
+
+def search(db: Session, text: str):
+    return [hit.task.title for hit in TaskSearchRepository(db).search(text, user_id=0, is_admin=True)]
+
+
+def test_tasks_are_searchable_at_head(migrated_url):
+    engine = create_engine(migrated_url)
+    with Session(engine) as db:
+        task = add_task(db, "Comprar zanahorias")
+        assert search(db, "zanahorias") == ["Comprar zanahorias"]
+
+        task.title = "Comprar pepinos"
+        db.commit()
+        assert search(db, "zanahorias") == []
+        assert search(db, "pepinos") == ["Comprar pepinos"]
+    engine.dispose()
+
+
+def test_tasks_are_searchable_after_downgrading_sort_ranks(migrated_url):
+    alembic(migrated_url, "downgrade", "0006")
+    alembic(migrated_url, "upgrade", "head")
+    engine = create_engine(migrated_url)
+    with Session(engine) as db:
+        add_task(db, "Revisar facturas")
+        assert search(db, "facturas") == ["Revisar facturas"]
+    engine.dispose()
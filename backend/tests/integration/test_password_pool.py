@@ -0,0 +1,46 @@
+"""
+Password pool saturation answers 503 with Retry-After
+"""
+from app.core.password_pool import password_pool
+from tests.conftest import PASSWORD, unique
+
+
+def saturate(monkeypatch):
+    """No workers and no queue: every hash is rejected at once"""
+    monkeypatch.setattr(password_pool, "workers", 0)
+    monkeypatch.setattr(password_pool, "queue", 0)
+
+
+def assert_busy(response):
+    assert response.status_code == 503, response.text
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_is_rejected_while_the_pool_is_saturated(client, make_user, monkeypatch):
+    user = make_user()
+    rejected = password_pool.stats()["rejected"]
+    saturate(monkeypatch)
+
+    assert_busy(client.post("/api/auth/login", data={"username": user.username, "password": PASSWORD}))
+    assert password_pool.stats()["rejected"] == rejected + 1
+
+
+def test_user_creation_is_rejected_while_the_pool_is_saturated(client, admin_headers, monkeypatch):
+    username = unique("ocupado")
+    saturate(monkeypatch)
+
+    response = client.post(
+        "/api/users/",
+        json={"username": username, "email": f"{username}@example.com", "password": PASSWORD},
+        headers=admin_headers,
+    )
+
+    assert_busy(response)
+    users = client.get("/api/users/?limit=1000", headers=admin_headers).json()
+    assert username not in [user["username"] for user in users]
+
+
+def test_login_works_again_once_the_pool_has_room(client, make_user):
+    user = make_user()
+    response = client.post("/api/auth/login", data={"username": user.username, "password": PASSWORD})
+    assert response.status_code == 200, response.text
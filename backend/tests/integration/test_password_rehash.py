@@ -0,0 +1,46 @@
+"""
+Login upgrades stale password hashes without touching updated_at
+"""
+import pytest
+from passlib.hash import bcrypt, pbkdf2_sha256
+
+from app.core import security
+from app.database.session import SessionLocal
+from app.models.models import User
+from tests.conftest import PASSWORD, login
+
+
+def stored(user_id):
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        return user.hashed_password, user.updated_at
+
+
+def store_hash(user_id, hashed_password):
+    with SessionLocal() as db:
+        db.get(User, user_id).hashed_password = hashed_password
+        db.commit()
+
+
+@pytest.mark.parametrize("schemes, rounds, old_hash, prefix", [
+    # Hash of a scheme that is still accepted but no longer preferred
+    (["bcrypt", "pbkdf2_sha256"], "4", pbkdf2_sha256.using(rounds=1000).hash(PASSWORD), "$2b$04$"),
+    # Preferred scheme, but with a lower cost than PASSWORD_BCRYPT_ROUNDS
+    (["bcrypt"], "5", bcrypt.using(rounds=4).hash(PASSWORD), "$2b$05$"),
+])
+def test_login_rehashes_stale_hashes(client, make_user, monkeypatch, schemes, rounds, old_hash, prefix):
+    user = make_user()
+    store_hash(user.id, old_hash)
+    _, updated_at = stored(user.id)
+    assert updated_at is not None
+    monkeypatch.setenv("PASSWORD_BCRYPT_ROUNDS", rounds)
+    monkeypatch.setattr(security, "pwd_context", security.build_password_context(schemes))
+
+    login(client, user.username, PASSWORD)
+
+    new_hash, new_updated_at = stored(user.id)
+    assert new_hash != old_hash and new_hash.startswith(prefix)
+    assert new_updated_at == updated_at
+    # The upgraded hash is not stale any more and still verifies
+    login(client, user.username, PASSWORD)
+    assert stored(user.id)[0] == new_hash
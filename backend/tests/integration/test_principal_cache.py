@@ -0,0 +1,116 @@
+"""
+Principal cache invalidation and token revocation through the "ver" claim
+"""
+import pytest
+from sqlalchemy import select
+
+from app.core.principal_cache import invalidate_principal, principal_cache
+from app.database.session import SessionLocal
+from tests.conftest import PASSWORD, login
+
+
+def test_after_commit_drops_values_cached_during_the_transaction(make_user):
+    user = make_user()
+    with SessionLocal() as db:
+        db.execute(select(1))
+        invalidate_principal(db, user.id)
+        # A concurrent request re-caches the row before the change commits
+        principal_cache.put(user.id, "old row")
+        db.commit()
+    assert principal_cache.get(user.id) is None
+
+
+def test_rollback_discards_pending_invalidations(make_user):
+    user = make_user()
+    with SessionLocal() as db:
+        db.execute(select(1))
+        invalidate_principal(db, user.id)
+        db.rollback()
+        principal_cache.put(user.id, "current row")
+        db.execute(select(1))
+        db.commit()
+    assert principal_cache.get(user.id) == "current row"
+    principal_cache.invalidate(user.id)
+
+
+def test_role_change_applies_on_the_next_request(client, admin_headers, make_user):
+    user = make_user()
+    assert client.get("/api/projects/", headers=user.headers).status_code == 200  # cached
+
+    response = client.patch(f"/api/users/{user.id}", json={"role": "read_only"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    response = client.post("/api/projects", json={"nombre": "Sin permiso"}, headers=user.headers)
+    assert response.status_code == 403, response.text
+
+
+def test_deactivated_user_is_rejected_on_the_next_request(client, admin_headers, make_user):
+    user = make_user()
+    assert client.get("/api/projects/", headers=user.headers).status_code == 200
+
+    assert client.delete(f"/api/users/{user.id}", headers=admin_headers).status_code == 200
+
+    response = client.get("/api/projects/", headers=user.headers)
+    assert response.status_code == 401, response.text
+
+
+@pytest.fixture
+def claims_mode(monkeypatch):
+    monkeypatch.setattr("app.api.routers.dependencies.CLAIMS_PRINCIPAL", True)
+
+
+@pytest.fixture
+def member_project(make_user, make_project):
+    user = make_user()
+    return user, make_project(user)
+
+
+def read_project(client, headers, project_id):
+    return client.get(f"/api/tasks/project/{project_id}", headers=headers)
+
+
+def test_password_change_revokes_earlier_tokens(client, claims_mode, member_project):
+    user, project_id = member_project
+    assert read_project(client, user.headers, project_id).status_code == 200  # version cached
+
+    response = client.post(
+        f"/api/users/{user.id}/change-password",
+        json={"new_password": "password2"},
+        headers=user.headers,
+    )
+    assert response.status_code == 200, response.text
+
+    response = read_project(client, user.headers, project_id)
+    assert response.status_code == 401, response.text
+    assert response.json()["detail"] == "Token revocado: inicia sesión de nuevo"
+    assert read_project(client, login(client, user.username, "password2"), project_id).status_code == 200
+
+
+def test_deleting_a_user_revokes_earlier_tokens(client, admin_headers, claims_mode, member_project):
+    user, project_id = member_project
+    assert read_project(client, user.headers, project_id).status_code == 200
+
+    assert client.delete(f"/api/users/{user.id}", headers=admin_headers).status_code == 200
+
+    response = read_project(client, user.headers, project_id)
+    assert response.status_code == 401, response.text
+
+
+def test_role_change_revokes_tokens_carrying_the_old_role(client, admin_headers, claims_mode, member_project):
+    user, project_id = member_project
+    assert read_project(client, user.headers, project_id).status_code == 200
+
+    response = client.patch(f"/api/users/{user.id}", json={"role": "read_only"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    assert read_project(client, user.headers, project_id).status_code == 401
+    fresh = login(client, user.username, PASSWORD)
+    assert read_project(client, fresh, project_id).status_code == 200
+
+
+def test_metrics_require_an_admin(client, admin_headers, make_user):
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", headers=make_user().headers).status_code == 403
+    response = client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert set(response.json()) >= {"principal_cache", "token_cache"}
@@ -0,0 +1,61 @@
+"""
+Statement counts of the listing and detail endpoints
+
+With SQLALCHEMY_RELATIONSHIP_LAZY=raise (tests/conftest.py) any lazy load
+fails the request; these tests also check that the number of statements
+does not grow with the number of rows returned.
+"""
+import pytest
+
+
+@pytest.fixture(scope="module")
+def owner(make_user):
+    return make_user()
+
+
+def make_populated_project(make_user, make_project, make_task, owner, tasks: int, members: int) -> int:
+    """Project with ``tasks`` tasks assigned to the owner and ``members`` extra members"""
+    project_id = make_project(owner, [make_user() for _ in range(members)])
+    for _ in range(tasks):
+        make_task(owner, project_id, assigned_to_id=owner.id)
+    return project_id
+
+
+def count(client, statements, url, headers) -> int:
+    """Statements run by one GET of ``url`` (after a warm-up request)"""
+    assert client.get(url, headers=headers).status_code == 200
+    statements.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+def test_project_task_list_statements_do_not_grow_with_rows(client, make_user, make_project, make_task,
+                                                            owner, statements):
+    small = make_populated_project(make_user, make_project, make_task, owner, tasks=2, members=0)
+    large = make_populated_project(make_user, make_project, make_task, owner, tasks=25, members=0)
+    headers = owner.headers
+
+    small_count = count(client, statements, f"/api/tasks/project/{small}?limit=20", headers)
+    large_count = count(client, statements, f"/api/tasks/project/{large}?limit=20", headers)
+
+    assert large_count == small_count
+    # Second page through the cursor costs the same as the first
+    first = client.get(f"/api/tasks/project/{large}?limit=20", headers=headers)
+    cursor = first.headers["x-next-cursor"]
+    assert count(client, statements, f"/api/tasks/project/{large}?limit=20&cursor={cursor}",
+                 headers) == small_count
+
+
+def test_project_detail_statements_do_not_grow_with_rows(client, make_user, make_project, make_task,
+                                                         owner, statements):
+    small = make_populated_project(make_user, make_project, make_task, owner, tasks=1, members=1)
+    large = make_populated_project(make_user, make_project, make_task, owner, tasks=15, members=4)
+    headers = owner.headers
+
+    small_count = count(client, statements, f"/api/projects/{small}", headers)
+    large_count = count(client, statements, f"/api/projects/{large}", headers)
+
+    assert large_count == small_count
+    detail = client.get(f"/api/projects/{large}", headers=headers).json()
+    assert len(detail["tasks"]) == 15 and len(detail["members"]) >= 4
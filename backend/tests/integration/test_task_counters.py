@@ -0,0 +1,111 @@
+"""
+project_task_counters upkeep on task writes and the reconciliation job
+"""
+from collections import Counter
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.database.session import SessionLocal
+from app.jobs.reconcile_task_counters import reconcile_task_counters
+from app.models.models import ProjectTaskCounter, Task
+
+
+def counters(project_id):
+    """Non-zero counters of a project as {(status, priority): count}"""
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(ProjectTaskCounter.status, ProjectTaskCounter.priority, ProjectTaskCounter.count)
+            .where(ProjectTaskCounter.project_id == project_id)
+        ).all()
+    return {(status.value, priority.value): count for status, priority, count in rows if count}
+
+
+def grouped_tasks(project_id):
+    """The same counts computed with COUNT(*) GROUP BY over tasks"""
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(Task.status, Task.priority, func.count())
+            .where(Task.project_id == project_id)
+            .group_by(Task.status, Task.priority)
+        ).all()
+    return {(status.value, priority.value): count for status, priority, count in rows}
+
+
+def assert_consistent(client, user, project_id):
+    expected = grouped_tasks(project_id)
+    assert counters(project_id) == expected
+
+    response = client.get(f"/api/projects/{project_id}/stats", headers=user.headers)
+    assert response.status_code == 200, response.text
+    stats = response.json()
+    by_status, by_priority = Counter(), Counter()
+    for (status, priority), count in expected.items():
+        by_status[status] += count
+        by_priority[priority] += count
+    assert stats["total"] == sum(expected.values())
+    assert {k: v for k, v in stats["by_status"].items() if v} == dict(by_status)
+    assert {k: v for k, v in stats["by_priority"].items() if v} == dict(by_priority)
+
+
+@pytest.fixture
+def populated(make_user, make_project, make_task):
+    user = make_user()
+    project_id = make_project(user)
+    tasks = [
+        make_task(user, project_id, priority=priority)
+        for priority in ("low", "medium", "medium", "high")
+    ]
+    return user, project_id, tasks
+
+
+def test_counters_follow_task_writes(client, populated):
+    user, project_id, tasks = populated
+    assert_consistent(client, user, project_id)
+
+    response = client.patch(
+        f"/api/tasks/{tasks[0]['id']}", json={"priority": "critical"}, headers=user.headers
+    )
+    assert response.status_code == 200, response.text
+    for task in tasks[1:3]:
+        response = client.patch(
+            f"/api/tasks/{task['id']}/status?new_status=completed", headers=user.headers
+        )
+        assert response.status_code == 200, response.text
+    assert_consistent(client, user, project_id)
+
+    response = client.delete(f"/api/tasks/{tasks[1]['id']}", headers=user.headers)
+    assert response.status_code == 200, response.text
+    response = client.patch(
+        "/api/tasks/bulk",
+        json={"task_ids": [tasks[2]["id"], tasks[3]["id"]], "status": "review", "priority": "low"},
+        headers=user.headers,
+    )
+    assert response.status_code == 200, response.text
+    assert_consistent(client, user, project_id)
+
+    project = next(
+        item for item in client.get("/api/projects/?limit=100", headers=user.headers).json()
+        if item["id"] == project_id
+    )
+    assert project["progress"]["total"] == 3
+    assert project["progress"]["completed"] == 0
+
+
+def test_reconcile_job_repairs_drift(client, populated):
+    user, project_id, _ = populated
+    expected = grouped_tasks(project_id)
+
+    with SessionLocal() as db:
+        db.execute(
+            update(ProjectTaskCounter)
+            .where(ProjectTaskCounter.project_id == project_id)
+            .values(count=ProjectTaskCounter.count + 7)
+        )
+        db.commit()
+    assert counters(project_id) != expected
+
+    reconcile_task_counters([project_id])
+
+    assert counters(project_id) == expected
+    assert_consistent(client, user, project_id)
@@ -0,0 +1,104 @@
+"""
+POST /api/projects/{id}/tasks/import: size and row limits, per-row error report
+"""
+import pytest
+
+from app.services import task_import
+from app.services.task_import import IMPORT_MAX_BYTES
+
+
+@pytest.fixture
+def setup(make_user, make_project):
+    """Owner of a project with one member and a user outside it"""
+    owner, member, outsider = make_user(), make_user(), make_user()
+    return owner, member, outsider, make_project(owner, members=[member])
+
+
+def upload(client, user, project_id, content, mode="partial", filename="tareas.csv"):
+    return client.post(
+        f"/api/projects/{project_id}/tasks/import",
+        params={"mode": mode},
+        files={"file": (filename, content, "text/csv")},
+        headers=user.headers,
+    )
+
+
+def project_tasks(client, user, project_id):
+    response = client.get(f"/api/tasks/project/{project_id}?limit=100", headers=user.headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_rows_with_errors_are_reported_by_line(client, setup):
+    owner, member, outsider, project_id = setup
+    content = "\n".join([
+        "title,priority,assigned_to",
+        f"Válida,high,{member.username}",
+        "Prioridad mala,altísima,",
+        f"De un extraño,low,{outsider.username}",
+        "Asignado inexistente,low,nadie_con_este_nombre",
+        "Sin asignar,medium,",
+    ])
+
+    response = upload(client, owner, project_id, content)
+
+    assert response.status_code == 201, response.text
+    report = response.json()
+    assert (report["created"], report["failed"]) == (2, 3)
+    errors = {error["line"]: error["error"] for error in report["errors"]}
+    assert sorted(errors) == [3, 4, 5]
+    assert "miembro" in errors[4]
+    assert "no encontrado" in errors[5]
+    titles = sorted(task["title"] for task in project_tasks(client, owner, project_id))
+    assert titles == ["Sin asignar", "Válida"]
+
+
+def test_atomic_import_with_errors_creates_nothing(client, setup):
+    owner, _, _, project_id = setup
+
+    response = upload(client, owner, project_id, "title,priority\nVálida,low\nMala,altísima", mode="atomic")
+
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"]["failed"] == 1
+    assert project_tasks(client, owner, project_id) == []
+
+
+def test_files_over_the_row_cap_are_rejected(client, setup, monkeypatch):
+    owner, _, _, project_id = setup
+    monkeypatch.setattr(task_import, "IMPORT_MAX_ROWS", 2)
+
+    response = upload(client, owner, project_id, "title\nUna\nDos\nTres")
+
+    assert response.status_code == 400, response.text
+    assert "2 filas" in response.json()["detail"]
+    assert project_tasks(client, owner, project_id) == []
+
+
+def test_oversized_upload_is_rejected_from_content_length(client, setup):
+    owner, _, _, project_id = setup
+    content = "title\n" + "x" * IMPORT_MAX_BYTES
+
+    response = upload(client, owner, project_id, content)
+
+    assert response.status_code == 413, response.text
+    assert project_tasks(client, owner, project_id) == []
+
+
+def test_oversized_chunked_upload_is_rejected_while_received(client, setup):
+    owner, _, _, project_id = setup
+    boundary = "limite"
+    chunks = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="t.csv"\r\n'
+        f"Content-Type: text/csv\r\n\r\ntitle\n".encode(),
+        *(b"x" * 64 * 1024 for _ in range(IMPORT_MAX_BYTES // (64 * 1024) + 1)),
+        f"\r\n--{boundary}--\r\n".encode(),
+    ]
+
+    response = client.post(
+        f"/api/projects/{project_id}/tasks/import",
+        content=iter(chunks),
+        headers={**owner.headers, "Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert response.status_code == 413, response.text
+    assert project_tasks(client, owner, project_id) == []
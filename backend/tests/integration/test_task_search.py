@@ -0,0 +1,48 @@
+"""
+GET /api/tasks/search: access scoping and hostile query text
+"""
+import pytest
+
+from tests.conftest import unique
+
+
+@pytest.fixture
+def indexed(make_user, make_project, make_task):
+    """A word only used by the tasks of one project"""
+    owner = make_user()
+    word = unique("zafiro")
+    project_id = make_project(owner)
+    tasks = [
+        make_task(owner, project_id, title=f"Revisar {word}"),
+        make_task(owner, project_id, title=f"Pulir {word} OR nada", description='dijo "x" OR'),
+    ]
+    return owner, word, project_id, tasks
+
+
+def search(client, headers, q, **params):
+    response = client.get("/api/tasks/search", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return sorted(hit["id"] for hit in response.json())
+
+
+def test_members_find_their_tasks(client, indexed):
+    owner, word, _, tasks = indexed
+    assert search(client, owner.headers, word) == sorted(task["id"] for task in tasks)
+
+
+def test_non_members_are_scoped_out(client, indexed, make_user):
+    _, word, project_id, _ = indexed
+    stranger = make_user()
+    assert search(client, stranger.headers, word) == []
+    assert search(client, stranger.headers, word, project_id=project_id) == []
+
+
+def test_admins_search_every_project(client, indexed, admin_headers):
+    _, word, _, tasks = indexed
+    assert search(client, admin_headers, word) == sorted(task["id"] for task in tasks)
+
+
+def test_operators_in_the_query_are_matched_literally(client, indexed):
+    owner, word, _, tasks = indexed
+    assert search(client, owner.headers, f'"x" OR {word}') == [tasks[1]["id"]]
+    assert search(client, owner.headers, f"{word} NOT") == []
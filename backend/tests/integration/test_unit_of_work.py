@@ -0,0 +1,24 @@
+"""
+UnitOfWorkMiddleware: a failed commit never reaches the client as a success
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.conftest import unique
+
+
+def test_failed_commit_returns_500_and_persists_nothing(client, make_user, monkeypatch):
+    owner = make_user()
+    name = unique("No guardado ")
+
+    async def failing_commit(self):
+        raise RuntimeError("commit failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(AsyncSession, "commit", failing_commit)
+        response = client.post("/api/projects", json={"nombre": name}, headers=owner.headers)
+
+    assert response.status_code == 500, response.text
+    assert response.json() == {"detail": "No se pudieron guardar los cambios"}
+    projects = client.get("/api/projects/?limit=100", headers=owner.headers).json()
+    assert name not in [project["nombre"] for project in projects]
+
@@ -0,0 +1,34 @@
+"""
+UserCache: epoch guard, TTL and LRU bound
+"""
+from app.core.principal_cache import Principal, UserCache
+
+PRINCIPAL = Principal(id=1, role="read_write", is_active=True)
+
+
+def test_put_with_a_stale_epoch_is_not_cached():
+    cache = UserCache()
+    epoch = cache.epoch
+    cache.invalidate(1)  # e.g. a role change commits while the row is being loaded
+
+    assert cache.put(1, PRINCIPAL, epoch) is PRINCIPAL
+    assert cache.get(1) is None
+
+    cache.put(1, PRINCIPAL, cache.epoch)
+    assert cache.get(1) is PRINCIPAL
+
+
+def test_entries_expire_after_the_ttl():
+    cache = UserCache(ttl=0)
+    cache.put(1, PRINCIPAL)
+    assert cache.get(1) is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "size": 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = UserCache(maxsize=2)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    cache.get(1)
+    cache.put(3, "c")
+    assert (cache.get(1), cache.get(2), cache.get(3)) == ("a", None, "c")
@@ -0,0 +1,16 @@
+"""
+to_fts5_query: user text never reaches FTS5 as query syntax
+"""
+from app.repositories.task_search_repository import to_fts5_query
+
+
+def test_every_word_is_a_quoted_prefix():
+    assert to_fts5_query("informe  mensual") == '"informe"* "mensual"*'
+
+
+def test_operators_are_literal_terms():
+    assert to_fts5_query('"x" OR y NEAR(z)') == '"""x"""* "OR"* "y"* "NEAR(z)"*'
+
+
+def test_blank_text_gives_an_empty_query():
+    assert to_fts5_query("   ") == ""
@@ -0,0 +1,56 @@
+"""
+Verified-token cache: expiry and what never gets cached
+"""
+from datetime import timedelta
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core.security import ALGORITHM, create_access_token, decode_token
+from app.core.token_cache import VerifiedTokenCache, token_digest, verified_tokens
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    verified_tokens.clear()
+    yield
+    verified_tokens.clear()
+
+
+def test_verified_token_is_served_from_the_cache():
+    token = create_access_token({"sub": "1"})
+
+    assert decode_token(token) == decode_token(token)
+    assert verified_tokens.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_entry_is_not_served_after_the_token_exp():
+    token = create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=-1))
+    # As if it had been cached while still valid
+    verified_tokens.put(token_digest(token), jwt.get_unverified_claims(token))
+
+    with pytest.raises(JWTError):
+        decode_token(token)
+    assert verified_tokens.stats()["size"] == 0
+
+
+def test_token_with_a_bad_signature_is_never_cached():
+    forged = jwt.encode({"sub": "1", "role": "admin", "exp": 4102444800}, "otra-clave", algorithm=ALGORITHM)
+
+    for _ in range(2):
+        with pytest.raises(JWTError):
+            decode_token(forged)
+    assert verified_tokens.get(token_digest(forged)) is None
+    assert verified_tokens.stats()["size"] == 0
+
+
+def test_claims_without_exp_are_not_cached():
+    cache = VerifiedTokenCache()
+    cache.put(b"key", {"sub": "1"})
+    assert cache.get(b"key") is None
+
+
+def test_cached_claims_are_copies():
+    token = create_access_token({"sub": "1"})
+    decode_token(token)["sub"] = "2"
+    assert decode_token(token)["sub"] == "1"